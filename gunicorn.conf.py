@@ -0,0 +1,64 @@
+"""
+Gunicorn configuration, read by ``gunicorn`` from the working directory.
+
+The application is loaded once in the arbiter and the workers are forked
+from it, so Django, the apps, the URL resolvers and the compiled templates
+are set up once per deploy rather than once per worker. The bind address
+and the number of workers come from ``PORT`` and ``WEB_CONCURRENCY``.
+
+The workers run uvicorn and serve the ASGI application, which the live
+updates of ``/newspapers/events/`` need; synchronous views still handle one
+request at a time per worker, as before.
+"""
+
+wsgi_app = "news_agency.asgi:application"
+
+worker_class = "uvicorn.workers.UvicornWorker"
+
+preload_app = True
+
+
+def on_starting(server):
+    # Metrics of the previous deploy's workers would be counted forever.
+    from news import metrics
+
+    metrics.clear()
+
+
+def when_ready(server):
+    if not server.cfg.preload_app:
+        return
+    from news import startup
+
+    startup.prewarm()
+    # The caches are filled here rather than at build time, where they would
+    # land in the build container's cache instead of the one serving requests.
+    startup.warm_caches()
+    startup.release_connections()
+
+
+def post_worker_init(worker):
+    from news import memory, startup
+
+    # Lets workers that grew too much ask to be replaced.
+    memory.mark_gunicorn_worker()
+    # Without preloading every worker warms up itself, and the first one
+    # fills the caches.
+    if worker.cfg.preload_app:
+        return
+    startup.prewarm()
+    if worker.age == 1:
+        startup.warm_caches()
+
+
+def worker_exit(server, worker):
+    from news import startup
+
+    startup.flush_buffers()
+
+
+def child_exit(server, worker):
+    # Runs in the arbiter once a worker is gone, even one killed on timeout.
+    from news import metrics
+
+    metrics.retire(worker.pid)
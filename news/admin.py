@@ -1,6 +1,14 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.contrib.auth.admin import UserAdmin
-from .models import Newspaper, Redactor, Topic
+from django.db import IntegrityError, transaction
+from django.http import FileResponse, Http404
+from django.urls import path, reverse
+from django.utils import timezone
+from django.utils.html import format_html, format_html_join
+
+from . import trash
+from .models import AuditEvent, Job, Newspaper, Redactor, RequestProfile, Topic
+from .profiling import profile_path
 
 
 @admin.register(Redactor)
@@ -27,8 +35,188 @@ class RedactorAdmin(UserAdmin):
 
 @admin.register(Newspaper)
 class NewspaperAdmin(admin.ModelAdmin):
+    list_display = ("title", "status", "published_date", "deleted_at")
     search_fields = ("title",)
-    list_filter = ("published_date",)
+    list_filter = (
+        "status",
+        "published_date",
+        ("deleted_at", admin.EmptyFieldListFilter),
+    )
+    actions = ("restore_newspapers",)
+
+    def get_queryset(self, request):
+        # The trash is only reachable from here.
+        return Newspaper.all_objects.select_related("topic")
+
+    @admin.action(description="Restore selected newspapers from the trash")
+    def restore_newspapers(self, request, queryset):
+        restored = trash.restore_newspapers(queryset, actor=request.user)
+        self.message_user(request, f"{restored} newspaper(s) restored.")
+
+
+@admin.register(Topic)
+class TopicAdmin(admin.ModelAdmin):
+    list_display = ("name", "deleted_at")
+    search_fields = ("name",)
+    list_filter = (("deleted_at", admin.EmptyFieldListFilter),)
+    actions = ("restore_topics",)
+
+    def get_queryset(self, request):
+        return Topic.all_objects.all()
+
+    @admin.action(description="Restore selected topics and their newspapers")
+    def restore_topics(self, request, queryset):
+        topics = list(queryset.exclude(deleted_at=None))
+        for topic in topics:
+            trash.restore_topic(topic, actor=request.user)
+        self.message_user(request, f"{len(topics)} topic(s) restored.")
+
+
+@admin.register(AuditEvent)
+class AuditEventAdmin(admin.ModelAdmin):
+    list_display = (
+        "created_at",
+        "action",
+        "newspaper_id",
+        "newspaper_title",
+        "redactor",
+    )
+    list_filter = ("action",)
+    list_select_related = ("redactor",)
+    # Exact lookups use the per-newspaper and per-redactor indexes.
+    search_fields = ("=newspaper_id", "=redactor__id")
+    readonly_fields = [field.name for field in AuditEvent._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        "name",
+        "status",
+        "attempts",
+        "max_attempts",
+        "run_at",
+        "locked_by",
+        "updated_at",
+    )
+    list_filter = ("status", "name")
+    search_fields = ("name", "dedupe_key")
+    readonly_fields = (
+        "locked_by",
+        "locked_at",
+        "last_error",
+        "created_at",
+        "updated_at",
+    )
+    actions = ("retry_jobs",)
+
+    @admin.action(description="Retry selected jobs now")
+    def retry_jobs(self, request, queryset):
+        try:
+            with transaction.atomic():
+                updated = queryset.exclude(status=Job.Status.RUNNING).update(
+                    status=Job.Status.PENDING, attempts=0, run_at=timezone.now()
+                )
+        except IntegrityError:
+            self.message_user(
+                request,
+                "Some of the selected jobs are already queued again.",
+                messages.ERROR,
+            )
+        else:
+            self.message_user(request, f"{updated} job(s) queued for retry.")
+
 
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    list_display = (
+        "created_at",
+        "method",
+        "path",
+        "status_code",
+        "duration",
+        "query_count",
+        "query_duration",
+        "user",
+    )
+    list_filter = ("method", "status_code")
+    search_fields = ("path",)
+    fields = (
+        "created_at",
+        "user",
+        "method",
+        "path",
+        "status_code",
+        "duration",
+        "query_count",
+        "query_duration",
+        "raw_profile",
+        "slowest_functions",
+        "query_plans",
+    )
+    readonly_fields = fields
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        return [
+            path(
+                "<int:pk>/download/",
+                self.admin_site.admin_view(self.download),
+                name="news_requestprofile_download",
+            ),
+        ] + super().get_urls()
 
-admin.site.register(Topic)
+    def download(self, request, pk):
+        if not self.has_view_permission(request):
+            raise Http404
+        profile = self.get_object(request, pk)
+        if profile is None or not profile_path(profile.pk).exists():
+            raise Http404("The profile has been overwritten.")
+        return FileResponse(
+            profile_path(profile.pk).open("rb"),
+            as_attachment=True,
+            filename=f"request-{profile.pk}.prof",
+        )
+
+    @admin.display(description="Raw profile")
+    def raw_profile(self, obj):
+        return format_html(
+            '<a href="{}">request-{}.prof</a>',
+            reverse("admin:news_requestprofile_download", args=[obj.pk]),
+            obj.pk,
+        )
+
+    @admin.display(description="Slowest functions")
+    def slowest_functions(self, obj):
+        return format_html("<pre>{}</pre>", obj.stats)
+
+    @admin.display(description="Queries")
+    def query_plans(self, obj):
+        return format_html_join(
+            "",
+            "<p>{} ms on {}</p><pre>{}\n{}</pre><pre>{}</pre>",
+            (
+                (
+                    f"{query['duration'] * 1000:.1f}",
+                    query["using"],
+                    query["sql"],
+                    query["params"],
+                    query.get("explain", ""),
+                )
+                for query in obj.queries
+            ),
+        )
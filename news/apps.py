@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class NewsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "news"
+
+    def ready(self):
+        from news import metrics, signals, tasks  # noqa: F401
+
+        metrics.install()
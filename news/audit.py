@@ -0,0 +1,95 @@
+"""
+Audit journal of who created, updated, deleted and (un)assigned newspapers.
+
+Events are queued in memory once the change commits and written with one
+``bulk_create`` every ``AUDIT_FLUSH_INTERVAL`` seconds or
+``AUDIT_MAX_PENDING`` events, so a request never waits for an INSERT of its
+own. The queue is written when the process exits, from gunicorn's
+``worker_exit`` hook and ``atexit``, so a graceful shutdown loses nothing.
+Events that could not be written are queued again, up to
+``AUDIT_MAX_QUEUED``; beyond that the oldest are logged and dropped.
+"""
+
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from news.models import AuditEvent
+
+logger = logging.getLogger(__name__)
+
+
+class AuditJournal:
+    """Per-process queue of audit events, written in batches."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = []
+        self._last_flush = time.monotonic()
+
+    def record(self, action, newspaper, redactor=None, **details):
+        """Queue an event about ``newspaper`` once the current transaction commits."""
+        event = AuditEvent(
+            action=action,
+            newspaper_id=newspaper.pk,
+            newspaper_title=newspaper.title,
+            redactor_id=getattr(redactor, "pk", None),
+            details=details,
+            created_at=timezone.now(),
+        )
+        transaction.on_commit(lambda: self._queue(event))
+
+    def _queue(self, event):
+        with self._lock:
+            self._pending.append(event)
+            due = len(self._pending) >= settings.AUDIT_MAX_PENDING
+        if due:
+            self.flush()
+        else:
+            self.flush_if_due()
+
+    def flush_if_due(self):
+        if time.monotonic() - self._last_flush >= settings.AUDIT_FLUSH_INTERVAL:
+            self.flush()
+
+    def clear(self):
+        with self._lock:
+            self._pending = []
+            self._last_flush = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self._last_flush = time.monotonic()
+        if not pending:
+            return
+        try:
+            AuditEvent.objects.bulk_create(pending, batch_size=500)
+        except Exception:
+            logger.exception("Could not write %s audit events", len(pending))
+            with self._lock:
+                self._pending[:0] = pending
+                # While the database is unreachable the oldest events go first;
+                # the log keeps what they said.
+                overflow = max(0, len(self._pending) - settings.AUDIT_MAX_QUEUED)
+                dropped = self._pending[:overflow]
+                del self._pending[:overflow]
+            for event in dropped:
+                logger.error(
+                    "Dropped audit event: %s newspaper %s (%r) by redactor %s at %s %s",
+                    event.action,
+                    event.newspaper_id,
+                    event.newspaper_title,
+                    event.redactor_id,
+                    event.created_at.isoformat(),
+                    event.details,
+                )
+
+
+journal = AuditJournal()
+atexit.register(journal.flush)
@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+
+def user_cache_key(user_id):
+    return f"auth-user:{user_id}"
+
+
+def invalidate_cached_user(user_id):
+    cache.delete(user_cache_key(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ``ModelBackend`` that serves the per-request user lookup from the cache.
+
+    The snapshot is the tuple of the user's concrete field values, rebuilt
+    with ``Model.from_db()``. The news signals drop it whenever the user is
+    saved or deleted (which covers password changes and ``last_login``
+    updates) and on logout.
+    """
+
+    def get_user(self, user_id):
+        user_model = get_user_model()
+        key = user_cache_key(user_id)
+        field_names = [field.attname for field in user_model._meta.concrete_fields]
+
+        values = cache.get(key)
+        if values is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                values = tuple(getattr(user, name) for name in field_names)
+                cache.set(key, values, settings.AUTH_USER_CACHE_TIMEOUT)
+            return user
+
+        user = user_model.from_db(DEFAULT_DB_ALIAS, field_names, values)
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,68 @@
+from collections.abc import Callable
+from time import monotonic, sleep, time, time_ns
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+def _version_key(namespace: str) -> str:
+    return f"version:{namespace}"
+
+
+def get_version(namespace: str) -> int:
+    """
+    Return the current cache version of a namespace.
+
+    Versions are nanosecond timestamps, so a namespace whose version key has
+    been evicted never reuses a version that older entries were stored under.
+    """
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(*namespaces: str) -> None:
+    """Invalidate every entry stored under the given namespaces."""
+    version = time_ns()
+    cache.set_many({_version_key(namespace): version for namespace in namespaces}, None)
+
+
+def get_or_compute(
+    key: str, compute: Callable[[], Any], timeout: int, stale_timeout: int = 0
+) -> Any:
+    """
+    Return the cached value of ``key``, computing it on a miss.
+
+    Only one caller computes a missing value at a time; concurrent callers
+    wait up to ``CACHE_LOCK_WAIT`` seconds for it before computing it
+    themselves. For ``stale_timeout`` seconds after ``timeout`` the old
+    value keeps being served while a single caller refreshes it.
+    """
+    entry = cache.get(key)
+    lock_key = f"lock:{key}"
+
+    if entry is not None:
+        value, fresh_until = entry
+        if fresh_until > time() or not cache.add(
+            lock_key, 1, settings.CACHE_LOCK_TIMEOUT
+        ):
+            return value
+    elif not cache.add(lock_key, 1, settings.CACHE_LOCK_TIMEOUT):
+        deadline = monotonic() + settings.CACHE_LOCK_WAIT
+        while monotonic() < deadline:
+            sleep(0.05)
+            entry = cache.get(key)
+            if entry is not None:
+                return entry[0]
+        return compute()
+
+    try:
+        value = compute()
+        cache.set(key, (value, time() + timeout), timeout + stale_timeout)
+    finally:
+        cache.delete(lock_key)
+    return value
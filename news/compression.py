@@ -0,0 +1,130 @@
+"""
+Brotli and gzip compression of the responses Django renders.
+
+WhiteNoise serves static files already compressed; ``CompressionMiddleware``
+handles the dynamic pages. The encoding is negotiated from
+``Accept-Encoding``, streaming responses are compressed and flushed chunk by
+chunk so nothing is held back, and responses that are small, already encoded
+or not text are left alone.
+
+Compression leaks the length of secrets reflected next to attacker-chosen
+text (BREACH). Django masks CSRF tokens per response, and the pages that
+rendered one additionally end with a comment of random length, so their
+compressed length varies from one response to the next.
+"""
+
+import secrets
+import zlib
+
+import brotli
+from django.conf import settings
+
+ENCODINGS = ("br", "gzip")
+
+COMPRESSIBLE_TYPES = {
+    "application/atom+xml",
+    "application/javascript",
+    "application/json",
+    "application/rss+xml",
+    "application/x-ndjson",
+    "application/xml",
+    "image/svg+xml",
+}
+
+# Events must reach the client as soon as they are sent.
+UNCOMPRESSED_TYPES = {"text/event-stream"}
+
+
+def negotiate(accept_encoding):
+    """Return the preferred encoding among ``ENCODINGS``, or None."""
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, parameters = part.partition(";")
+        parameter, _, value = parameters.partition("=")
+        try:
+            weight = float(value) if parameter.strip() == "q" else 1.0
+        except ValueError:
+            weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    def weight(encoding):
+        return weights.get(encoding, weights.get("*", 0.0))
+
+    # On equal weights the first of ENCODINGS wins.
+    best = max(ENCODINGS, key=weight)
+    return best if weight(best) > 0 else None
+
+
+def is_compressible(response):
+    content_type = response.get("Content-Type", "").split(";")[0].strip().lower()
+    if content_type in UNCOMPRESSED_TYPES:
+        return False
+    return content_type.startswith("text/") or content_type in COMPRESSIBLE_TYPES
+
+
+def is_html(response):
+    return response.get("Content-Type", "").lower().startswith("text/html")
+
+
+def used_csrf_token(request, response):
+    """Return whether ``response`` may contain the request's CSRF token."""
+    # CsrfViewMiddleware sends the cookie with every response that used the
+    # token, and only then clears its flag.
+    return settings.CSRF_COOKIE_NAME in response.cookies or bool(
+        request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+    )
+
+
+def padding():
+    """Return an HTML comment of random length that does not compress away."""
+    length = secrets.randbelow(settings.COMPRESSION_PADDING_MAX + 1)
+    return f"<!-- {secrets.token_urlsafe(length)} -->".encode()
+
+
+class Encoder:
+    """Incremental compressor for one response body."""
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(
+                quality=settings.COMPRESSION_BROTLI_QUALITY
+            )
+        else:
+            self._compressor = zlib.compressobj(
+                settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+            )
+
+    def compress(self, chunk, flush=True):
+        """Compress ``chunk``; flushed output can be used by the client at once."""
+        if self.encoding == "br":
+            output = self._compressor.process(chunk)
+            return output + self._compressor.flush() if flush else output
+        output = self._compressor.compress(chunk)
+        return output + self._compressor.flush(zlib.Z_SYNC_FLUSH) if flush else output
+
+    def finish(self):
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+def compress(content, encoding):
+    encoder = Encoder(encoding)
+    return encoder.compress(content, flush=False) + encoder.finish()
+
+
+def compress_stream(chunks, encoding, trailer=b""):
+    encoder = Encoder(encoding)
+    for chunk in chunks:
+        if chunk:
+            yield encoder.compress(chunk)
+    yield encoder.compress(trailer) + encoder.finish()
+
+
+async def acompress_stream(chunks, encoding, trailer=b""):
+    encoder = Encoder(encoding)
+    async for chunk in chunks:
+        if chunk:
+            yield encoder.compress(chunk)
+    yield encoder.compress(trailer) + encoder.finish()
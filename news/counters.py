@@ -0,0 +1,195 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import timedelta
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Q, Sum
+from django.utils import timezone
+
+from news.models import Newspaper, NewspaperViewBucket
+from news.routers import on_primary
+
+logger = logging.getLogger(__name__)
+
+MOST_READ_PERIODS = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+}
+
+UPDATE_BATCH_SIZE = 500
+
+
+def apply_increments(model, key_fields, field, deltas, create_missing=True):
+    """
+    Add ``deltas`` to ``field`` of the ``model`` rows identified by key tuples.
+
+    ``deltas`` maps tuples of ``key_fields`` values to increments. With
+    ``create_missing``, rows that get a positive increment are created first
+    if they do not exist yet. Keys are then grouped by increment, so each
+    UPDATE ... SET field = field + n covers a whole batch of rows instead of
+    one row per key.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    manager = model._base_manager
+
+    missing = [key for key, delta in deltas.items() if delta > 0]
+    if create_missing and missing:
+        manager.bulk_create(
+            [model(**dict(zip(key_fields, key))) for key in missing],
+            ignore_conflicts=True,
+            batch_size=UPDATE_BATCH_SIZE,
+        )
+
+    by_delta = defaultdict(list)
+    for key, delta in deltas.items():
+        by_delta[delta].append(key)
+
+    for delta, keys in by_delta.items():
+        for start in range(0, len(keys), UPDATE_BATCH_SIZE):
+            condition = reduce(
+                or_,
+                (
+                    Q(**dict(zip(key_fields, key)))
+                    for key in keys[start : start + UPDATE_BATCH_SIZE]
+                ),
+            )
+            manager.filter(condition).update(**{field: F(field) + delta})
+
+
+class ViewCounter:
+    """
+    Per-process buffer of newspaper views.
+
+    Views are counted in memory and written every ``VIEW_COUNT_FLUSH_INTERVAL``
+    seconds (or once ``VIEW_COUNT_MAX_PENDING`` newspapers are pending), so
+    popular articles are not serialized on row locks by one UPDATE per page
+    view. Each flush adds to ``Newspaper.view_count`` and to the hourly
+    ``NewspaperViewBucket`` rows that the "most read" ranking is built from.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = Counter()
+        self._last_flush = time.monotonic()
+        self._last_prune = None
+        self._suspended = 0
+
+    def record(self, newspaper_id):
+        if self._suspended:
+            return
+        hour = timezone.now().replace(minute=0, second=0, microsecond=0)
+        with self._lock:
+            self._pending[newspaper_id, hour] += 1
+            due = (
+                len(self._pending) >= settings.VIEW_COUNT_MAX_PENDING
+                or time.monotonic() - self._last_flush
+                >= settings.VIEW_COUNT_FLUSH_INTERVAL
+            )
+        if due:
+            self.flush()
+
+    @contextmanager
+    def suspended(self):
+        """Ignore the views recorded in this block, e.g. by the cache warmer."""
+        with self._lock:
+            self._suspended += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._suspended -= 1
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._last_flush = time.monotonic()
+        if not pending:
+            return
+        try:
+            with on_primary():
+                self._write(pending)
+        except Exception:
+            logger.exception("Could not write %s buffered view counts", len(pending))
+            with self._lock:
+                self._pending.update(pending)
+
+    def _write(self, pending):
+        totals = Counter()
+        for (newspaper_id, hour), views in pending.items():
+            totals[newspaper_id] += views
+        existing = set(
+            Newspaper._base_manager.filter(pk__in=totals).values_list("pk", flat=True)
+        )
+
+        with transaction.atomic():
+            apply_increments(
+                Newspaper,
+                ("pk",),
+                "view_count",
+                {
+                    (newspaper_id,): views
+                    for newspaper_id, views in totals.items()
+                    if newspaper_id in existing
+                },
+                create_missing=False,
+            )
+            apply_increments(
+                NewspaperViewBucket,
+                ("newspaper_id", "hour"),
+                "views",
+                {key: views for key, views in pending.items() if key[0] in existing},
+            )
+        self._prune()
+
+    def _prune(self):
+        hour = timezone.now().replace(minute=0, second=0, microsecond=0)
+        if self._last_prune == hour:
+            return
+        self._last_prune = hour
+        retention = max(MOST_READ_PERIODS.values()) + timedelta(hours=1)
+        NewspaperViewBucket.objects.filter(hour__lt=hour - retention).delete()
+
+
+view_counter = ViewCounter()
+atexit.register(view_counter.flush)
+
+
+def most_read(period, limit=10):
+    """
+    Return ``(newspaper_id, title, views)`` of the most read newspapers.
+
+    The ranking sums the hourly buckets of the period and is cached for
+    ``MOST_READ_CACHE_TIMEOUT`` seconds, so its cost depends neither on the
+    traffic nor on how often the ranking is shown.
+    """
+    key = f"most-read:{period}:{limit}"
+    ranking = cache.get(key)
+    if ranking is None:
+        hour = timezone.now().replace(minute=0, second=0, microsecond=0)
+        since = hour - MOST_READ_PERIODS[period] + timedelta(hours=1)
+        ranking = list(
+            NewspaperViewBucket.objects.filter(
+                hour__gte=since,
+                newspaper__status=Newspaper.Status.PUBLISHED,
+                newspaper__deleted_at=None,
+            )
+            .values("newspaper")
+            .annotate(views=Sum("views"))
+            .order_by("-views")
+            .values_list("newspaper", "newspaper__title", "views")[:limit]
+        )
+        cache.set(key, ranking, settings.MOST_READ_CACHE_TIMEOUT)
+    return ranking
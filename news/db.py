@@ -0,0 +1,221 @@
+"""
+Database helpers: query plans and the slow query log.
+
+Every connection gets ``slow_query_log`` as an execute wrapper when it is
+created. Queries taking ``SLOW_QUERY_THRESHOLD`` seconds or more are logged
+and appended to the JSON lines file ``SLOW_QUERY_LOG`` with their
+fingerprint, the URL name of the view, the project and template lines that
+ran them and their plan; the ``slow_queries`` command aggregates the file.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+from django.template.base import Node
+from django.utils import timezone
+
+from news import metrics
+
+logger = logging.getLogger(__name__)
+
+BACKENDS_DIR = os.path.join("django", "db", "backends")
+RENDER_ANNOTATED = Node.render_annotated.__code__
+# Middleware frames surround every view, so they never explain a query.
+MIDDLEWARE_FILE = os.path.join(os.path.dirname(__file__), "middleware.py")
+
+STRING_RE = re.compile(r"'(?:[^']|'')*'")
+NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+PLACEHOLDER_LIST_RE = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+def explain(sql, params=None, using="default", analyze=False):
+    """Return the query plan of ``sql`` as the database describes it."""
+    connection = connections[using]
+    options = {"analyze": True} if analyze else {}
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"{connection.ops.explain_query_prefix(**options)} {sql}", params
+        )
+        rows = cursor.fetchall()
+    # Some backends return one text column, others the plan's ids and text.
+    return "\n".join(
+        row[0] if len(row) == 1 else " ".join(str(value) for value in row)
+        for row in rows
+    )
+
+
+def normalize(sql):
+    """Return ``sql`` with its literals and placeholder lists collapsed."""
+    sql = sql.replace("%s", "?")
+    sql = STRING_RE.sub("?", sql)
+    sql = NUMBER_RE.sub("?", sql)
+    sql = PLACEHOLDER_LIST_RE.sub("(...)", sql)
+    return WHITESPACE_RE.sub(" ", sql).strip()
+
+
+def fingerprint(sql):
+    """Return a short id shared by the queries that differ only in values."""
+    return hashlib.sha1(normalize(sql).encode()).hexdigest()[:12]
+
+
+def call_site():
+    """
+    Return the project line and the template line running the current query.
+
+    Project frames between the database backend frames are execute
+    wrappers, so the first project frame outside them is the caller. Queries
+    run while a template renders have no caller but the template line.
+    """
+    code_line = template_line = None
+    base_dir = str(settings.BASE_DIR)
+    frame = sys._getframe(1)
+    while frame is not None:
+        code = frame.f_code
+        if BACKENDS_DIR in code.co_filename:
+            code_line = None
+        elif (
+            code_line is None
+            and code.co_filename.startswith(base_dir)
+            and "site-packages" not in code.co_filename
+            and code.co_filename != MIDDLEWARE_FILE
+        ):
+            path = os.path.relpath(code.co_filename, base_dir)
+            code_line = f"{path}:{frame.f_lineno} in {code.co_name}"
+        if template_line is None and code is RENDER_ANNOTATED:
+            node = frame.f_locals.get("self")
+            token = getattr(node, "token", None)
+            if token is not None and node.origin is not None:
+                template_line = f"{node.origin.template_name}:{token.lineno}"
+        frame = frame.f_back
+    return code_line, template_line
+
+
+class SlowQueryLog:
+    """Execute wrapper recording the queries slower than the threshold."""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        succeeded = False
+        try:
+            result = execute(sql, params, many, context)
+            succeeded = True
+            return result
+        finally:
+            duration = time.perf_counter() - started
+            threshold = settings.SLOW_QUERY_THRESHOLD
+            # The plan's own query must not be logged in turn.
+            if (
+                threshold
+                and duration >= threshold
+                and not getattr(self._local, "active", False)
+            ):
+                self._local.active = True
+                try:
+                    self.record(
+                        sql, params, many, duration, context["connection"], succeeded
+                    )
+                except Exception:
+                    logger.exception("Could not record a slow query")
+                finally:
+                    self._local.active = False
+
+    def record(self, sql, params, many, duration, connection, succeeded):
+        code_line, template_line = call_site()
+        entry = {
+            "time": timezone.now().isoformat(),
+            "using": connection.alias,
+            "duration": duration,
+            "fingerprint": fingerprint(sql),
+            "normalized": normalize(sql),
+            "sql": sql,
+            "params": repr(params)[:1000],
+            "view": metrics.current_view.get() or None,
+            "code": code_line,
+            "template": template_line,
+            "plan": (
+                self.plan(sql, params, connection) if succeeded and not many else None
+            ),
+        }
+        logger.warning(
+            "Slow query (%.0f ms) in %s at %s: %s",
+            duration * 1000,
+            entry["view"] or "no view",
+            template_line or code_line,
+            entry["normalized"],
+        )
+        self.append(entry)
+
+    def plan(self, sql, params, connection):
+        if not sql.lstrip().upper().startswith("SELECT"):
+            return None
+        # A failed EXPLAIN must not break the caller's transaction.
+        savepoint = (
+            transaction.atomic(using=connection.alias)
+            if connection.in_atomic_block
+            else nullcontext()
+        )
+        try:
+            with savepoint:
+                return explain(
+                    sql,
+                    params,
+                    connection.alias,
+                    analyze=settings.SLOW_QUERY_EXPLAIN_ANALYZE,
+                )
+        except (DatabaseError, ValueError) as error:
+            return f"Could not explain: {error}"
+
+    def append(self, entry):
+        path = Path(settings.SLOW_QUERY_LOG)
+        line = json.dumps(entry, default=str) + "\n"
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if (
+                path.exists()
+                and path.stat().st_size > settings.SLOW_QUERY_LOG_MAX_BYTES
+            ):
+                # Keep one previous file, like a rotating log handler.
+                os.replace(path, f"{path}.1")
+            with path.open("a", encoding="utf-8") as log:
+                log.write(line)
+
+
+slow_query_log = SlowQueryLog()
+
+
+def install_slow_query_log(connection):
+    """Add the slow query log to a new connection."""
+    # Innermost, so it times the query alone, and first, so the wrappers
+    # pushed and popped by ``execute_wrapper()`` blocks stay on top of it.
+    if slow_query_log not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, slow_query_log)
+
+
+def read_slow_queries(path=None):
+    """Yield the entries of the slow query log, oldest file first."""
+    path = Path(path or settings.SLOW_QUERY_LOG)
+    for file in (Path(f"{path}.1"), path):
+        if not file.exists():
+            continue
+        with file.open(encoding="utf-8") as log:
+            for line in log:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # A line cut short by a crashed writer.
+                    continue
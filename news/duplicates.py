@@ -0,0 +1,119 @@
+"""
+Near-duplicate detection with MinHash signatures and LSH buckets.
+
+A newspaper's signature holds, for each of ``PERMUTATIONS`` hash functions,
+the smallest hash of its word trigrams; the share of equal positions in two
+signatures estimates the Jaccard similarity of their trigram sets. The
+signature is cut into ``BANDS`` bands whose hashes are stored as buckets:
+newspapers sharing a bucket are the only candidates a lookup verifies, so it
+costs a few index probes instead of a scan of the archive.
+"""
+
+import re
+from hashlib import blake2b
+
+import numpy as np
+from django.conf import settings
+
+from news.models import Newspaper, NewspaperFingerprint, NewspaperFingerprintBucket
+
+PERMUTATIONS = 64
+BANDS = 16
+ROWS = PERMUTATIONS // BANDS
+SHINGLE_SIZE = 3
+
+TOKEN_RE = re.compile(r"\w+")
+
+# Multiply-shift hash functions, fixed so that signatures stay comparable.
+_rng = np.random.default_rng(0x6E657773)
+_MULTIPLIERS = _rng.integers(1, 2**64, PERMUTATIONS, dtype=np.uint64) | np.uint64(1)
+_INCREMENTS = _rng.integers(0, 2**64, PERMUTATIONS, dtype=np.uint64)
+
+
+def shingles(title, content):
+    tokens = TOKEN_RE.findall(f"{title} {content}".casefold())
+    if len(tokens) < settings.DUPLICATE_MIN_TOKENS:
+        return None
+    return {
+        " ".join(tokens[start : start + SHINGLE_SIZE])
+        for start in range(len(tokens) - SHINGLE_SIZE + 1)
+    }
+
+
+def signature(title, content):
+    """Return the MinHash signature of a newspaper, or None if it is too short."""
+    features = shingles(title, content)
+    if features is None:
+        return None
+    hashes = np.fromiter(
+        (
+            int.from_bytes(blake2b(feature.encode(), digest_size=8).digest(), "little")
+            for feature in features
+        ),
+        dtype=np.uint64,
+        count=len(features),
+    )
+    permuted = (hashes[:, None] * _MULTIPLIERS + _INCREMENTS) >> np.uint64(32)
+    return permuted.min(axis=0).astype("<u4")
+
+
+def buckets(signature):
+    """Return the LSH bucket of each band of ``signature``."""
+    return [
+        int.from_bytes(
+            blake2b(
+                bytes([band]) + signature[band * ROWS : (band + 1) * ROWS].tobytes(),
+                digest_size=8,
+            ).digest(),
+            "little",
+            signed=True,
+        )
+        for band in range(BANDS)
+    ]
+
+
+def similarity(first, second):
+    """Estimate the Jaccard similarity of two signatures."""
+    return float(np.mean(first == second))
+
+
+def from_bytes(data):
+    return np.frombuffer(data, dtype="<u4")
+
+
+def store(newspaper, created=False):
+    """Save the fingerprint and buckets of ``newspaper``, or drop stale ones."""
+    if not created:
+        NewspaperFingerprintBucket.objects.filter(newspaper=newspaper).delete()
+    current = signature(newspaper.title, newspaper.content)
+    if current is None:
+        if not created:
+            NewspaperFingerprint.objects.filter(newspaper=newspaper).delete()
+        return
+    NewspaperFingerprint.objects.update_or_create(
+        newspaper=newspaper, defaults={"signature": current.tobytes()}
+    )
+    NewspaperFingerprintBucket.objects.bulk_create(
+        NewspaperFingerprintBucket(newspaper=newspaper, bucket=bucket)
+        for bucket in buckets(current)
+    )
+
+
+def find_near_duplicates(title, content, exclude=None):
+    """Return the newspapers whose text is nearly the same as this one."""
+    current = signature(title, content)
+    if current is None:
+        return []
+    candidates = NewspaperFingerprint.objects.filter(
+        newspaper_id__in=NewspaperFingerprintBucket.objects.filter(
+            bucket__in=buckets(current)
+        ).values("newspaper_id")
+    )
+    if exclude is not None:
+        candidates = candidates.exclude(newspaper_id=exclude)
+    ids = [
+        newspaper_id
+        for newspaper_id, data in candidates.values_list("newspaper_id", "signature")
+        if similarity(current, from_bytes(data)) >= settings.DUPLICATE_MIN_SIMILARITY
+    ]
+    return list(Newspaper.objects.filter(pk__in=ids)) if ids else []
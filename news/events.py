@@ -0,0 +1,133 @@
+"""
+Fan-out of newspaper changes to Server-Sent Events clients.
+
+Every connected client owns a bounded ``asyncio.Queue`` registered with the
+process-wide ``hub``. Changes reach the hub two ways: saves made by this
+process publish right after they commit, and while anyone is connected one
+poller per event loop reads the newspapers updated since its last look, so
+changes made by other processes (WSGI workers, job workers) arrive as well.
+Either way the cost is per process, not per client.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils import timezone
+
+from news.models import Newspaper
+
+logger = logging.getLogger(__name__)
+
+
+def newspaper_event(newspaper, topic_name):
+    return {
+        "id": newspaper.pk,
+        "title": newspaper.title,
+        "topic": topic_name,
+        "url": newspaper.get_absolute_url(),
+        "published_date": newspaper.published_date.isoformat(),
+        "updated_at": newspaper.updated_at.isoformat(),
+    }
+
+
+class Hub:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+        self._pollers = {}
+        self._sent = {}
+
+    def subscribe(self):
+        """Register a queue for the calling event loop and return it."""
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=settings.SSE_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.setdefault(loop, set()).add(queue)
+            if loop not in self._pollers:
+                self._pollers[loop] = loop.create_task(self._poll())
+        return queue
+
+    def unsubscribe(self, queue):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            queues = self._subscribers.get(loop, set())
+            queues.discard(queue)
+            if not queues:
+                self._subscribers.pop(loop, None)
+                poller = self._pollers.pop(loop, None)
+                if poller is not None:
+                    poller.cancel()
+
+    def publish(self, event):
+        """Send ``event`` to every subscriber; safe to call from any thread."""
+        with self._lock:
+            if not self._subscribers:
+                return
+            sent = self._sent.get(event["id"])
+            if sent is not None and sent[0] == event["updated_at"]:
+                return
+            self._sent[event["id"]] = (event["updated_at"], time.monotonic())
+            loops = list(self._subscribers)
+        for loop in loops:
+            try:
+                loop.call_soon_threadsafe(self._deliver, loop, event)
+            except RuntimeError:
+                # The loop has been closed since the snapshot.
+                pass
+
+    def _deliver(self, loop, event):
+        for queue in list(self._subscribers.get(loop, ())):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # A client that stopped reading misses events rather than
+                # holding memory for them.
+                pass
+
+    async def _poll(self):
+        since = timezone.now()
+        while True:
+            await asyncio.sleep(settings.SSE_POLL_INTERVAL)
+            try:
+                events, since = await sync_to_async(self._changes)(since)
+            except Exception:
+                logger.exception("Could not poll for newspaper changes")
+                continue
+            for event in events:
+                self.publish(event)
+
+    def _changes(self, since):
+        """Return the events of newspapers updated since ``since``."""
+        # Re-read an overlap window so a transaction committing after a
+        # later one is not skipped; ``publish`` drops what was already sent.
+        overlap = timedelta(seconds=settings.SSE_POLL_OVERLAP)
+        newspapers = (
+            Newspaper.objects.visible()
+            .filter(updated_at__gte=since - overlap)
+            .select_related("topic")
+            .order_by("updated_at")
+        )
+        now = timezone.now()
+        events = [
+            newspaper_event(newspaper, newspaper.topic.name) for newspaper in newspapers
+        ]
+        horizon = time.monotonic() - 2 * (
+            settings.SSE_POLL_OVERLAP + settings.SSE_POLL_INTERVAL
+        )
+        with self._lock:
+            self._sent = {
+                pk: sent for pk, sent in self._sent.items() if sent[1] >= horizon
+            }
+        return events, now
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(queues) for queues in self._subscribers.values())
+
+
+hub = Hub()
@@ -0,0 +1,174 @@
+import json
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.http import Http404, HttpResponse, HttpResponseNotModified
+from django.shortcuts import get_object_or_404
+from django.urls import reverse, reverse_lazy
+from django.utils import feedgenerator
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, quote_etag
+
+from news.cache import get_version
+from news.models import Newspaper, Redactor, Topic
+
+
+class JsonFeedGenerator(feedgenerator.SyndicationFeed):
+    """Feed generator producing a JSON Feed 1.1 document."""
+
+    content_type = "application/feed+json; charset=utf-8"
+
+    def write(self, outfile, encoding):
+        data = {
+            "version": "https://jsonfeed.org/version/1.1",
+            "title": self.feed["title"],
+            "home_page_url": self.feed["link"],
+            "feed_url": self.feed["feed_url"],
+            "description": self.feed["description"],
+            "items": [
+                {
+                    "id": item["unique_id"] or item["link"],
+                    "url": item["link"],
+                    "title": item["title"],
+                    "content_html": item["description"],
+                    "date_published": item["pubdate"].isoformat(),
+                    "tags": item["categories"],
+                }
+                for item in self.items
+            ],
+        }
+        outfile.write(json.dumps(data))
+
+
+FEED_TYPES = {
+    "rss": feedgenerator.Rss201rev2Feed,
+    "atom": feedgenerator.Atom1Feed,
+    "json": JsonFeedGenerator,
+}
+
+
+class LatestNewspapersFeed(Feed):
+    """
+    Public feed of the newest newspapers.
+
+    Rendered feed bodies are cached per scope and format under the scope's
+    cache version, which the news signals bump whenever a newspaper in that
+    scope changes. Pollers sending a matching ``If-None-Match`` get a 304
+    without the feed being rendered: the site feed needs no database access,
+    and the topic and redactor feeds only check that their topic or redactor
+    still exists.
+    """
+
+    title = "News Agency: latest newspapers"
+    link = reverse_lazy("news:newspaper-list")
+    description = "The newest newspapers published by the agency."
+
+    def __init__(self, feed_format="rss"):
+        super().__init__()
+        self.feed_format = feed_format
+        self.feed_type = FEED_TYPES[feed_format]
+
+    def __call__(self, request, *args, **kwargs):
+        # A missing topic or redactor is a 404 even for a client holding a tag.
+        self.get_object(request, *args, **kwargs)
+        scope = self.get_scope(**kwargs)
+        version = get_version(scope)
+        # The tag names a version of the items, not the bytes, which differ
+        # per Content-Encoding; so it is weak and compared weakly.
+        etag = "W/" + quote_etag(f"{scope}:{self.feed_format}:{version}")
+        client_etags = {
+            tag.removeprefix("W/")
+            for tag in parse_etags(request.headers.get("If-None-Match", ""))
+        }
+
+        if etag.removeprefix("W/") in client_etags:
+            response = HttpResponseNotModified()
+        else:
+            key = f"{scope}:{self.feed_format}:{version}"
+            rendered = cache.get(key)
+            if rendered is None:
+                feed_response = super().__call__(request, *args, **kwargs)
+                rendered = (feed_response.content, feed_response["Content-Type"])
+                cache.set(key, rendered, settings.FEED_CACHE_TIMEOUT)
+            content, content_type = rendered
+            response = HttpResponse(content, content_type=content_type)
+
+        response["ETag"] = etag
+        patch_cache_control(response, public=True, max_age=settings.FEED_MAX_AGE)
+        return response
+
+    def get_scope(self, **kwargs):
+        return "feed:all"
+
+    def items(self):
+        return Newspaper.objects.visible().select_related("topic")[
+            : settings.FEED_ITEMS
+        ]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.content_html
+
+    def item_pubdate(self, item):
+        return item.published_date
+
+    def item_categories(self, item):
+        return [item.topic.name]
+
+
+class TopicNewspapersFeed(LatestNewspapersFeed):
+    description = "The newest newspapers on a topic."
+
+    def get_scope(self, pk):
+        return f"feed:topic:{pk}"
+
+    def get_object(self, request, pk):
+        return get_object_or_404(Topic, pk=pk)
+
+    def title(self, obj):
+        return f"News Agency: {obj.name}"
+
+    def link(self, obj):
+        return reverse("news:newspaper-list")
+
+    def items(self, obj):
+        return obj.newspapers.visible().select_related("topic")[: settings.FEED_ITEMS]
+
+
+class RedactorNewspapersFeed(LatestNewspapersFeed):
+    description = "The newest newspapers published by a redactor."
+
+    def get_scope(self, pk):
+        return f"feed:redactor:{pk}"
+
+    def get_object(self, request, pk):
+        return get_object_or_404(Redactor, pk=pk)
+
+    def title(self, obj):
+        return f"News Agency: {obj.username}"
+
+    def link(self, obj):
+        return obj.get_absolute_url()
+
+    def items(self, obj):
+        return obj.newspapers.visible().select_related("topic")[: settings.FEED_ITEMS]
+
+
+def feed_view(feed_class):
+    """Build a view serving ``feed_class`` in every supported format."""
+    feeds = {feed_format: feed_class(feed_format) for feed_format in FEED_TYPES}
+
+    def view(request, feed_format, **kwargs):
+        if feed_format not in feeds:
+            raise Http404("Unknown feed format.")
+        return feeds[feed_format](request, **kwargs)
+
+    return view
+
+
+latest_newspapers_feed = feed_view(LatestNewspapersFeed)
+topic_newspapers_feed = feed_view(TopicNewspapersFeed)
+redactor_newspapers_feed = feed_view(RedactorNewspapersFeed)
@@ -21,10 +21,66 @@ class NewspaperForm(forms.ModelForm):
         widget=forms.CheckboxSelectMultiple,
         required=False,
     )
+    allow_duplicate = forms.BooleanField(
+        required=False,
+        label="Publish even if it looks like a duplicate",
+    )
 
     class Meta:
         model = Newspaper
         fields = "__all__"
+        # Saved by ``save_publishers`` rather than by the ModelForm's m2m save.
+        exclude = ["publishers"]
+        widgets = {
+            "publish_at": forms.DateTimeInput(
+                attrs={"type": "datetime-local"}, format="%Y-%m-%dT%H:%M"
+            ),
+        }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk is not None and "publishers" not in self.initial:
+            self.initial["publishers"] = list(
+                self.instance.publishers.values_list("pk", flat=True)
+            )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        title, content = cleaned_data.get("title"), cleaned_data.get("content")
+        if title and content and not cleaned_data.get("allow_duplicate"):
+            from news.duplicates import find_near_duplicates
+
+            duplicates = find_near_duplicates(title, content, exclude=self.instance.pk)
+            if duplicates:
+                raise forms.ValidationError(
+                    "This looks like a near-duplicate of %(titles)s. "
+                    "Tick the box below to publish it anyway.",
+                    code="near_duplicate",
+                    params={
+                        "titles": ", ".join(
+                            f"“{newspaper.title}”" for newspaper in duplicates
+                        )
+                    },
+                )
+        return cleaned_data
+
+    def save(self, commit=True):
+        """Save the newspaper, then its publishers as a diff of the stored links."""
+        newspaper = super().save(commit)
+        if commit:
+            self.save_publishers()
+        else:
+            save_m2m = self.save_m2m
+
+            def save_m2m_and_publishers():
+                save_m2m()
+                self.save_publishers()
+
+            self.save_m2m = save_m2m_and_publishers
+        return newspaper
+
+    def save_publishers(self):
+        self.instance.set_publishers(self.cleaned_data["publishers"])
 
 
 class TopicSearchForm(forms.Form):
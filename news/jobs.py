@@ -0,0 +1,217 @@
+"""
+A small database-backed job queue.
+
+Jobs are rows of ``news.Job``. Workers claim due jobs with a conditional
+UPDATE, so several threads or processes can share the queue on SQLite and
+Postgres alike without an external broker. A running job's lock is renewed
+every ``JOB_HEARTBEAT_INTERVAL`` seconds; a lock older than
+``JOB_LOCK_TIMEOUT`` belongs to a worker that died.
+"""
+
+import logging
+import os
+import socket
+import threading
+import traceback
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from news.models import Job
+
+logger = logging.getLogger(__name__)
+
+_tasks = {}
+
+
+def task(name):
+    """Register the decorated function as the handler of jobs named ``name``."""
+
+    def decorator(func):
+        _tasks[name] = func
+        return func
+
+    return decorator
+
+
+def enqueue(name, payload=None, *, dedupe_key=None, run_at=None, max_attempts=None):
+    """
+    Queue a job and return it.
+
+    When ``dedupe_key`` is given and a pending or running job with the same
+    key exists, that job is returned instead of queueing a new one.
+    """
+    if name not in _tasks:
+        raise ValueError(f"Unknown task: {name}")
+
+    if dedupe_key:
+        existing = Job.objects.filter(
+            dedupe_key=dedupe_key, status__in=Job.ACTIVE_STATUSES
+        ).first()
+        if existing:
+            return existing
+
+    fields = {"name": name, "payload": payload or {}, "dedupe_key": dedupe_key}
+    if run_at is not None:
+        fields["run_at"] = run_at
+    if max_attempts is not None:
+        fields["max_attempts"] = max_attempts
+
+    try:
+        with transaction.atomic():
+            return Job.objects.create(**fields)
+    except IntegrityError:
+        if not dedupe_key:
+            raise
+        return Job.objects.get(dedupe_key=dedupe_key, status__in=Job.ACTIVE_STATUSES)
+
+
+def worker_id(suffix=""):
+    return f"{socket.gethostname()}:{os.getpid()}{suffix}"
+
+
+def claim_jobs(worker, limit=1):
+    """
+    Claim up to ``limit`` due jobs for ``worker``.
+
+    Running jobs whose lock is older than ``JOB_LOCK_TIMEOUT`` are treated as
+    abandoned by a crashed worker and claimed again, unless they have used up
+    their attempts: a job that keeps killing its worker is marked failed.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.JOB_LOCK_TIMEOUT)
+    candidates = (
+        Job.objects.filter(
+            Q(status=Job.Status.PENDING, run_at__lte=now)
+            | Q(status=Job.Status.RUNNING, locked_at__lt=stale)
+        )
+        .order_by("run_at")
+        .values_list("pk", "status", "locked_at", "attempts", "max_attempts")[
+            : limit * 2
+        ]
+    )
+
+    claimed = []
+    for pk, status, locked_at, attempts, max_attempts in candidates:
+        if status == Job.Status.RUNNING and attempts >= max_attempts:
+            Job.objects.filter(pk=pk, status=status, locked_at=locked_at).update(
+                status=Job.Status.FAILED,
+                locked_by="",
+                locked_at=None,
+                last_error="The worker running the job stopped responding.",
+                updated_at=now,
+            )
+            continue
+        updated = Job.objects.filter(pk=pk, status=status, locked_at=locked_at).update(
+            status=Job.Status.RUNNING,
+            locked_by=worker,
+            locked_at=now,
+            attempts=F("attempts") + 1,
+            updated_at=now,
+        )
+        if updated:
+            claimed.append(Job.objects.get(pk=pk))
+        if len(claimed) == limit:
+            break
+    return claimed
+
+
+def _held(job):
+    """The job's row, as long as the claim of ``job`` has not been taken over."""
+    return Job.objects.filter(
+        pk=job.pk,
+        status=Job.Status.RUNNING,
+        locked_by=job.locked_by,
+        attempts=job.attempts,
+    )
+
+
+@contextmanager
+def heartbeat(job):
+    """Renew the lock of ``job`` from a thread while the block runs."""
+    stop_event = threading.Event()
+
+    def beat():
+        try:
+            while not stop_event.wait(settings.JOB_HEARTBEAT_INTERVAL):
+                _held(job).update(locked_at=timezone.now())
+        except Exception:
+            logger.exception("Could not renew the lock of job %s", job)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=beat, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop_event.set()
+        thread.join()
+
+
+def run_job(job):
+    """
+    Run a claimed job and record its outcome, scheduling a retry on failure.
+
+    The outcome is only written while the worker still holds the claim, so a
+    job claimed again after its heartbeat stopped is not overwritten.
+    """
+    now = timezone.now()
+    try:
+        func = _tasks[job.name]
+        with heartbeat(job):
+            func(**job.payload)
+    except Exception:
+        logger.exception("Job %s failed (attempt %s)", job, job.attempts)
+        job.last_error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            job.status = Job.Status.FAILED
+        else:
+            job.status = Job.Status.PENDING
+            delay = settings.JOB_RETRY_BACKOFF * 2 ** (job.attempts - 1)
+            job.run_at = now + timedelta(seconds=delay)
+    else:
+        job.status = Job.Status.SUCCEEDED
+        job.last_error = ""
+
+    held = _held(job)
+    job.locked_by = ""
+    job.locked_at = None
+    job.updated_at = timezone.now()
+    if not held.update(
+        status=job.status,
+        run_at=job.run_at,
+        last_error=job.last_error,
+        locked_by=job.locked_by,
+        locked_at=job.locked_at,
+        updated_at=job.updated_at,
+    ):
+        logger.warning("Job %s was claimed again while it ran", job)
+    return job
+
+
+def work(worker, *, stop_event=None, once=False, poll_interval=None, batch_size=1):
+    """
+    Process jobs until ``stop_event`` is set.
+
+    With ``once`` the worker returns as soon as no job is due, which is
+    handy for cron-style runs and tests.
+    """
+    stop_event = stop_event or threading.Event()
+    poll_interval = poll_interval or settings.JOB_POLL_INTERVAL
+    processed = 0
+    while not stop_event.is_set():
+        jobs = claim_jobs(worker, batch_size)
+        for job in jobs:
+            run_job(job)
+            processed += 1
+        if not jobs:
+            if once:
+                break
+            close_old_connections()
+            stop_event.wait(poll_interval)
+    return processed
@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from news import related
+
+
+class Command(BaseCommand):
+    help = "Precompute the related newspapers shown on newspaper pages."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--new-only",
+            action="store_true",
+            help=(
+                "Only compute newspapers that have no related newspapers yet; "
+                "the whole archive is still vectorized."
+            ),
+        )
+        parser.add_argument(
+            "--top-k",
+            type=int,
+            default=settings.RELATED_TOP_K,
+            help="Number of related newspapers kept per newspaper.",
+        )
+
+    def handle(self, *args, **options):
+        updated = related.compute(
+            new_only=options["new_only"], top_k=options["top_k"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Updated the related newspapers of {updated} newspapers."
+            )
+        )
@@ -0,0 +1,110 @@
+import multiprocessing
+import os
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from news.duplicates import BANDS, PERMUTATIONS, ROWS, from_bytes
+from news.models import Newspaper, NewspaperFingerprint
+
+_pks = _signatures = None
+
+
+def _share(pks, signatures):
+    global _pks, _signatures
+    _pks, _signatures = pks, signatures
+
+
+def _similar_pairs(band, min_similarity):
+    """Return the similar pairs among newspapers sharing a bucket of ``band``."""
+    keys = np.ascontiguousarray(_signatures[:, band * ROWS : (band + 1) * ROWS])
+    keys = keys.view(np.dtype((np.void, keys.dtype.itemsize * ROWS))).ravel()
+    order = np.argsort(keys, kind="stable")
+    boundaries = np.flatnonzero(keys[order][1:] != keys[order][:-1]) + 1
+
+    pairs = []
+    for bucket in np.split(order, boundaries):
+        for offset in range(len(bucket) - 1):
+            rest = bucket[offset + 1 :]
+            similarities = np.mean(
+                _signatures[rest] == _signatures[bucket[offset]], axis=1
+            )
+            for match in np.flatnonzero(similarities >= min_similarity):
+                pairs.append((int(_pks[bucket[offset]]), int(_pks[rest[match]])))
+    return pairs
+
+
+def clusters(pairs):
+    """Group the pairs into connected components with union-find."""
+    parents = {}
+
+    def find(pk):
+        parents.setdefault(pk, pk)
+        while parents[pk] != pk:
+            parents[pk] = parents[parents[pk]]
+            pk = parents[pk]
+        return pk
+
+    for first, second in pairs:
+        parents[find(first)] = find(second)
+
+    groups = {}
+    for pk in parents:
+        groups.setdefault(find(pk), []).append(pk)
+    return sorted((sorted(group) for group in groups.values()), key=len, reverse=True)
+
+
+class Command(BaseCommand):
+    help = "Scan the archive for clusters of near-duplicate newspapers."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="Number of processes comparing signatures.",
+        )
+        parser.add_argument(
+            "--min-similarity",
+            type=float,
+            default=settings.DUPLICATE_MIN_SIMILARITY,
+            help="Smallest estimated similarity of two near-duplicates.",
+        )
+
+    def handle(self, *args, **options):
+        rows = NewspaperFingerprint.objects.values_list("newspaper_id", "signature")
+        pks, signatures = [], []
+        for pk, signature in rows.iterator(chunk_size=10000):
+            pks.append(pk)
+            signatures.append(from_bytes(signature))
+        pks = np.array(pks, dtype=np.int64)
+        signatures = (
+            np.vstack(signatures)
+            if signatures
+            else np.empty((0, PERMUTATIONS), dtype="<u4")
+        )
+
+        # The buckets of every band are compared in memory, so the scan needs
+        # no query per newspaper and bands are spread over the processes.
+        with multiprocessing.Pool(
+            options["workers"], initializer=_share, initargs=(pks, signatures)
+        ) as pool:
+            results = pool.starmap(
+                _similar_pairs,
+                [(band, options["min_similarity"]) for band in range(BANDS)],
+            )
+
+        groups = clusters({pair for result in results for pair in result})
+        newspapers = Newspaper.objects.in_bulk([pk for group in groups for pk in group])
+        for group in groups:
+            self.stdout.write(f"{len(group)} near-duplicates:")
+            for pk in group:
+                if pk in newspapers:
+                    self.stdout.write(f"  #{pk} {newspapers[pk].title}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Found {len(groups)} clusters among {len(pks)} fingerprinted "
+                f"newspapers."
+            )
+        )
@@ -0,0 +1,72 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from news.memory import measure
+from news.warmup import feed_urls, fetch, find_user, make_client, page_urls
+
+
+class Command(BaseCommand):
+    help = (
+        "Request pages several times in-process and report which views keep "
+        "memory after they have answered."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "urls",
+            nargs="*",
+            help="URLs to request (default: the pages warm_caches renders).",
+        )
+        parser.add_argument(
+            "--rounds",
+            type=int,
+            default=5,
+            help="Number of times every URL is requested; the first is not counted.",
+        )
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=10,
+            help="Number of allocation sites to list.",
+        )
+        parser.add_argument(
+            "--username",
+            help="Request logged-in pages as this user (default: first superuser).",
+        )
+
+    def handle(self, *args, **options):
+        if options["rounds"] < 2:
+            raise CommandError("At least two rounds are needed.")
+        try:
+            user = find_user(options["username"])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"Unknown user: {options['username']}")
+
+        client = make_client()
+        urls = options["urls"]
+        if user is not None:
+            client.force_login(user)
+        if not urls:
+            urls = feed_urls() + (page_urls() if user is not None else [])
+
+        retained, sites = measure(
+            lambda url: fetch(client, url), urls, options["rounds"]
+        )
+
+        rounds = options["rounds"] - 1
+        self.stdout.write(f"Memory kept per view over the last {rounds} rounds:")
+        for name, size in retained:
+            self.stdout.write(f"  {size / 1024:+10.1f} KiB  {name}")
+        self.stdout.write("Allocation sites that grew:")
+        for difference in sites[: options["top"]]:
+            self.stdout.write(
+                f"  {difference.size_diff / 1024:+10.1f} KiB  "
+                f"{difference.count_diff:+7d} blocks  {difference.traceback}"
+            )
+        leaking = [name for name, size in retained if size > 0]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Replayed {len(urls)} URLs {options['rounds']} times; "
+                f"{len(leaking)} of {len(retained)} views kept memory."
+            )
+        )
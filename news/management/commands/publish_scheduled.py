@@ -0,0 +1,47 @@
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from news.publishing import run
+
+
+class Command(BaseCommand):
+    help = "Publish scheduled newspapers as their embargo ends."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=settings.PUBLISH_POLL_INTERVAL,
+            help="Longest time in seconds between two checks.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Publish what is due and exit instead of looping, e.g. from cron.",
+        )
+
+    def handle(self, *args, **options):
+        if options["once"]:
+            published = run(once=True)
+        else:
+            published = self.loop(options["interval"])
+        self.stdout.write(self.style.SUCCESS(f"Published {published} newspapers."))
+
+    def loop(self, interval):
+        stop_event = threading.Event()
+
+        def stop(signum, frame):
+            stop_event.set()
+
+        previous_handlers = {
+            signum: signal.signal(signum, stop)
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+        try:
+            return run(stop_event=stop_event, interval=interval)
+        finally:
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from news import trash
+
+
+class Command(BaseCommand):
+    help = "Delete for good the newspapers and topics trashed too long ago."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.TRASH_PURGE_BATCH_SIZE,
+            help="Rows deleted per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        purged = trash.purge(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Purged {purged} trashed rows."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from news import stats
+
+
+class Command(BaseCommand):
+    help = "Recompute the newspaper statistics rollups from scratch."
+
+    def handle(self, *args, **options):
+        rows = stats.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} statistic rows."))
@@ -0,0 +1,86 @@
+import multiprocessing
+import os
+from collections import deque
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from news.models import Newspaper
+from news.rendering import RENDERER_VERSION, render_batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the Markdown of newspapers again after the renderer or the "
+        "sanitizer configuration changed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Render every newspaper, not only those rendered by another version.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="Number of processes rendering Markdown.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Number of newspapers sent to a process at a time.",
+        )
+
+    def handle(self, *args, **options):
+        newspapers = Newspaper.all_objects.order_by("pk")
+        if not options["all"]:
+            newspapers = newspapers.exclude(content_html_version=RENDERER_VERSION)
+        pks = list(newspapers.values_list("pk", flat=True))
+        size = options["batch_size"]
+
+        # Workers only render; this process reads and writes the database, so
+        # no connection crosses a fork, and keeps a few batches in flight.
+        rendered = 0
+        in_flight = deque()
+        with multiprocessing.Pool(options["workers"]) as pool:
+            for start in range(0, len(pks), size):
+                rows = list(
+                    Newspaper.all_objects.filter(pk__in=pks[start : start + size])
+                    .order_by()
+                    .values_list("pk", "content", "updated_at")
+                )
+                updated = {pk: updated_at for pk, content, updated_at in rows}
+                sources = [(pk, content) for pk, content, updated_at in rows]
+                in_flight.append((pool.apply_async(render_batch, (sources,)), updated))
+                if len(in_flight) >= 2 * options["workers"]:
+                    result, updated = in_flight.popleft()
+                    rendered += self.save(result.get(), updated)
+            while in_flight:
+                result, updated = in_flight.popleft()
+                rendered += self.save(result.get(), updated)
+
+        skipped = len(pks) - rendered
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rendered the Markdown of {rendered} newspapers; "
+                f"skipped {skipped} that changed meanwhile."
+            )
+        )
+
+    def save(self, results, updated):
+        """
+        Store the rendered HTML of newspapers unchanged since they were read.
+
+        A newspaper saved in the meantime rendered its new content itself,
+        so its row is left alone. Return how many rows were written.
+        """
+        saved = 0
+        with transaction.atomic():
+            for pk, html in results:
+                saved += Newspaper.all_objects.filter(
+                    pk=pk, updated_at=updated[pk]
+                ).update(content_html=html, content_html_version=RENDERER_VERSION)
+        return saved
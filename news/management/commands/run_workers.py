@@ -0,0 +1,99 @@
+import multiprocessing
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+
+from news.jobs import work, worker_id
+
+
+def _run_worker(worker, stop_event, options):
+    try:
+        work(
+            worker,
+            stop_event=stop_event,
+            once=options["once"],
+            poll_interval=options["poll_interval"],
+            batch_size=options["batch_size"],
+        )
+    finally:
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = "Run a pool of workers processing the background job queue."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.JOB_WORKERS,
+            help="Number of workers in the pool.",
+        )
+        parser.add_argument(
+            "--mode",
+            choices=("thread", "process"),
+            default="thread",
+            help="Run workers as threads of this process or as child processes.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.JOB_POLL_INTERVAL,
+            help="Seconds an idle worker waits before polling again.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1,
+            help="Number of jobs a worker claims at once.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no job is due instead of polling forever.",
+        )
+
+    def handle(self, *args, **options):
+        if options["mode"] == "process":
+            stop_event = multiprocessing.Event()
+            # Children must open their own connections after the fork.
+            connections.close_all()
+            pool = [
+                multiprocessing.Process(
+                    target=_run_worker,
+                    args=(worker_id(f"/{number}"), stop_event, options),
+                )
+                for number in range(options["workers"])
+            ]
+        else:
+            stop_event = threading.Event()
+            pool = [
+                threading.Thread(
+                    target=_run_worker,
+                    args=(worker_id(f"/{number}"), stop_event, options),
+                )
+                for number in range(options["workers"])
+            ]
+
+        def stop(signum, frame):
+            self.stdout.write("Stopping workers after their current job...")
+            stop_event.set()
+
+        previous_handlers = {
+            signum: signal.signal(signum, stop)
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+
+        self.stdout.write(f"Starting {options['workers']} {options['mode']} worker(s).")
+        try:
+            for worker in pool:
+                worker.start()
+            for worker in pool:
+                worker.join()
+        finally:
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+        self.stdout.write(self.style.SUCCESS("All workers stopped."))
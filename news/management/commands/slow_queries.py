@@ -0,0 +1,63 @@
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from news.db import read_slow_queries
+
+
+class Command(BaseCommand):
+    help = "Report the slow query fingerprints that took the most time."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=10,
+            help="Number of fingerprints to report.",
+        )
+        parser.add_argument(
+            "--log",
+            help="Slow query log to read (default: SLOW_QUERY_LOG).",
+        )
+
+    def handle(self, *args, **options):
+        groups = {}
+        for entry in read_slow_queries(options["log"]):
+            group = groups.setdefault(
+                entry["fingerprint"],
+                {
+                    "normalized": entry["normalized"],
+                    "count": 0,
+                    "total": 0.0,
+                    "slowest": entry,
+                    "sources": Counter(),
+                },
+            )
+            group["count"] += 1
+            group["total"] += entry["duration"]
+            if entry["duration"] >= group["slowest"]["duration"]:
+                group["slowest"] = entry
+            group["sources"][(entry["view"], entry["template"] or entry["code"])] += 1
+
+        ranked = sorted(groups.items(), key=lambda item: item[1]["total"], reverse=True)
+        for fingerprint, group in ranked[: options["top"]]:
+            slowest = group["slowest"]
+            self.stdout.write(
+                f"{fingerprint}  {group['count']} queries, "
+                f"{group['total'] * 1000:.0f} ms in total, "
+                f"{group['total'] / group['count'] * 1000:.0f} ms on average, "
+                f"{slowest['duration'] * 1000:.0f} ms at most"
+            )
+            self.stdout.write(f"  {group['normalized']}")
+            for (view, line), count in group["sources"].most_common(3):
+                self.stdout.write(f"  {count} x {view or 'no view'} at {line}")
+            if slowest["plan"]:
+                self.stdout.write("  Plan of the slowest:")
+                for plan_line in slowest["plan"].splitlines():
+                    self.stdout.write(f"    {plan_line}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{sum(group['count'] for group in groups.values())} slow queries "
+                f"in {len(groups)} fingerprints."
+            )
+        )
@@ -0,0 +1,167 @@
+import multiprocessing
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+SCHEMA = """
+CREATE TABLE newspaper (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title VARCHAR(255) NOT NULL,
+    content TEXT NOT NULL,
+    published_date DATETIME NOT NULL
+);
+CREATE INDEX newspaper_published_idx ON newspaper (published_date DESC);
+"""
+
+
+def _connect(path, profile):
+    # Autocommit at the driver level; transactions are opened explicitly the
+    # way Django's SQLite backend does inside atomic blocks.
+    conn = sqlite3.connect(path, timeout=5, isolation_level=None)
+    for name, value in profile["pragmas"].items():
+        conn.execute(f"PRAGMA {name}={value}")
+    return conn
+
+
+def _client(path, profile, duration, write_ratio, seed):
+    """Run a read/write mix against ``path`` and return the client's stats."""
+    rng = random.Random(seed)
+    conn = _connect(path, profile)
+    read_latencies, write_latencies, locked = [], [], 0
+    deadline = time.monotonic() + duration
+
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        try:
+            if rng.random() < write_ratio:
+                # A typical request transaction: read, then write.
+                conn.execute(f"BEGIN {profile['transaction_mode']}")
+                conn.execute("SELECT COUNT(*) FROM newspaper").fetchone()
+                conn.execute(
+                    "INSERT INTO newspaper (title, content, published_date) "
+                    "VALUES (?, ?, datetime('now'))",
+                    ("Benchmark", "x" * 500),
+                )
+                conn.execute("COMMIT")
+                write_latencies.append(time.perf_counter() - started)
+            else:
+                conn.execute(
+                    "SELECT id, title, published_date FROM newspaper "
+                    "ORDER BY published_date DESC LIMIT 20 OFFSET ?",
+                    (rng.randrange(0, 200),),
+                ).fetchall()
+                read_latencies.append(time.perf_counter() - started)
+        except sqlite3.OperationalError as error:
+            if "locked" not in str(error):
+                raise
+            locked += 1
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+    conn.close()
+    return read_latencies, write_latencies, locked
+
+
+def _percentile(values, percentile):
+    if not values:
+        return 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[percentile - 1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark concurrent reads and writes against SQLite with the "
+        "default settings and with the tuned single-node profile."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--clients",
+            type=int,
+            default=4,
+            help="Number of concurrent client processes (think gunicorn workers).",
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=5.0,
+            help="Seconds each profile is benchmarked for.",
+        )
+        parser.add_argument(
+            "--write-ratio",
+            type=float,
+            default=0.2,
+            help="Share of operations that are write transactions.",
+        )
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=10000,
+            help="Number of rows seeded before the benchmark.",
+        )
+
+    def handle(self, *args, **options):
+        profiles = {
+            "default": {"pragmas": {}, "transaction_mode": "DEFERRED"},
+            "tuned": {
+                "pragmas": settings.SQLITE_PRAGMAS,
+                "transaction_mode": "IMMEDIATE",
+            },
+        }
+
+        self.stdout.write(
+            f"{options['clients']} clients, {options['duration']}s per profile, "
+            f"{options['write_ratio']:.0%} writes, {options['rows']} seeded rows"
+        )
+        self.stdout.write(
+            f"{'profile':<8} {'ops/s':>9} {'reads/s':>9} {'writes/s':>9} "
+            f"{'locked':>7} {'read p99':>10} {'write p99':>10}"
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            for name, profile in profiles.items():
+                path = str(Path(directory) / f"{name}.sqlite3")
+                self._seed(path, profile, options["rows"])
+                with multiprocessing.Pool(options["clients"]) as pool:
+                    results = pool.starmap(
+                        _client,
+                        [
+                            (
+                                path,
+                                profile,
+                                options["duration"],
+                                options["write_ratio"],
+                                seed,
+                            )
+                            for seed in range(options["clients"])
+                        ],
+                    )
+                self._report(name, results, options["duration"])
+
+    def _seed(self, path, profile, rows):
+        conn = _connect(path, profile)
+        conn.executescript(SCHEMA)
+        conn.execute("BEGIN")
+        conn.executemany(
+            "INSERT INTO newspaper (title, content, published_date) "
+            "VALUES (?, ?, datetime('now', ?))",
+            (("Seed", "x" * 500, f"-{row} minutes") for row in range(rows)),
+        )
+        conn.execute("COMMIT")
+        conn.close()
+
+    def _report(self, name, results, duration):
+        reads = [latency for result in results for latency in result[0]]
+        writes = [latency for result in results for latency in result[1]]
+        locked = sum(result[2] for result in results)
+        self.stdout.write(
+            f"{name:<8} {(len(reads) + len(writes)) / duration:>9.0f} "
+            f"{len(reads) / duration:>9.0f} {len(writes) / duration:>9.0f} "
+            f"{locked:>7} {_percentile(reads, 99) * 1000:>8.2f}ms "
+            f"{_percentile(writes, 99) * 1000:>8.2f}ms"
+        )
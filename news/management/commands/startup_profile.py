@@ -0,0 +1,91 @@
+import os
+import re
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+IMPORT_TIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+# What a gunicorn worker runs before its first request; with preload_app
+# the arbiter runs it once for all workers.
+STARTUP_CODE = "import news_agency.asgi"
+PREWARM_CODE = "from news.startup import prewarm; prewarm()"
+
+
+def parse_import_times(lines):
+    """Return ``(module, self µs, cumulative µs, depth)`` from ``-X importtime``."""
+    modules = []
+    for line in lines:
+        match = IMPORT_TIME_RE.match(line)
+        if match:
+            own, cumulative, indent, module = match.groups()
+            modules.append((module, int(own), int(cumulative), len(indent) // 2))
+    return modules
+
+
+class Command(BaseCommand):
+    help = "Report the import time of each module a worker loads at startup."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=25,
+            help="Number of modules to list.",
+        )
+        parser.add_argument(
+            "--sort",
+            choices=("self", "cumulative"),
+            default="self",
+            help="Rank modules by their own import time or including their imports.",
+        )
+        parser.add_argument(
+            "--prewarm",
+            action="store_true",
+            help="Include the preloading done in the gunicorn arbiter.",
+        )
+
+    def handle(self, *args, **options):
+        code = STARTUP_CODE + (f"; {PREWARM_CODE}" if options["prewarm"] else "")
+        environment = {**os.environ, "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE}
+        started = time.perf_counter()
+        # A fresh interpreter, as nothing is imported yet in a new worker.
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True,
+            text=True,
+            cwd=settings.BASE_DIR,
+            env=environment,
+        )
+        elapsed = time.perf_counter() - started
+        if result.returncode:
+            raise CommandError(f"Startup failed:\n{result.stderr[-2000:]}")
+
+        modules = parse_import_times(result.stderr.splitlines())
+        column = 1 if options["sort"] == "self" else 2
+        self.stdout.write(f"{'self ms':>9} {'cumul. ms':>10}  module")
+        for module, own, cumulative, depth in sorted(
+            modules, key=lambda module: module[column], reverse=True
+        )[: options["top"]]:
+            self.stdout.write(f"{own / 1000:9.1f} {cumulative / 1000:10.1f}  {module}")
+
+        packages = {}
+        for module, own, cumulative, depth in modules:
+            package = module.split(".")[0]
+            packages[package] = packages.get(package, 0) + own
+        self.stdout.write("Import time per top-level package:")
+        for package, own in sorted(
+            packages.items(), key=lambda item: item[1], reverse=True
+        )[:10]:
+            self.stdout.write(f"{own / 1000:9.1f}  {package}")
+
+        imports = sum(own for module, own, cumulative, depth in modules)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {len(modules)} modules in {imports / 1e6:.2f}s; "
+                f"startup took {elapsed:.2f}s in total."
+            )
+        )
@@ -0,0 +1,64 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from news.warmup import feed_urls, find_user, page_urls, warm
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the most requested pages so the first visitors after a "
+        "deploy find warm caches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--pages",
+            type=int,
+            default=3,
+            help="Number of pages of each list to render.",
+        )
+        parser.add_argument(
+            "--details",
+            type=int,
+            default=20,
+            help="Number of the most recent newspapers to render.",
+        )
+        parser.add_argument(
+            "--topics",
+            type=int,
+            default=5,
+            help="Number of the busiest topics whose feeds are rendered.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Number of pages rendered in parallel.",
+        )
+        parser.add_argument(
+            "--username",
+            help="Render logged-in pages as this user (default: first superuser).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = find_user(options["username"])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"Unknown user: {options['username']}")
+
+        urls = feed_urls(options["topics"])
+        if user is None:
+            self.stdout.write("No user to log in as; only warming the feeds.")
+        else:
+            urls += page_urls(options["pages"], options["details"])
+
+        failed, elapsed = warm(urls, workers=options["workers"], user=user)
+
+        for url, status in failed:
+            self.stderr.write(f"{status} {url}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Warmed {len(urls) - len(failed)} of {len(urls)} pages in "
+                f"{elapsed:.2f}s."
+            )
+        )
@@ -0,0 +1,177 @@
+"""
+Memory diagnostics for long-running workers.
+
+``news.middleware.MemoryMiddleware`` reads the resident set size around
+every request and logs the requests that grow it by ``MEMORY_LOG_DELTA`` or
+more, with their URL name. With ``MEMORY_TRACEMALLOC_INTERVAL`` set, each worker also traces
+Python allocations and periodically logs the sites that grew most since its
+previous snapshot. A worker whose RSS passes ``MEMORY_RECYCLE_RSS``, or has
+grown by ``MEMORY_RECYCLE_GROWTH`` since its first request, finishes the
+current request and asks gunicorn for a replacement.
+
+``measure`` replays URLs in-process to find the views that keep memory after
+they have answered; see the ``memory_replay`` command.
+"""
+
+import gc
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import reset_queries
+from django.urls import Resolver404, resolve
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+# Allocations made by tracemalloc itself are noise in every comparison.
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def rss():
+    """Return the resident set size of this process in bytes, 0 if unknown."""
+    try:
+        with open("/proc/self/statm", "rb") as statm:
+            return int(statm.read().split()[1]) * PAGE_SIZE
+    except OSError:
+        return peak_rss()
+
+
+def peak_rss():
+    """Return the largest resident set size this process has had, in bytes."""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def snapshot():
+    return tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+
+
+class AllocationTracker:
+    """Take tracemalloc snapshots at most every ``MEMORY_TRACEMALLOC_INTERVAL``."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._previous = None
+        self._taken_at = 0.0
+
+    def tick(self):
+        interval = settings.MEMORY_TRACEMALLOC_INTERVAL
+        if not interval or time.monotonic() - self._taken_at < interval:
+            return
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            if not tracemalloc.is_tracing():
+                # Allocations made before tracing started are not seen, so
+                # the first snapshot is only a baseline.
+                tracemalloc.start(settings.MEMORY_TRACEMALLOC_FRAMES)
+            current = snapshot()
+            if self._previous is not None:
+                self.log(current.compare_to(self._previous, "lineno"))
+            self._previous = current
+            self._taken_at = time.monotonic()
+        finally:
+            self._lock.release()
+
+    def log(self, differences):
+        lines = [
+            f"  {difference.size_diff / 1024:+.1f} KiB "
+            f"({difference.count_diff:+d} blocks) {difference.traceback}"
+            for difference in differences[: settings.MEMORY_TRACEMALLOC_TOP]
+            if difference.size_diff
+        ]
+        if lines:
+            logger.info(
+                "Allocation growth in process %s since the last snapshot:\n%s",
+                os.getpid(),
+                "\n".join(lines),
+            )
+
+
+_gunicorn_worker_pid = None
+
+
+def mark_gunicorn_worker():
+    """Note that this process is a gunicorn worker, from ``post_worker_init``."""
+    global _gunicorn_worker_pid
+    _gunicorn_worker_pid = os.getpid()
+
+
+def in_gunicorn_worker():
+    """Return whether gunicorn replaces this process when it exits."""
+    return _gunicorn_worker_pid == os.getpid()
+
+
+def should_recycle(current, baseline):
+    """Return whether a worker using ``current`` bytes should be replaced."""
+    limit = settings.MEMORY_RECYCLE_RSS
+    growth = settings.MEMORY_RECYCLE_GROWTH
+    return bool(limit and current > limit) or bool(
+        growth and current - baseline > growth
+    )
+
+
+def view_name(url):
+    try:
+        return resolve(urlsplit(url).path).view_name
+    except Resolver404:
+        return url
+
+
+def measure(fetch, urls, rounds=5):
+    """
+    Request every URL ``rounds`` times and return the memory views kept.
+
+    ``fetch(url)`` makes one request. The first round fills caches and lazy
+    imports, so only later rounds count: a view that still holds more Python
+    memory after each of its responses is gone leaks. Return the retained
+    bytes per URL name, largest first, and the allocation sites that grew
+    over the later rounds.
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start(settings.MEMORY_TRACEMALLOC_FRAMES)
+    retained = {}
+    baseline = None
+    try:
+        for round_number in range(rounds):
+            if round_number == 1:
+                gc.collect()
+                baseline = snapshot()
+            for url in urls:
+                # With DEBUG on, the query log would look like a leak.
+                reset_queries()
+                gc.collect()
+                before = tracemalloc.get_traced_memory()[0]
+                fetch(url).close()
+                gc.collect()
+                if round_number:
+                    name = view_name(url)
+                    kept = tracemalloc.get_traced_memory()[0] - before
+                    retained[name] = retained.get(name, 0) + kept
+        gc.collect()
+        sites = snapshot().compare_to(baseline, "lineno") if baseline else []
+    finally:
+        if started:
+            tracemalloc.stop()
+    return sorted(retained.items(), key=lambda item: item[1], reverse=True), sites
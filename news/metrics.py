@@ -0,0 +1,411 @@
+"""
+Prometheus-style metrics shared by every worker process.
+
+Each process adds to its own memory-mapped file in ``METRICS_DIR``, so
+recording a sample is a dictionary lookup and an in-place write under a
+lock no other process takes. A scrape reads every file in the directory
+and sums them, which gives totals across all gunicorn workers, including
+the ones that have been recycled since: when a worker exits, gunicorn's
+arbiter folds its counters into one archive file and removes its file, see
+``retire``. Gauges are only summed over the processes that are still
+running.
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import caches
+
+HEADER = struct.Struct("<Q")
+KEY_LENGTH = struct.Struct("<I")
+VALUE = struct.Struct("<d")
+INITIAL_SIZE = 64 * 1024
+
+# File holding the counters of the processes that have exited
+ARCHIVE = "archive.db"
+
+current_view = ContextVar("current_view", default="")
+
+
+def _padded(length):
+    return length + (-length % 8)
+
+
+class MmapDict:
+    """
+    Float values by string key, stored in a file mapped into memory.
+
+    Records are appended as (key length, key padded to 8 bytes, value); the
+    header holds the number of bytes used and is written last, so a reader
+    never sees a half-written record.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = os.fdopen(os.open(path, os.O_RDWR | os.O_CREAT, 0o644), "r+b")
+        if os.fstat(self._file.fileno()).st_size < INITIAL_SIZE:
+            self._file.truncate(INITIAL_SIZE)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        self._used = HEADER.unpack_from(self._map, 0)[0] or HEADER.size
+        self._offsets = {key: offset for key, offset, value in self._records()}
+
+    def _records(self):
+        return _parse(self._map, self._used)
+
+    def _append(self, key):
+        encoded = key.encode()
+        size = _padded(KEY_LENGTH.size + len(encoded)) + VALUE.size
+        while self._used + size > len(self._map):
+            self._map.close()
+            self._file.truncate(2 * os.fstat(self._file.fileno()).st_size)
+            self._map = mmap.mmap(self._file.fileno(), 0)
+        KEY_LENGTH.pack_into(self._map, self._used, len(encoded))
+        start = self._used + KEY_LENGTH.size
+        self._map[start : start + len(encoded)] = encoded
+        offset = self._used + size - VALUE.size
+        VALUE.pack_into(self._map, offset, 0.0)
+        self._used += size
+        HEADER.pack_into(self._map, 0, self._used)
+        self._offsets[key] = offset
+        return offset
+
+    def add(self, key, amount):
+        with self._lock:
+            offset = self._offsets.get(key) or self._append(key)
+            value = VALUE.unpack_from(self._map, offset)[0]
+            VALUE.pack_into(self._map, offset, value + amount)
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+def _parse(data, used):
+    """Yield ``(key, value offset, value)`` for every record in ``data``."""
+    position = HEADER.size
+    while position < used:
+        length = KEY_LENGTH.unpack_from(data, position)[0]
+        start = position + KEY_LENGTH.size
+        key = bytes(data[start : start + length]).decode()
+        offset = position + _padded(KEY_LENGTH.size + length)
+        yield key, offset, VALUE.unpack_from(data, offset)[0]
+        position = offset + VALUE.size
+
+
+def read_file(path):
+    """Return the values stored in one process's file."""
+    data = Path(path).read_bytes()
+    if len(data) < HEADER.size:
+        return {}
+    used = HEADER.unpack_from(data, 0)[0]
+    return {key: value for key, offset, value in _parse(data, used)}
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def sample_key(name, labels):
+    """Return the store key of the sample ``name`` with ``labels``."""
+    return json.dumps([name, sorted(labels.items())], separators=(",", ":"))
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        registry.append(self)
+
+    def key(self, name, labels):
+        return sample_key(name, labels)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        store().add(self.key(self.name, labels), amount)
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def inc(self, amount=1, **labels):
+        store().add(self.key(self.name, labels), amount)
+
+    def dec(self, amount=1, **labels):
+        store().add(self.key(self.name, labels), -amount)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labels=(), buckets=()):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets) + (float("inf"),)
+
+    def observe(self, value, **labels):
+        # Buckets are stored per range and made cumulative when rendered.
+        bucket = next(bound for bound in self.buckets if value <= bound)
+        metrics = store()
+        metrics.add(
+            self.key(f"{self.name}_bucket", {**labels, "le": _format(bucket)}), 1
+        )
+        metrics.add(self.key(f"{self.name}_sum", labels), value)
+        metrics.add(self.key(f"{self.name}_count", labels), 1)
+
+
+registry = []
+
+_store = None
+_store_pid = None
+_store_lock = threading.Lock()
+
+
+def store():
+    """Return this process's store, opening a new one after a fork."""
+    global _store, _store_pid
+    pid = os.getpid()
+    if _store_pid != pid:
+        with _store_lock:
+            if _store_pid != pid:
+                directory = Path(settings.METRICS_DIR)
+                directory.mkdir(parents=True, exist_ok=True)
+                _store = MmapDict(directory / f"{pid}.db")
+                _store_pid = pid
+    return _store
+
+
+def reset():
+    """Forget this process's store, e.g. when ``METRICS_DIR`` changes."""
+    global _store, _store_pid
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+        _store = _store_pid = None
+
+
+def clear():
+    """Remove the files of every process, when the whole application restarts."""
+    reset()
+    for path in Path(settings.METRICS_DIR).glob("*.db"):
+        path.unlink(missing_ok=True)
+
+
+def retire(pid):
+    """
+    Fold the counters of the exited process ``pid`` into the archive file.
+
+    The process's own file is then removed, so recycled workers do not leave
+    a file behind each. Only one process may retire others at a time; its
+    gauges are dropped along with it.
+    """
+    directory = Path(settings.METRICS_DIR)
+    path = directory / f"{pid}.db"
+    if not path.exists():
+        return
+    gauges = _gauge_names()
+    archive = MmapDict(directory / ARCHIVE)
+    try:
+        for key, value in read_file(path).items():
+            if value and json.loads(key)[0] not in gauges:
+                archive.add(key, value)
+    finally:
+        archive.close()
+    path.unlink(missing_ok=True)
+
+
+def _gauge_names():
+    return {metric.name for metric in registry if metric.kind == "gauge"}
+
+
+def _format(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def collect():
+    """Sum the values of every process, skipping gauges of dead processes."""
+    gauges = _gauge_names()
+    totals = {}
+    for path in Path(settings.METRICS_DIR).glob("*.db"):
+        alive = path.stem.isdigit() and _pid_alive(int(path.stem))
+        for key, value in read_file(path).items():
+            if not alive and json.loads(key)[0] in gauges:
+                continue
+            totals[key] = totals.get(key, 0.0) + value
+    return totals
+
+
+def render():
+    """Return every metric in the Prometheus text exposition format."""
+    samples = {}
+    for key, value in collect().items():
+        name, labels = json.loads(key)
+        samples.setdefault(name, []).append((dict(labels), value))
+
+    lines = []
+    for metric in registry:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        if metric.kind == "histogram":
+            lines += _render_histogram(metric, samples)
+        else:
+            lines += _render_samples(metric.name, samples.get(metric.name, []))
+    return "\n".join(lines) + "\n"
+
+
+def _render_samples(name, samples):
+    for labels, value in sorted(samples, key=lambda sample: sorted(sample[0].items())):
+        yield f"{name}{_format_labels(labels)} {_format(value)}"
+
+
+def _render_histogram(metric, samples):
+    series = {}
+    for labels, value in samples.get(f"{metric.name}_bucket", []):
+        bound = labels.pop("le")
+        series.setdefault(tuple(sorted(labels.items())), {})[bound] = value
+    for labels, counts in sorted(series.items()):
+        cumulative = 0
+        for bound in metric.buckets:
+            cumulative += counts.get(_format(bound), 0)
+            yield (
+                f"{metric.name}_bucket"
+                f"{_format_labels({**dict(labels), 'le': _format(bound)})} "
+                f"{_format(cumulative)}"
+            )
+    yield from _render_samples(
+        f"{metric.name}_sum", samples.get(f"{metric.name}_sum", [])
+    )
+    yield from _render_samples(
+        f"{metric.name}_count", samples.get(f"{metric.name}_count", [])
+    )
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+    return "{" + pairs + "}"
+
+
+REQUESTS = Counter(
+    "news_requests_total",
+    "Requests handled, by URL name, method and status code.",
+    ("view", "method", "status"),
+)
+REQUEST_DURATION = Histogram(
+    "news_request_duration_seconds",
+    "Time spent handling a request, by URL name.",
+    ("view",),
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_QUERIES = Counter(
+    "news_db_queries_total",
+    "Database queries run while handling requests, by URL name.",
+    ("view",),
+)
+CACHE_LOOKUPS = Counter(
+    "news_cache_lookups_total",
+    "Cache lookups, by URL name and whether they hit.",
+    ("view", "result"),
+)
+IN_FLIGHT = Gauge(
+    "news_requests_in_flight",
+    "Requests being handled right now, by URL name.",
+    ("view",),
+)
+
+
+def install():
+    """Start counting the cache lookups of every request."""
+    instrument_cache()
+
+
+def record_cache_lookups(hits, misses):
+    view = current_view.get()
+    if hits:
+        CACHE_LOOKUPS.inc(hits, view=view, result="hit")
+    if misses:
+        CACHE_LOOKUPS.inc(misses, view=view, result="miss")
+
+
+_instrumented_aliases = set()
+
+
+def instrument_cache(alias="default"):
+    """
+    Make the ``get``/``get_many`` of the ``alias`` cache report hits and misses.
+
+    Django creates a cache instance per thread, so every instance the cache
+    handler creates for ``alias`` is wrapped; the backend class, which other
+    aliases may share, is left alone.
+    """
+    if alias in _instrumented_aliases:
+        return
+    _instrumented_aliases.add(alias)
+    create_connection = caches.create_connection
+
+    def create(name):
+        backend = create_connection(name)
+        if name == alias:
+            _instrument(backend)
+        return backend
+
+    caches.create_connection = create
+    # The instance this thread may already have was created unwrapped.
+    _instrument(caches[alias])
+
+
+def _instrument(backend):
+    """
+    Wrap the ``get``/``get_many`` of one cache instance.
+
+    The default ``get_many`` calls ``get`` per key, which is then not counted
+    twice.
+    """
+    if getattr(backend, "_news_instrumented", False):
+        return
+    original_get, original_get_many = backend.get, backend.get_many
+    missing = object()
+    in_get_many = threading.local()
+
+    def get(key, default=None, version=None):
+        value = original_get(key, missing, version)
+        if not getattr(in_get_many, "active", False):
+            record_cache_lookups(int(value is not missing), int(value is missing))
+        return default if value is missing else value
+
+    def get_many(keys, version=None):
+        keys = list(keys)
+        in_get_many.active = True
+        try:
+            found = original_get_many(keys, version)
+        finally:
+            in_get_many.active = False
+        record_cache_lookups(len(found), len(keys) - len(found))
+        return found
+
+    backend.get, backend.get_many = get, get_many
+    backend._news_instrumented = True
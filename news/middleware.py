@@ -0,0 +1,255 @@
+import os
+import signal
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY
+from django.db import connections
+from django.utils.cache import patch_vary_headers
+
+from news import compression, memory, metrics, profiling
+from news.routers import reads_from_replica
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS", "TRACE")
+
+PIN_COOKIE = "pin_primary"
+
+# Backends sessions may have been logged in through before the current ones
+LEGACY_BACKENDS = {"django.contrib.auth.backends.ModelBackend"}
+
+
+class PrimaryPinningMiddleware:
+    """
+    Keep a client's reads on the primary database right after it writes.
+
+    Only safe requests may read from a replica. Unsafe requests, and views
+    marked with ``writes_on_safe_method``, set a short-lived cookie, and
+    requests carrying it stay on the primary until it expires after
+    ``REPLICA_PIN_SECONDS``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        writes = request.method not in SAFE_METHODS
+        token = reads_from_replica.set(
+            not writes and PIN_COOKIE not in request.COOKIES
+        )
+        try:
+            response = self.get_response(request)
+        finally:
+            reads_from_replica.reset(token)
+
+        if writes or getattr(request, "pin_primary", False):
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=settings.REPLICA_PIN_SECONDS,
+                secure=settings.SESSION_COOKIE_SECURE,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+class SessionBackendMiddleware:
+    """
+    Move sessions logged in through ``ModelBackend`` to ``CachedModelBackend``.
+
+    Django only resolves a session's user through a backend listed in
+    ``AUTHENTICATION_BACKENDS``; rewriting the stored path keeps those
+    sessions logged in without listing ``ModelBackend``, which would hash
+    the password a second time on every failed login.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.session.get(BACKEND_SESSION_KEY) in LEGACY_BACKENDS:
+            request.session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+        return self.get_response(request)
+
+
+class MetricsMiddleware:
+    """
+    Record latency, query counts, cache lookups and in-flight requests.
+
+    Samples are labelled with the URL name of the view, or ``unmatched``
+    for requests no URL pattern handled, such as static files.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = [0]
+
+        def count_queries(execute, sql, params, many, context):
+            queries[0] += 1
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        token = metrics.current_view.set("unmatched")
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(count_queries))
+                response = self.get_response(request)
+        finally:
+            view = metrics.current_view.get()
+            metrics.current_view.reset(token)
+            if view != "unmatched":
+                metrics.IN_FLIGHT.dec(view=view)
+
+        metrics.REQUEST_DURATION.observe(time.perf_counter() - started, view=view)
+        metrics.REQUESTS.inc(
+            view=view, method=request.method, status=response.status_code
+        )
+        if queries[0]:
+            metrics.DB_QUERIES.inc(queries[0], view=view)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view = request.resolver_match.view_name
+        metrics.current_view.set(view)
+        metrics.IN_FLIGHT.inc(view=view)
+
+
+class ProfilingMiddleware:
+    """
+    Profile the requests of staff users who ask for it.
+
+    See ``news.profiling``; it must come after ``AuthenticationMiddleware``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if profiling.requested(request) and request.user.is_staff:
+            return profiling.profile(request, self.get_response)
+        return self.get_response(request)
+
+
+class MemoryMiddleware:
+    """Log requests that grow the worker and recycle workers that grew too much."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self._pid = None
+
+    def _start_process(self, current):
+        # With a preloaded application the middleware is created before the
+        # workers are forked, so each worker starts its own measurements.
+        self._pid = os.getpid()
+        self._baseline = current
+        self._recycling = False
+        self._tracker = memory.AllocationTracker()
+
+    def __call__(self, request):
+        before = memory.rss()
+        peak_before = memory.peak_rss()
+        if self._pid != os.getpid():
+            self._start_process(before)
+
+        response = self.get_response(request)
+
+        after = memory.rss()
+        delta = after - before
+        if delta >= settings.MEMORY_LOG_DELTA:
+            match = request.resolver_match
+            memory.logger.warning(
+                "%s %s (%s) grew process %s by %.1f MB to %.1f MB "
+                "(peak grew by %.1f MB)",
+                request.method,
+                request.path,
+                match.view_name if match else "unmatched",
+                os.getpid(),
+                delta / memory.MB,
+                after / memory.MB,
+                (memory.peak_rss() - peak_before) / memory.MB,
+            )
+        self._tracker.tick()
+        if not self._recycling and memory.should_recycle(after, self._baseline):
+            self.recycle(request, after)
+        return response
+
+    def recycle(self, request, current):
+        # Whatever the protocol it serves, only a gunicorn worker is replaced.
+        if not memory.in_gunicorn_worker():
+            return
+        self._recycling = True
+        memory.logger.warning(
+            "Recycling worker %s at %.1f MB (%.1f MB at its first request)",
+            os.getpid(),
+            current / memory.MB,
+            self._baseline / memory.MB,
+        )
+        # A gunicorn worker finishes its current requests on SIGTERM and the
+        # arbiter starts a fresh one.
+        os.kill(os.getpid(), signal.SIGTERM)
+
+
+class CompressionMiddleware:
+    """
+    Compress dynamic responses with brotli or gzip, see ``news.compression``.
+
+    It must come after ``WhiteNoiseMiddleware``, which serves static files
+    compressed already, and before anything that reads the response body.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            response.has_header("Content-Encoding")
+            or not compression.is_compressible(response)
+            or "no-transform" in response.get("Cache-Control", "")
+            or (
+                not response.streaming
+                and len(response.content) < settings.COMPRESSION_MIN_SIZE
+            )
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = compression.negotiate(request.headers.get("Accept-Encoding", ""))
+        if encoding is None:
+            return response
+
+        trailer = b""
+        if compression.used_csrf_token(request, response):
+            if not compression.is_html(response):
+                # Only HTML can carry the padding that hides the length.
+                return response
+            trailer = compression.padding()
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = compression.acompress_stream(
+                    response.streaming_content, encoding, trailer
+                )
+            else:
+                response.streaming_content = compression.compress_stream(
+                    response.streaming_content, encoding, trailer
+                )
+            del response.headers["Content-Length"]
+        else:
+            compressed = compression.compress(response.content + trailer, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        # The body differs from the uncompressed one, so a strong ETag must go
+        # weak (RFC 9110, section 8.8.1).
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
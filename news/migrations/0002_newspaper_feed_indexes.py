@@ -0,0 +1,26 @@
+# Generated by Django 5.2.1 on 2026-10-19 07:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="newspaper",
+            index=models.Index(
+                fields=["-published_date"], name="newspaper_published_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="newspaper",
+            index=models.Index(
+                fields=["topic", "-published_date"],
+                name="newspaper_topic_published_idx",
+            ),
+        ),
+    ]
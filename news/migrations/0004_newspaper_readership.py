@@ -0,0 +1,54 @@
+# Generated by Django 5.2.1 on 2026-10-19 07:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0003_job"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newspaper",
+            name="view_count",
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.CreateModel(
+            name="NewspaperViewBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("hour", models.DateTimeField()),
+                ("views", models.PositiveIntegerField(default=0)),
+                (
+                    "newspaper",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="view_buckets",
+                        to="news.newspaper",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "newspaper view bucket",
+                "verbose_name_plural": "newspaper view buckets",
+                "indexes": [models.Index(fields=["hour"], name="view_bucket_hour_idx")],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("newspaper", "hour"),
+                        name="unique_newspaper_view_bucket",
+                    )
+                ],
+            },
+        ),
+    ]
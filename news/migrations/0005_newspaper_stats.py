@@ -0,0 +1,101 @@
+# Generated by Django 5.2.1 on 2026-10-19 07:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, DateField
+from django.db.models.functions import TruncMonth
+
+
+def build_stats(apps, schema_editor):
+    Newspaper = apps.get_model("news", "Newspaper")
+    NewspaperStat = apps.get_model("news", "NewspaperStat")
+    month = TruncMonth("published_date", output_field=DateField())
+    stats = [
+        NewspaperStat(**row)
+        for row in Newspaper.objects.annotate(month=month)
+        .values("topic_id", "month")
+        .annotate(newspapers=Count("pk"))
+        .order_by()
+    ]
+    publisher_rows = (
+        Newspaper.publishers.through.objects.annotate(
+            month=TruncMonth("newspaper__published_date", output_field=DateField())
+        )
+        .values("newspaper__topic_id", "redactor_id", "month")
+        .annotate(newspapers=Count("pk"))
+        .order_by()
+    )
+    stats += [
+        NewspaperStat(
+            topic_id=row["newspaper__topic_id"],
+            redactor_id=row["redactor_id"],
+            month=row["month"],
+            newspapers=row["newspapers"],
+        )
+        for row in publisher_rows
+    ]
+    NewspaperStat.objects.bulk_create(stats, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0004_newspaper_readership"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NewspaperStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("month", models.DateField()),
+                ("newspapers", models.PositiveIntegerField(default=0)),
+                (
+                    "redactor",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stats",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "topic",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stats",
+                        to="news.topic",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "newspaper statistic",
+                "verbose_name_plural": "newspaper statistics",
+                "ordering": ["month"],
+                "indexes": [models.Index(fields=["month"], name="stat_month_idx")],
+                "constraints": [
+                    models.UniqueConstraint(
+                        condition=models.Q(("redactor__isnull", True)),
+                        fields=("topic", "month"),
+                        name="unique_topic_month_stat",
+                    ),
+                    models.UniqueConstraint(
+                        condition=models.Q(("redactor__isnull", False)),
+                        fields=("topic", "redactor", "month"),
+                        name="unique_topic_redactor_month_stat",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(build_stats, migrations.RunPython.noop),
+    ]
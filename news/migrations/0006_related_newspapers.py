@@ -0,0 +1,61 @@
+# Generated by Django 5.2.1 on 2026-10-19 07:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0005_newspaper_stats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RelatedNewspaper",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("score", models.FloatField()),
+                ("rank", models.PositiveSmallIntegerField()),
+                (
+                    "newspaper",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="related_links",
+                        to="news.newspaper",
+                    ),
+                ),
+                (
+                    "related",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="news.newspaper",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "related newspaper",
+                "verbose_name_plural": "related newspapers",
+                "ordering": ["newspaper_id", "rank"],
+                "indexes": [
+                    models.Index(
+                        fields=["newspaper", "rank"], name="related_newspaper_rank_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("newspaper", "related"), name="unique_related_newspaper"
+                    )
+                ],
+            },
+        ),
+    ]
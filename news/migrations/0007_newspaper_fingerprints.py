@@ -0,0 +1,89 @@
+# Generated by Django 5.2.1 on 2026-10-19 07:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from news.duplicates import buckets, signature
+
+
+def build_fingerprints(apps, schema_editor):
+    Newspaper = apps.get_model("news", "Newspaper")
+    NewspaperFingerprint = apps.get_model("news", "NewspaperFingerprint")
+    NewspaperFingerprintBucket = apps.get_model("news", "NewspaperFingerprintBucket")
+    fingerprints, fingerprint_buckets = [], []
+    for pk, title, content in Newspaper.objects.values_list(
+        "pk", "title", "content"
+    ).iterator():
+        current = signature(title, content)
+        if current is None:
+            continue
+        fingerprints.append(
+            NewspaperFingerprint(newspaper_id=pk, signature=current.tobytes())
+        )
+        fingerprint_buckets += [
+            NewspaperFingerprintBucket(newspaper_id=pk, bucket=bucket)
+            for bucket in buckets(current)
+        ]
+    NewspaperFingerprint.objects.bulk_create(fingerprints, batch_size=1000)
+    NewspaperFingerprintBucket.objects.bulk_create(fingerprint_buckets, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0006_related_newspapers"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NewspaperFingerprint",
+            fields=[
+                (
+                    "newspaper",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="fingerprint",
+                        serialize=False,
+                        to="news.newspaper",
+                    ),
+                ),
+                ("signature", models.BinaryField()),
+            ],
+            options={
+                "verbose_name": "newspaper fingerprint",
+                "verbose_name_plural": "newspaper fingerprints",
+            },
+        ),
+        migrations.CreateModel(
+            name="NewspaperFingerprintBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("bucket", models.BigIntegerField()),
+                (
+                    "newspaper",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="fingerprint_buckets",
+                        to="news.newspaper",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "newspaper fingerprint bucket",
+                "verbose_name_plural": "newspaper fingerprint buckets",
+                "indexes": [
+                    models.Index(fields=["bucket"], name="fingerprint_bucket_idx")
+                ],
+            },
+        ),
+        migrations.RunPython(build_fingerprints, migrations.RunPython.noop),
+    ]
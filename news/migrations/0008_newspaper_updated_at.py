@@ -0,0 +1,22 @@
+# Generated by Django 5.2.1 on 2026-10-19 07:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0007_newspaper_fingerprints"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newspaper",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name="newspaper",
+            index=models.Index(fields=["updated_at"], name="newspaper_updated_idx"),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.1 on 2026-10-19 07:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0008_newspaper_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RequestProfile",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("method", models.CharField(max_length=10)),
+                ("path", models.TextField()),
+                ("status_code", models.PositiveSmallIntegerField()),
+                (
+                    "duration",
+                    models.FloatField(help_text="Seconds spent in the view stack."),
+                ),
+                ("query_count", models.PositiveIntegerField()),
+                (
+                    "query_duration",
+                    models.FloatField(help_text="Seconds spent in SQL queries."),
+                ),
+                ("stats", models.TextField(blank=True)),
+                ("queries", models.JSONField(blank=True, default=list)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "request profile",
+                "verbose_name_plural": "request profiles",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
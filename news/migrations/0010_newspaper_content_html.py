@@ -0,0 +1,127 @@
+# Generated by Django 5.2.1 on 2026-10-19 08:08
+
+import hashlib
+import json
+
+import markdown
+import nh3
+from django.db import migrations, models
+
+# The renderer configuration as of this migration, so that later changes to
+# news.rendering or the settings do not change what it does.
+EXTENSIONS = ["extra", "sane_lists"]
+
+ALLOWED_TAGS = [
+    "a",
+    "abbr",
+    "blockquote",
+    "br",
+    "code",
+    "dd",
+    "del",
+    "div",
+    "dl",
+    "dt",
+    "em",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "hr",
+    "img",
+    "li",
+    "ol",
+    "p",
+    "pre",
+    "strong",
+    "sub",
+    "sup",
+    "table",
+    "tbody",
+    "td",
+    "th",
+    "thead",
+    "tr",
+    "ul",
+]
+
+ALLOWED_ATTRIBUTES = {
+    "a": ["href", "title"],
+    "abbr": ["title"],
+    "img": ["src", "alt", "title"],
+    "ol": ["start"],
+    "td": ["align"],
+    "th": ["align"],
+}
+
+
+def renderer_version():
+    # Matches news.rendering.RENDERER_VERSION while the configuration is the
+    # same, so rerender_markdown only renders again after it changed.
+    configuration = {
+        "markdown": markdown.__version__,
+        "nh3": nh3.__version__,
+        "extensions": EXTENSIONS,
+        "tags": sorted(ALLOWED_TAGS),
+        "attributes": {
+            tag: sorted(names) for tag, names in ALLOWED_ATTRIBUTES.items()
+        },
+    }
+    return hashlib.sha1(json.dumps(configuration, sort_keys=True).encode()).hexdigest()[
+        :16
+    ]
+
+
+def render_markdown(source):
+    html = markdown.markdown(source, extensions=EXTENSIONS, output_format="html")
+    return nh3.clean(
+        html,
+        tags=set(ALLOWED_TAGS),
+        attributes={tag: set(names) for tag, names in ALLOWED_ATTRIBUTES.items()},
+        url_schemes={"http", "https", "mailto"},
+        link_rel="noopener noreferrer nofollow",
+    )
+
+
+def render_contents(apps, schema_editor):
+    Newspaper = apps.get_model("news", "Newspaper")
+    version = renderer_version()
+    batch = []
+    for newspaper in Newspaper.objects.only("pk", "content").iterator():
+        newspaper.content_html = render_markdown(newspaper.content)
+        newspaper.content_html_version = version
+        batch.append(newspaper)
+        if len(batch) == 500:
+            Newspaper.objects.bulk_update(
+                batch, ["content_html", "content_html_version"]
+            )
+            batch = []
+    Newspaper.objects.bulk_update(batch, ["content_html", "content_html_version"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0009_requestprofile"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newspaper",
+            name="content_html",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name="newspaper",
+            name="content_html_version",
+            field=models.CharField(blank=True, editable=False, max_length=16),
+        ),
+        migrations.AlterField(
+            model_name="newspaper",
+            name="content",
+            field=models.TextField(help_text="Formatted with Markdown."),
+        ),
+        migrations.RunPython(render_contents, migrations.RunPython.noop),
+    ]
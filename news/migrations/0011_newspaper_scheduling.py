@@ -0,0 +1,72 @@
+# Generated by Django 5.2.1 on 2026-10-19 08:12
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0010_newspaper_content_html"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="newspaper",
+            name="newspaper_published_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="newspaper",
+            name="newspaper_topic_published_idx",
+        ),
+        migrations.AddField(
+            model_name="newspaper",
+            name="publish_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Hold the newspaper back until then; leave empty to publish now.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="newspaper",
+            name="status",
+            field=models.CharField(
+                choices=[("scheduled", "Scheduled"), ("published", "Published")],
+                default="published",
+                editable=False,
+                max_length=10,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="newspaper",
+            name="published_date",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, editable=False
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="newspaper",
+            index=models.Index(
+                condition=models.Q(("status", "published")),
+                fields=["-published_date"],
+                name="newspaper_visible_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="newspaper",
+            index=models.Index(
+                condition=models.Q(("status", "published")),
+                fields=["topic", "-published_date"],
+                name="newspaper_topic_visible_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="newspaper",
+            index=models.Index(
+                condition=models.Q(("status", "scheduled")),
+                fields=["publish_at"],
+                name="newspaper_scheduled_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 5.2.1 on 2026-10-19 10:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0011_newspaper_scheduling"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="newspaper",
+            name="newspaper_visible_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="newspaper",
+            name="newspaper_topic_visible_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="newspaper",
+            name="newspaper_scheduled_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="newspaper",
+            name="newspaper_updated_idx",
+        ),
+        migrations.AddField(
+            model_name="newspaper",
+            name="deleted_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="topic",
+            name="deleted_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="newspaper",
+            index=models.Index(
+                condition=models.Q(("deleted_at", None), ("status", "published")),
+                fields=["-published_date"],
+                name="newspaper_visible_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="newspaper",
+            index=models.Index(
+                condition=models.Q(("deleted_at", None), ("status", "published")),
+                fields=["topic", "-published_date"],
+                name="newspaper_topic_visible_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="newspaper",
+            index=models.Index(
+                condition=models.Q(("deleted_at", None), ("status", "scheduled")),
+                fields=["publish_at"],
+                name="newspaper_scheduled_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="newspaper",
+            index=models.Index(
+                condition=models.Q(("deleted_at", None)),
+                fields=["updated_at"],
+                name="newspaper_updated_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="newspaper",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", False)),
+                fields=["deleted_at"],
+                name="newspaper_trash_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="topic",
+            index=models.Index(
+                condition=models.Q(("deleted_at", None)),
+                fields=["name"],
+                name="topic_live_name_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.2.1 on 2026-10-19 12:03
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0012_soft_delete"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AuditEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[
+                            ("created", "Created"),
+                            ("updated", "Updated"),
+                            ("deleted", "Deleted"),
+                            ("assigned", "Assigned"),
+                            ("unassigned", "Unassigned"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("newspaper_id", models.PositiveBigIntegerField()),
+                ("newspaper_title", models.CharField(max_length=255)),
+                ("details", models.JSONField(blank=True, default=dict)),
+                (
+                    "created_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "redactor",
+                    models.ForeignKey(
+                        blank=True,
+                        db_constraint=False,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "audit event",
+                "verbose_name_plural": "audit events",
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["newspaper_id", "-created_at"],
+                        name="audit_newspaper_idx",
+                    ),
+                    models.Index(
+                        fields=["redactor", "-created_at"],
+                        name="audit_redactor_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.1 on 2026-10-19 14:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0013_auditevent"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="auditevent",
+            name="action",
+            field=models.CharField(
+                choices=[
+                    ("created", "Created"),
+                    ("updated", "Updated"),
+                    ("deleted", "Deleted"),
+                    ("restored", "Restored"),
+                    ("assigned", "Assigned"),
+                    ("unassigned", "Unassigned"),
+                ],
+                max_length=10,
+            ),
+        ),
+    ]
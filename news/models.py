@@ -1,16 +1,36 @@
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.signals import m2m_changed
 from django.urls import reverse
+from django.utils import timezone
+
+
+class LiveManager(models.Manager):
+    """Default manager that hides the rows moved to the trash."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at=None)
 
 
 class Topic(models.Model):
     name = models.CharField(max_length=255, null=False, blank=False)
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = LiveManager()
+    all_objects = models.Manager()
 
     class Meta:
         verbose_name = "topic"
         verbose_name_plural = "topics"
         ordering = ["name"]
+        indexes = [
+            models.Index(
+                fields=["name"],
+                condition=models.Q(deleted_at=None),
+                name="topic_live_name_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -31,10 +51,38 @@ class Redactor(AbstractUser):
         return reverse("news:redactor-detail", kwargs={"pk": self.id})
 
 
+class NewspaperQuerySet(models.QuerySet):
+    def visible(self):
+        """Newspapers readers can see: published, past their embargo, not trashed."""
+        return self.filter(status=Newspaper.Status.PUBLISHED, deleted_at=None)
+
+
 class Newspaper(models.Model):
+    class Status(models.TextChoices):
+        SCHEDULED = "scheduled", "Scheduled"
+        PUBLISHED = "published", "Published"
+
     title = models.CharField(max_length=255, null=False, blank=False)
-    content = models.TextField(null=False, blank=False)
-    published_date = models.DateTimeField(auto_now_add=True)
+    content = models.TextField(
+        null=False, blank=False, help_text="Formatted with Markdown."
+    )
+    content_html = models.TextField(blank=True, editable=False)
+    content_html_version = models.CharField(max_length=16, blank=True, editable=False)
+    status = models.CharField(
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PUBLISHED,
+        editable=False,
+    )
+    publish_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Hold the newspaper back until then; leave empty to publish now.",
+    )
+    published_date = models.DateTimeField(default=timezone.now, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+    view_count = models.PositiveBigIntegerField(default=0, editable=False)
     topic = models.ForeignKey(
         Topic, on_delete=models.CASCADE, related_name="newspapers"
     )
@@ -42,10 +90,395 @@ class Newspaper(models.Model):
         settings.AUTH_USER_MODEL, related_name="newspapers"
     )
 
+    objects = LiveManager.from_queryset(NewspaperQuerySet)()
+    all_objects = NewspaperQuerySet.as_manager()
+
     class Meta:
         verbose_name = "newspaper"
         verbose_name_plural = "newspapers"
         ordering = ["-published_date"]
+        # The indexes only hold visible newspapers, so neither scheduled
+        # newspapers nor a growing trash add rows to read.
+        indexes = [
+            models.Index(
+                fields=["-published_date"],
+                condition=models.Q(status="published", deleted_at=None),
+                name="newspaper_visible_idx",
+            ),
+            models.Index(
+                fields=["topic", "-published_date"],
+                condition=models.Q(status="published", deleted_at=None),
+                name="newspaper_topic_visible_idx",
+            ),
+            models.Index(
+                fields=["publish_at"],
+                condition=models.Q(status="scheduled", deleted_at=None),
+                name="newspaper_scheduled_idx",
+            ),
+            models.Index(
+                fields=["updated_at"],
+                condition=models.Q(deleted_at=None),
+                name="newspaper_updated_idx",
+            ),
+            models.Index(
+                fields=["deleted_at"],
+                condition=models.Q(deleted_at__isnull=False),
+                name="newspaper_trash_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_topic_id = instance.__dict__.get("topic_id")
+        instance._loaded_published_date = instance.__dict__.get("published_date")
+        return instance
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "publish_at" in update_fields:
+            self.schedule()
+            if update_fields is not None:
+                update_fields = kwargs["update_fields"] = {
+                    *update_fields,
+                    "status",
+                    "published_date",
+                }
+        if update_fields is None or "content" in update_fields:
+            self.render_content()
+            if update_fields is not None:
+                kwargs["update_fields"] = {
+                    *update_fields,
+                    "content_html",
+                    "content_html_version",
+                }
+        super().save(*args, **kwargs)
+        self._loaded_topic_id = self.topic_id
+        self._loaded_published_date = self.published_date
+
+    def schedule(self):
+        """
+        Hold the newspaper back until ``publish_at``, or publish it now.
+
+        A scheduled newspaper is dated ``publish_at`` already, so going live
+        only changes its status. Published newspapers stay published.
+        """
+        if self.status == self.Status.PUBLISHED and not self._state.adding:
+            return
+        if self.publish_at is not None and self.publish_at > timezone.now():
+            self.status = self.Status.SCHEDULED
+            self.published_date = self.publish_at
+        elif self.status == self.Status.SCHEDULED:
+            self.status = self.Status.PUBLISHED
+            self.published_date = timezone.now()
+
+    @property
+    def is_visible(self):
+        return self.status == self.Status.PUBLISHED and self.deleted_at is None
+
+    def render_content(self):
+        """Store the sanitized HTML of ``content``, rendered once per save."""
+        # Imported on first use, like numpy; see news.startup.
+        from news.rendering import RENDERER_VERSION, render_markdown
+
+        self.content_html = render_markdown(self.content)
+        self.content_html_version = RENDERER_VERSION
+
+    def get_absolute_url(self):
+        return reverse("news:newspaper-detail", kwargs={"pk": self.id})
+
+    def set_publishers(self, redactors):
+        """
+        Make ``redactors`` the publishers of this newspaper.
+
+        The current links are read with one query and only the difference is
+        written: one bulk insert and one delete. ``m2m_changed`` is sent once
+        per direction with the whole set of changed primary keys, so
+        receivers invalidate caches once per save instead of once per
+        publisher.
+        """
+        through = Newspaper.publishers.through
+        links = through.objects.using(self._state.db).filter(newspaper_id=self.pk)
+        current = set(links.values_list("redactor_id", flat=True))
+        wanted = {redactor.pk for redactor in redactors}
+        signal_kwargs = {
+            "sender": through,
+            "instance": self,
+            "reverse": False,
+            "model": Redactor,
+            "using": self._state.db,
+        }
+
+        removed = current - wanted
+        if removed:
+            m2m_changed.send(action="pre_remove", pk_set=removed, **signal_kwargs)
+            links.filter(redactor_id__in=removed).delete()
+            m2m_changed.send(action="post_remove", pk_set=removed, **signal_kwargs)
+
+        added = wanted - current
+        if added:
+            m2m_changed.send(action="pre_add", pk_set=added, **signal_kwargs)
+            through.objects.using(self._state.db).bulk_create(
+                [through(newspaper_id=self.pk, redactor_id=pk) for pk in added],
+                ignore_conflicts=True,
+            )
+            m2m_changed.send(action="post_add", pk_set=added, **signal_kwargs)
+
+
+class NewspaperViewBucket(models.Model):
+    """Views of a newspaper during one hour, used to rank the most read."""
+
+    newspaper = models.ForeignKey(
+        Newspaper, on_delete=models.CASCADE, related_name="view_buckets"
+    )
+    hour = models.DateTimeField()
+    views = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "newspaper view bucket"
+        verbose_name_plural = "newspaper view buckets"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["newspaper", "hour"], name="unique_newspaper_view_bucket"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["hour"], name="view_bucket_hour_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.newspaper_id} @ {self.hour:%Y-%m-%d %H:00}: {self.views}"
+
+
+class RelatedNewspaper(models.Model):
+    """One of the precomputed most similar newspapers of a newspaper."""
+
+    newspaper = models.ForeignKey(
+        Newspaper, on_delete=models.CASCADE, related_name="related_links"
+    )
+    related = models.ForeignKey(Newspaper, on_delete=models.CASCADE, related_name="+")
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        verbose_name = "related newspaper"
+        verbose_name_plural = "related newspapers"
+        ordering = ["newspaper_id", "rank"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["newspaper", "related"], name="unique_related_newspaper"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["newspaper", "rank"], name="related_newspaper_rank_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.newspaper_id} ~ {self.related_id}: {self.score:.3f}"
+
+
+class NewspaperFingerprint(models.Model):
+    """MinHash signature of a newspaper, compared to find near-duplicates."""
+
+    newspaper = models.OneToOneField(
+        Newspaper,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="fingerprint",
+    )
+    signature = models.BinaryField()
+
+    class Meta:
+        verbose_name = "newspaper fingerprint"
+        verbose_name_plural = "newspaper fingerprints"
+
+    def __str__(self):
+        return f"Fingerprint of {self.newspaper_id}"
+
+
+class NewspaperFingerprintBucket(models.Model):
+    """LSH bucket of one band of a newspaper's signature."""
+
+    newspaper = models.ForeignKey(
+        Newspaper, on_delete=models.CASCADE, related_name="fingerprint_buckets"
+    )
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        verbose_name = "newspaper fingerprint bucket"
+        verbose_name_plural = "newspaper fingerprint buckets"
+        indexes = [
+            models.Index(fields=["bucket"], name="fingerprint_bucket_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.newspaper_id} in {self.bucket}"
+
+
+class NewspaperStat(models.Model):
+    """
+    Number of newspapers published on a topic in a month.
+
+    Rows without a redactor hold the topic totals; rows with a redactor
+    count that redactor's newspapers on the topic.
+    """
+
+    topic = models.ForeignKey(Topic, on_delete=models.CASCADE, related_name="stats")
+    redactor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="stats",
+    )
+    month = models.DateField()
+    newspapers = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "newspaper statistic"
+        verbose_name_plural = "newspaper statistics"
+        ordering = ["month"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["topic", "month"],
+                condition=models.Q(redactor__isnull=True),
+                name="unique_topic_month_stat",
+            ),
+            models.UniqueConstraint(
+                fields=["topic", "redactor", "month"],
+                condition=models.Q(redactor__isnull=False),
+                name="unique_topic_redactor_month_stat",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["month"], name="stat_month_idx"),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.topic_id}/{self.redactor_id} {self.month:%Y-%m}: {self.newspapers}"
+        )
+
+
+class Job(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        SUCCEEDED = "succeeded", "Succeeded"
+        FAILED = "failed", "Failed"
+
+    ACTIVE_STATUSES = (Status.PENDING, Status.RUNNING)
+
+    name = models.CharField(max_length=255)
+    payload = models.JSONField(default=dict, blank=True)
+    dedupe_key = models.CharField(max_length=255, null=True, blank=True)
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=255, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "job"
+        verbose_name_plural = "jobs"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "run_at"], name="job_status_run_at_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dedupe_key"],
+                condition=models.Q(status__in=["pending", "running"]),
+                name="job_unique_active_dedupe_key",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
+
+class RequestProfile(models.Model):
+    """A profiled request; the raw cProfile data is kept in ``PROFILE_DIR``."""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    method = models.CharField(max_length=10)
+    path = models.TextField()
+    status_code = models.PositiveSmallIntegerField()
+    duration = models.FloatField(help_text="Seconds spent in the view stack.")
+    query_count = models.PositiveIntegerField()
+    query_duration = models.FloatField(help_text="Seconds spent in SQL queries.")
+    stats = models.TextField(blank=True)
+    queries = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "request profile"
+        verbose_name_plural = "request profiles"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration * 1000:.0f} ms)"
+
+
+class AuditEvent(models.Model):
+    """
+    One entry of the append-only audit journal of newspapers.
+
+    The newspaper and the redactor are kept as plain ids without foreign key
+    constraints, so entries outlive what they describe and are never
+    updated by a cascade.
+    """
+
+    class Action(models.TextChoices):
+        CREATED = "created", "Created"
+        UPDATED = "updated", "Updated"
+        DELETED = "deleted", "Deleted"
+        RESTORED = "restored", "Restored"
+        ASSIGNED = "assigned", "Assigned"
+        UNASSIGNED = "unassigned", "Unassigned"
+
+    action = models.CharField(max_length=10, choices=Action.choices)
+    newspaper_id = models.PositiveBigIntegerField()
+    newspaper_title = models.CharField(max_length=255)
+    redactor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    details = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "audit event"
+        verbose_name_plural = "audit events"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["newspaper_id", "-created_at"], name="audit_newspaper_idx"
+            ),
+            models.Index(fields=["redactor", "-created_at"], name="audit_redactor_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.redactor_id} {self.action} {self.newspaper_id}"
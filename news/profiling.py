@@ -0,0 +1,137 @@
+"""
+On-demand profiles of single requests, for staff.
+
+A staff user adds ``?profile=1`` to a URL or sends an ``X-Profile`` header;
+the request then runs under cProfile with its SQL queries recorded, and the
+SELECTs are explained once the response is ready. The raw profile is written
+to a ring of ``PROFILE_RING_SIZE`` files in ``PROFILE_DIR``, for pstats or
+snakeviz, and a RequestProfile lists it in the admin with the slowest
+functions and the query plans. Other requests cost one dictionary lookup.
+"""
+
+import io
+import logging
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+from news.db import explain
+from news.models import RequestProfile
+
+logger = logging.getLogger(__name__)
+
+PROFILE_PARAM = "profile"
+PROFILE_HEADER = "X-Profile"
+
+
+def requested(request):
+    return PROFILE_PARAM in request.GET or PROFILE_HEADER in request.headers
+
+
+def profile_path(pk):
+    """Return the ring slot holding the raw profile of RequestProfile ``pk``."""
+    return Path(settings.PROFILE_DIR) / f"{pk % settings.PROFILE_RING_SIZE}.prof"
+
+
+class QueryLog:
+    """Database execute wrapper recording every query and its duration."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(
+                {
+                    "using": context["connection"].alias,
+                    "sql": sql,
+                    "params": params,
+                    "many": many,
+                    "duration": time.perf_counter() - started,
+                }
+            )
+
+
+def explain_queries(queries):
+    """Add the plan of the first ``PROFILE_EXPLAIN_LIMIT`` distinct SELECTs."""
+    plans = {}
+    for query in queries:
+        if query["many"] or not query["sql"].lstrip().upper().startswith("SELECT"):
+            continue
+        key = (query["using"], query["sql"], repr(query["params"]))
+        if key not in plans:
+            if len(plans) >= settings.PROFILE_EXPLAIN_LIMIT:
+                continue
+            try:
+                plans[key] = explain(query["sql"], query["params"], query["using"])
+            except DatabaseError as error:
+                plans[key] = f"Could not explain: {error}"
+        query["explain"] = plans[key]
+
+
+def profile(request, get_response):
+    """Answer ``request`` under the profiler and keep what it recorded."""
+    # Imported here so that workers do not pay for them until a profile is
+    # requested.
+    import cProfile
+
+    profiler = cProfile.Profile()
+    log = QueryLog()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(log))
+        started = time.perf_counter()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active in this process.
+            return get_response(request)
+        try:
+            response = get_response(request)
+        finally:
+            profiler.disable()
+        duration = time.perf_counter() - started
+
+    try:
+        record = save(request, response, profiler, duration, log.queries)
+    except (DatabaseError, OSError):
+        logger.exception("Could not save the profile of %s", request.path)
+    else:
+        response["X-Profile-Id"] = str(record.pk)
+    return response
+
+
+def save(request, response, profiler, duration, queries):
+    import pstats
+
+    explain_queries(queries)
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+        settings.PROFILE_STATS_LIMIT
+    )
+    record = RequestProfile.objects.create(
+        user=request.user,
+        method=request.method,
+        path=request.get_full_path(),
+        status_code=response.status_code,
+        duration=duration,
+        query_count=len(queries),
+        query_duration=sum(query["duration"] for query in queries),
+        stats=stream.getvalue(),
+        queries=[{**query, "params": repr(query["params"])} for query in queries],
+    )
+    path = profile_path(record.pk)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    stats.dump_stats(path)
+    # The slot now holds this profile, so the one it replaces is dropped.
+    RequestProfile.objects.filter(
+        pk__lte=record.pk - settings.PROFILE_RING_SIZE
+    ).delete()
+    return record
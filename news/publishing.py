@@ -0,0 +1,134 @@
+"""
+Scheduled publishing.
+
+Newspapers with a future ``publish_at`` are saved as scheduled and dated
+``publish_at``; ``run`` flips them to published once that moment passes.
+Due newspapers are found through a partial index on ``publish_at`` that only
+holds scheduled rows, and flipped with one UPDATE per batch, so a loop
+polling every few seconds costs an index probe when nothing is due.
+
+Scheduling or restoring a scheduled newspaper queues a
+``publish_scheduled --once`` job for its ``publish_at`` with ``schedule``,
+so the job workers publish it on time; the ``publish_scheduled`` loop is
+only needed without them.
+"""
+
+import logging
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from news import events, suggest
+from news.cache import bump_version
+from news.jobs import enqueue
+from news.models import Newspaper
+
+logger = logging.getLogger(__name__)
+
+
+def schedule(publish_at):
+    """Queue a run of ``publish_scheduled`` for ``publish_at`` once this commits."""
+    transaction.on_commit(
+        lambda: enqueue(
+            "news.call_command",
+            {"command": "publish_scheduled", "options": {"once": True}},
+            dedupe_key=f"publish_scheduled:{publish_at:%Y%m%d%H%M%S%f}",
+            run_at=publish_at,
+        )
+    )
+
+
+def publish_due(now=None, batch_size=None):
+    """Publish the scheduled newspapers whose embargo has passed; return how many."""
+    now = now or timezone.now()
+    batch_size = batch_size or settings.PUBLISH_BATCH_SIZE
+    due = Newspaper.objects.filter(
+        status=Newspaper.Status.SCHEDULED, publish_at__lte=now
+    ).order_by("publish_at")
+
+    published = 0
+    while True:
+        with transaction.atomic():
+            batch = list(due.values_list("pk", "topic_id", "title")[:batch_size])
+            if not batch:
+                break
+            pks = [pk for pk, topic_id, title in batch]
+            # Bumping ``updated_at`` lets the live update pollers see them.
+            published += Newspaper.objects.filter(
+                pk__in=pks, status=Newspaper.Status.SCHEDULED
+            ).update(status=Newspaper.Status.PUBLISHED, updated_at=now)
+            redactor_ids = set(
+                Newspaper.publishers.through.objects.filter(
+                    newspaper_id__in=pks
+                ).values_list("redactor_id", flat=True)
+            )
+            scopes = {"feed:all", "search:newspaper"}
+            scopes.update(f"feed:topic:{topic_id}" for pk, topic_id, title in batch)
+            scopes.update(f"feed:redactor:{pk}" for pk in redactor_ids)
+            transaction.on_commit(lambda scopes=scopes: bump_version(*scopes))
+            # The UPDATE sends no post_save, so do what its receivers would.
+            _on_commit_published(batch)
+    return published
+
+
+def _on_commit_published(batch):
+    """Suggest the published newspapers and push them to live update clients."""
+    labels = {pk: title for pk, topic_id, title in batch}
+    event_list = []
+    if events.hub.subscriber_count():
+        newspapers = Newspaper.objects.select_related("topic").filter(pk__in=labels)
+        event_list = [
+            events.newspaper_event(newspaper, newspaper.topic.name)
+            for newspaper in newspapers
+        ]
+
+    def published():
+        index = suggest.indexes["newspapers"]
+        for pk, title in labels.items():
+            index.update(pk, title)
+        for event in event_list:
+            events.hub.publish(event)
+
+    transaction.on_commit(published)
+
+
+def next_due():
+    """Return when the next scheduled newspaper goes live, or None."""
+    return (
+        Newspaper.objects.filter(status=Newspaper.Status.SCHEDULED)
+        .order_by("publish_at")
+        .values_list("publish_at", flat=True)
+        .first()
+    )
+
+
+def run(*, stop_event=None, interval=None, once=False):
+    """
+    Publish due newspapers until ``stop_event`` is set.
+
+    The loop sleeps until the next embargo ends, but never longer than
+    ``interval`` seconds, so newspapers scheduled by other processes in the
+    meantime still go live on time.
+    """
+    stop_event = stop_event or threading.Event()
+    interval = interval or settings.PUBLISH_POLL_INTERVAL
+    published = 0
+    while not stop_event.is_set():
+        try:
+            published += publish_due()
+            upcoming = next_due()
+        except Exception:
+            if once:
+                raise
+            logger.exception("Could not publish the scheduled newspapers")
+            upcoming = None
+        if once:
+            break
+        close_old_connections()
+        wait = interval
+        if upcoming is not None:
+            wait = min(interval, max(0, (upcoming - timezone.now()).total_seconds()))
+        stop_event.wait(wait)
+    return published
@@ -0,0 +1,194 @@
+"""
+Related newspapers from TF-IDF similarity.
+
+Every newspaper becomes a sparse, L2-normalized TF-IDF vector of its title
+and content, so cosine similarity is a sparse matrix product. Similarities
+are computed a batch of rows at a time and only the ``RELATED_TOP_K`` best
+neighbours of each newspaper are kept in ``RelatedNewspaper``, where the
+detail page reads them with one indexed query.
+"""
+
+import re
+from array import array
+from collections import Counter, defaultdict
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from scipy import sparse
+
+from news.models import Newspaper, RelatedNewspaper
+
+TOKEN_RE = re.compile(r"\w\w+")
+
+# Title terms count as this many occurrences in the body.
+TITLE_WEIGHT = 2
+
+# Terms found in a larger share of the newspapers say nothing about
+# similarity and would only make the similarity products dense.
+MAX_DOCUMENT_FREQUENCY = 0.5
+
+MIN_SCORE = 0.05
+
+BATCH_SIZE = 256
+
+
+def term_counts(title, content):
+    counts = Counter(TOKEN_RE.findall(content.casefold()))
+    for term in TOKEN_RE.findall(title.casefold()):
+        counts[term] += TITLE_WEIGHT
+    return counts
+
+
+def vectorize(rows):
+    """
+    Turn ``(pk, title, content)`` rows into TF-IDF vectors.
+
+    Return the primary keys and a CSR matrix with one normalized row per
+    newspaper, in the same order.
+    """
+    vocabulary = {}
+    pks, indptr, indices, data = array("q"), array("q", [0]), array("q"), array("f")
+    for pk, title, content in rows:
+        pks.append(pk)
+        for term, count in term_counts(title, content).items():
+            indices.append(vocabulary.setdefault(term, len(vocabulary)))
+            data.append(count)
+        indptr.append(len(indices))
+
+    matrix = sparse.csr_matrix(
+        (
+            np.frombuffer(data, dtype=np.float32),
+            np.frombuffer(indices, dtype=np.int64),
+            np.frombuffer(indptr, dtype=np.int64),
+        ),
+        shape=(len(pks), len(vocabulary)),
+    )
+    matrix.data = 1 + np.log(matrix.data)
+
+    documents = len(pks)
+    frequency = np.bincount(matrix.indices, minlength=len(vocabulary))
+    idf = np.log((1 + documents) / (1 + frequency)) + 1
+    idf[frequency > max(2, MAX_DOCUMENT_FREQUENCY * documents)] = 0
+    matrix = (matrix @ sparse.diags(idf.astype(np.float32))).tocsr()
+    matrix.eliminate_zeros()
+
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    matrix = (sparse.diags(1 / norms) @ matrix).tocsr()
+    return np.frombuffer(pks, dtype=np.int64), matrix
+
+
+def nearest_neighbours(matrix, rows, top_k):
+    """Yield ``(row, neighbour_rows, scores)`` for each of ``rows``, best first."""
+    transposed = matrix.T.tocsr()
+    for start in range(0, len(rows), BATCH_SIZE):
+        batch = rows[start : start + BATCH_SIZE]
+        similarities = (matrix[batch] @ transposed).tocsr()
+        for offset, row in enumerate(batch):
+            begin, end = similarities.indptr[offset], similarities.indptr[offset + 1]
+            columns = similarities.indices[begin:end]
+            scores = similarities.data[begin:end]
+            keep = (columns != row) & (scores >= MIN_SCORE)
+            columns, scores = columns[keep], scores[keep]
+            if len(scores) > top_k:
+                best = np.argpartition(-scores, top_k)[:top_k]
+                columns, scores = columns[best], scores[best]
+            order = np.argsort(-scores, kind="stable")
+            yield row, columns[order], scores[order]
+
+
+def _save(links):
+    with transaction.atomic():
+        RelatedNewspaper.objects.filter(newspaper_id__in=links).delete()
+        RelatedNewspaper.objects.bulk_create(
+            [
+                RelatedNewspaper(
+                    newspaper_id=pk, related_id=related_pk, score=score, rank=rank
+                )
+                for pk, neighbours in links.items()
+                for rank, (related_pk, score) in enumerate(neighbours)
+            ],
+            batch_size=1000,
+        )
+
+
+def _merge_into_neighbours(links, top_k):
+    """
+    Offer freshly computed newspapers to the lists of their neighbours.
+
+    Similarity is symmetric, so a new newspaper can only enter the top list
+    of a newspaper that is similar to it; its own neighbours are the
+    candidates.
+    """
+    candidates = defaultdict(dict)
+    for pk, neighbours in links.items():
+        for related_pk, score in neighbours:
+            if related_pk not in links:
+                candidates[related_pk][pk] = score
+
+    existing = (
+        RelatedNewspaper.objects.filter(newspaper_id__in=list(candidates))
+        .order_by()
+        .values_list("newspaper_id", "related_id", "score")
+    )
+    for pk, related_pk, score in existing:
+        candidates[pk].setdefault(related_pk, score)
+
+    return {
+        pk: sorted(scores.items(), key=lambda item: -item[1])[:top_k]
+        for pk, scores in candidates.items()
+    }
+
+
+def compute(new_only=False, top_k=None):
+    """
+    Store the most similar newspapers of each newspaper.
+
+    With ``new_only`` only newspapers without stored neighbours get their
+    list computed, and each of them is merged into the lists of its own
+    neighbours. The whole archive is still vectorized, since the weights of
+    every term depend on all newspapers, so a run costs O(N) either way;
+    the news signals batch new newspapers into one run per
+    ``RELATED_UPDATE_DELAY``. Return the number of newspapers whose list was
+    written.
+    """
+    top_k = top_k or settings.RELATED_TOP_K
+    rows = (
+        Newspaper._base_manager.filter(deleted_at=None)
+        .order_by("pk")
+        .values_list("pk", "title", "content")
+        .iterator(chunk_size=2000)
+    )
+    pks, matrix = vectorize(rows)
+    if not len(pks):
+        return 0
+
+    if new_only:
+        computed = set(
+            RelatedNewspaper.objects.order_by()
+            .values_list("newspaper_id", flat=True)
+            .distinct()
+        )
+        targets = [row for row, pk in enumerate(pks) if int(pk) not in computed]
+    else:
+        targets = list(range(len(pks)))
+
+    written, links, pending = 0, {}, {}
+    for row, columns, scores in nearest_neighbours(matrix, targets, top_k):
+        neighbours = [
+            (int(pks[column]), float(score)) for column, score in zip(columns, scores)
+        ]
+        if new_only:
+            links[int(pks[row])] = neighbours
+        else:
+            pending[int(pks[row])] = neighbours
+            if len(pending) >= BATCH_SIZE:
+                _save(pending)
+                written += len(pending)
+                pending = {}
+
+    if new_only and links:
+        pending = {**_merge_into_neighbours(links, top_k), **links}
+    _save(pending)
+    return written + len(pending)
@@ -0,0 +1,57 @@
+"""
+Markdown rendering of newspaper bodies.
+
+The sanitized HTML is rendered when a newspaper is saved and stored in
+``Newspaper.content_html``, so pages only print it. ``RENDERER_VERSION``
+changes whenever the renderer, the sanitizer or their configuration does;
+``rerender_markdown`` then renders the newspapers stored with another
+version again.
+"""
+
+import hashlib
+import json
+
+import markdown
+import nh3
+from django.conf import settings
+
+
+def _version():
+    configuration = {
+        "markdown": markdown.__version__,
+        "nh3": nh3.__version__,
+        "extensions": settings.MARKDOWN_EXTENSIONS,
+        "tags": sorted(settings.MARKDOWN_ALLOWED_TAGS),
+        "attributes": {
+            tag: sorted(names)
+            for tag, names in settings.MARKDOWN_ALLOWED_ATTRIBUTES.items()
+        },
+    }
+    return hashlib.sha1(json.dumps(configuration, sort_keys=True).encode()).hexdigest()[
+        :16
+    ]
+
+
+RENDERER_VERSION = _version()
+
+
+def render_markdown(source):
+    """Return the sanitized HTML of the Markdown ``source``."""
+    html = markdown.markdown(
+        source, extensions=settings.MARKDOWN_EXTENSIONS, output_format="html"
+    )
+    return nh3.clean(
+        html,
+        tags=set(settings.MARKDOWN_ALLOWED_TAGS),
+        attributes={
+            tag: set(names)
+            for tag, names in settings.MARKDOWN_ALLOWED_ATTRIBUTES.items()
+        },
+        url_schemes={"http", "https", "mailto"},
+        link_rel="noopener noreferrer nofollow",
+    )
+
+
+def render_batch(rows):
+    """Render ``(pk, source)`` pairs; run in the worker processes."""
+    return [(pk, render_markdown(source)) for pk, source in rows]
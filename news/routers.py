@@ -0,0 +1,77 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+
+reads_from_replica = ContextVar("reads_from_replica", default=False)
+
+# Read and then written by background work, which must see its own writes.
+PRIMARY_ONLY_MODELS = {"job"}
+
+
+@contextmanager
+def on_primary():
+    """Read from the primary in this block, e.g. before writing what was read."""
+    token = reads_from_replica.set(False)
+    try:
+        yield
+    finally:
+        reads_from_replica.reset(token)
+
+
+def writes_on_safe_method(view):
+    """
+    Run ``view``, which writes although called with GET, on the primary.
+
+    Its reads must not come from a lagging replica, and the client is pinned
+    to the primary afterwards as after any other write; see
+    ``PrimaryPinningMiddleware``.
+    """
+
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        request.pin_primary = True
+        with on_primary():
+            return view(request, *args, **kwargs)
+
+    return wrapped
+
+
+class ReplicaRouter:
+    """
+    Send reads of the news models to a read replica.
+
+    Replica aliases are listed in ``DATABASE_REPLICAS``. Reads only go to a
+    replica while ``reads_from_replica`` is set, which
+    ``PrimaryPinningMiddleware`` does for safe requests outside the short
+    window after a client's writes. Commands, jobs and the scheduler read
+    from the primary, so nothing reads stale rows and then writes them back.
+    Writes and migrations always go to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if (
+            model._meta.app_label != "news"
+            or model._meta.model_name in PRIMARY_ONLY_MODELS
+            or not reads_from_replica.get()
+        ):
+            return None
+        if settings.DATABASE_REPLICAS:
+            return random.choice(settings.DATABASE_REPLICAS)
+        return None
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {"default", *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,81 @@
+import hashlib
+import unicodedata
+
+from django.conf import settings
+from django.core.paginator import Page
+
+from news.cache import get_or_compute, get_version
+
+
+def normalize_query(query):
+    """Normalize Unicode forms and collapse runs of whitespace."""
+    return " ".join(unicodedata.normalize("NFKC", query).split())
+
+
+def query_fingerprint(query):
+    """
+    Key under which equivalent searches share cached results.
+
+    The key is the normalized query itself, which is what the ``icontains``
+    lookups receive. Folding case here would merge queries the database
+    tells apart, such as "ß" and "ss", or non-ASCII letters on SQLite.
+    """
+    return hashlib.sha1(normalize_query(query).encode()).hexdigest()
+
+
+class CachedSearchMixin:
+    """
+    Serve paginated search results from the cache.
+
+    Each page of a search is cached as the total count and the primary keys
+    on that page, under the version of ``search_namespace``, which the news
+    signals bump whenever a matching model changes. A hit costs one primary
+    key lookup instead of the filtered COUNT and page query.
+    """
+
+    search_namespace = None
+    search_field = None
+
+    def get_search_query(self):
+        return normalize_query(self.request.GET.get(self.search_field, ""))
+
+    def paginate_queryset(self, queryset, page_size):
+        query = self.get_search_query()
+        if not query:
+            return super().paginate_queryset(queryset, page_size)
+
+        paginate = super().paginate_queryset
+        page_number = (
+            self.kwargs.get(self.page_kwarg)
+            or self.request.GET.get(self.page_kwarg)
+            or 1
+        )
+        key = ":".join(
+            [
+                self.search_namespace,
+                str(get_version(self.search_namespace)),
+                query_fingerprint(query),
+                str(page_size),
+                str(page_number),
+            ]
+        )
+
+        def search():
+            paginator, page, object_list, is_paginated = paginate(queryset, page_size)
+            return paginator.count, page.number, [obj.pk for obj in object_list]
+
+        count, number, pks = get_or_compute(
+            key,
+            search,
+            settings.SEARCH_CACHE_TIMEOUT,
+            settings.SEARCH_CACHE_STALE_TIMEOUT,
+        )
+        objects = queryset.in_bulk(pks)
+        paginator = self.get_paginator(
+            range(count),
+            page_size,
+            orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty(),
+        )
+        page = Page([objects[pk] for pk in pks if pk in objects], number, paginator)
+        return paginator, page, page.object_list, page.has_other_pages()
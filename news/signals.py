@@ -0,0 +1,222 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.signals import user_logged_out
+from django.core.signals import request_finished
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from news import db, events, publishing, stats, suggest
+from news.audit import journal
+from news.backends import invalidate_cached_user
+from news.cache import bump_version
+from news.jobs import enqueue
+from news.models import Newspaper, Redactor, Topic
+
+
+def _newspaper_feed_scopes(newspaper, redactor_ids=()):
+    scopes = {"feed:all", f"feed:topic:{newspaper.topic_id}"}
+    loaded_topic_id = getattr(newspaper, "_loaded_topic_id", None)
+    if loaded_topic_id is not None:
+        scopes.add(f"feed:topic:{loaded_topic_id}")
+    scopes.update(f"feed:redactor:{redactor_id}" for redactor_id in redactor_ids)
+    return scopes
+
+
+@receiver(post_save, sender=Newspaper)
+def invalidate_feeds_on_save(sender, instance, created, **kwargs):
+    redactor_ids = () if created else instance.publishers.values_list("pk", flat=True)
+    bump_version(*_newspaper_feed_scopes(instance, redactor_ids))
+
+
+@receiver(pre_delete, sender=Newspaper)
+def invalidate_feeds_on_delete(sender, instance, **kwargs):
+    redactor_ids = instance.publishers.values_list("pk", flat=True)
+    bump_version(*_newspaper_feed_scopes(instance, redactor_ids))
+
+
+@receiver(m2m_changed, sender=Newspaper.publishers.through)
+def invalidate_feeds_on_publishers_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if reverse:
+        bump_version(f"feed:redactor:{instance.pk}")
+    else:
+        if action == "pre_clear":
+            pk_set = instance.publishers.values_list("pk", flat=True)
+        bump_version(*(f"feed:redactor:{pk}" for pk in pk_set))
+
+
+@receiver(post_save, sender=Newspaper)
+@receiver(post_delete, sender=Newspaper)
+def invalidate_newspaper_searches(sender, instance, **kwargs):
+    bump_version("search:newspaper")
+
+
+@receiver(post_save, sender=Topic)
+@receiver(post_delete, sender=Topic)
+def invalidate_topic_searches(sender, instance, **kwargs):
+    bump_version("search:topic")
+
+
+def _update_suggestions(index, pk, label=None):
+    transaction.on_commit(lambda: suggest.indexes[index].update(pk, label))
+
+
+@receiver(post_save, sender=Topic)
+def update_topic_suggestions(sender, instance, **kwargs):
+    _update_suggestions("topics", instance.pk, instance.name)
+
+
+@receiver(post_save, sender=Newspaper)
+def update_newspaper_suggestions(sender, instance, **kwargs):
+    # Scheduled newspapers are suggested once publishing.publish_due publishes them.
+    label = instance.title if instance.is_visible else None
+    _update_suggestions("newspapers", instance.pk, label)
+
+
+@receiver(post_save, sender=Redactor)
+def update_redactor_suggestions(sender, instance, **kwargs):
+    _update_suggestions("redactors", instance.pk, instance.username)
+
+
+@receiver(post_delete, sender=Topic)
+@receiver(post_delete, sender=Newspaper)
+@receiver(post_delete, sender=Redactor)
+def remove_suggestions(sender, instance, **kwargs):
+    index = {Topic: "topics", Newspaper: "newspapers", Redactor: "redactors"}[sender]
+    _update_suggestions(index, instance.pk)
+
+
+@receiver(post_save, sender=Newspaper)
+def publish_newspaper_event(sender, instance, **kwargs):
+    if not instance.is_visible or not events.hub.subscriber_count():
+        return
+    event = events.newspaper_event(instance, instance.topic.name)
+    transaction.on_commit(lambda: events.hub.publish(event))
+
+
+@receiver(post_save, sender=Newspaper)
+def update_fingerprint(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and not {"title", "content"} & set(update_fields):
+        return
+    # Imported on first use: numpy is only needed once newspapers are saved.
+    from news import duplicates
+
+    duplicates.store(instance, created=created)
+
+
+@receiver(post_save, sender=Newspaper)
+def schedule_related_update(sender, instance, created, **kwargs):
+    if not created:
+        return
+    transaction.on_commit(
+        lambda: enqueue(
+            "news.call_command",
+            {"command": "compute_related", "options": {"new_only": True}},
+            dedupe_key="compute_related:new",
+            run_at=timezone.now() + timedelta(seconds=settings.RELATED_UPDATE_DELAY),
+        )
+    )
+
+
+@receiver(post_save, sender=Newspaper)
+def schedule_publishing(sender, instance, **kwargs):
+    if instance.status != Newspaper.Status.SCHEDULED or instance.publish_at is None:
+        return
+    publishing.schedule(instance.publish_at)
+
+
+@receiver(post_save, sender=Newspaper)
+def update_stats_on_save(sender, instance, created, **kwargs):
+    if created:
+        stats.apply_change(
+            added=stats.contribution(instance.topic_id, instance.published_date)
+        )
+        return
+    loaded_topic_id = getattr(instance, "_loaded_topic_id", None)
+    loaded_published_date = getattr(instance, "_loaded_published_date", None)
+    if loaded_topic_id is None or loaded_published_date is None:
+        return
+    # Rescheduling a newspaper can move it to another month.
+    if loaded_topic_id == instance.topic_id and stats.month_of(
+        loaded_published_date
+    ) == stats.month_of(instance.published_date):
+        return
+    redactor_ids = list(instance.publishers.values_list("pk", flat=True))
+    stats.apply_change(
+        removed=stats.contribution(
+            loaded_topic_id, loaded_published_date, redactor_ids
+        ),
+        added=stats.contribution(
+            instance.topic_id, instance.published_date, redactor_ids
+        ),
+    )
+
+
+@receiver(pre_delete, sender=Newspaper)
+def update_stats_on_delete(sender, instance, **kwargs):
+    if instance.deleted_at is not None:
+        # Already subtracted when the newspaper was trashed.
+        return
+    redactor_ids = list(instance.publishers.values_list("pk", flat=True))
+    stats.apply_change(
+        removed=stats.contribution(
+            instance.topic_id, instance.published_date, redactor_ids
+        )
+    )
+
+
+@receiver(m2m_changed, sender=Newspaper.publishers.through)
+def update_stats_on_publishers_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if action == "pre_clear":
+        related = instance.newspapers if reverse else instance.publishers
+        pk_set = set(related.values_list("pk", flat=True))
+    if not pk_set:
+        return
+
+    if reverse:
+        keys = [
+            (topic_id, instance.pk, stats.month_of(published_date))
+            for topic_id, published_date in stats.newspaper_months(pk_set).values()
+        ]
+    else:
+        month = stats.month_of(instance.published_date)
+        keys = [(instance.topic_id, redactor_id, month) for redactor_id in pk_set]
+
+    if action == "post_add":
+        stats.apply_change(added=keys)
+    else:
+        stats.apply_change(removed=keys)
+
+
+@receiver(post_save, sender=Redactor)
+@receiver(post_delete, sender=Redactor)
+def invalidate_cached_user_on_change(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(user_logged_out)
+def invalidate_cached_user_on_logout(sender, request, user, **kwargs):
+    if user is not None:
+        invalidate_cached_user(user.pk)
+
+
+@receiver(request_finished)
+def flush_audit_journal(sender, **kwargs):
+    # Quiet workers still write their queued events within the interval.
+    journal.flush_if_due()
+
+
+@receiver(connection_created)
+def install_slow_query_log(sender, connection, **kwargs):
+    db.install_slow_query_log(connection)
@@ -0,0 +1,117 @@
+"""
+Work done once in the gunicorn arbiter, before the workers are forked.
+
+With ``preload_app`` the workers inherit the arbiter's memory, so whatever
+is loaded here is loaded once per deploy instead of once per worker, and
+the pages copy-on-write shares stay shared as long as nothing writes to
+them. See ``gunicorn.conf.py`` at the project root.
+"""
+
+import logging
+from importlib import import_module
+from pathlib import Path
+
+from django.core.cache import caches
+from django.db import connections
+from django.template import TemplateSyntaxError, engines
+from django.template.utils import get_app_template_dirs
+from django.urls import URLResolver, get_resolver
+
+from news.audit import journal
+from news.counters import view_counter
+from news.suggest import indexes
+
+logger = logging.getLogger(__name__)
+
+# Imported on first use so that commands and single processes start fast;
+# a preloaded arbiter imports them for all its workers.
+LAZY_MODULES = ("news.duplicates", "news.rendering", "cProfile", "pstats")
+
+TEMPLATE_SUFFIXES = {".html", ".txt", ".xml"}
+
+
+def populate_resolvers(resolver=None):
+    """Build the reverse lookup tables of every URL resolver."""
+    resolver = resolver or get_resolver()
+    resolver.reverse_dict
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            populate_resolvers(pattern)
+
+
+def load_templates():
+    """Compile every template into the cached loader; return how many."""
+    loaded = 0
+    for engine in engines.all():
+        directories = list(engine.dirs)
+        if engine.app_dirs:
+            directories += get_app_template_dirs("templates")
+        for directory in map(Path, directories):
+            for path in directory.rglob("*"):
+                if path.suffix not in TEMPLATE_SUFFIXES:
+                    continue
+                try:
+                    engine.get_template(path.relative_to(directory).as_posix())
+                except TemplateSyntaxError:
+                    # Templates of unused apps may need libraries we lack.
+                    logger.debug("Could not preload %s", path, exc_info=True)
+                else:
+                    loaded += 1
+    return loaded
+
+
+def prewarm():
+    """Import the application's code and build its lookup tables."""
+    for module in LAZY_MODULES:
+        import_module(module)
+    # Loading the URL configuration also imports the views and forms.
+    populate_resolvers()
+    logger.info("Preloaded %s templates", load_templates())
+    build_suggestion_indexes()
+
+
+def build_suggestion_indexes():
+    """Load the search box suggestions, so no request waits for them."""
+    for name, index in indexes.items():
+        try:
+            index.build()
+        except Exception:
+            # Without a database yet, the first request builds the index.
+            logger.exception("Could not build the %s suggestions", name)
+
+
+def warm_caches():
+    """
+    Render the most requested pages into the cache the workers will use.
+
+    A failed warm-up is logged and leaves the caches to the first visitors.
+    """
+    from news.warmup import feed_urls, find_user, page_urls, warm
+
+    try:
+        urls = feed_urls()
+        user = find_user()
+        if user is not None:
+            urls += page_urls()
+        failed, elapsed = warm(urls, user=user)
+    except Exception:
+        logger.exception("Could not warm the caches")
+        return
+    for url, status in failed:
+        logger.warning("Warm-up got %s from %s", status, url)
+    logger.info(
+        "Warmed %s of %s pages in %.2fs", len(urls) - len(failed), len(urls), elapsed
+    )
+
+
+def release_connections():
+    """Close the connections opened so far, which forked workers must not share."""
+    connections.close_all()
+    for cache in caches.all(initialized_only=True):
+        cache.close()
+
+
+def flush_buffers():
+    """Write what the exiting process still holds in memory."""
+    view_counter.flush()
+    journal.flush()
@@ -0,0 +1,77 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, DateField
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from news.counters import apply_increments
+from news.models import Newspaper, NewspaperStat
+
+STAT_KEY_FIELDS = ("topic_id", "redactor_id", "month")
+
+
+def month_of(moment):
+    return timezone.localtime(moment).date().replace(day=1)
+
+
+def contribution(topic_id, published_date, redactor_ids=()):
+    """Return the stat keys a newspaper adds one to."""
+    month = month_of(published_date)
+    keys = {(topic_id, None, month)}
+    keys.update((topic_id, redactor_id, month) for redactor_id in redactor_ids)
+    return keys
+
+
+def apply_change(removed=(), added=()):
+    """Subtract one from every key in ``removed`` and add one to ``added``."""
+    deltas = Counter(added)
+    deltas.subtract(removed)
+    if any(deltas.values()):
+        apply_increments(NewspaperStat, STAT_KEY_FIELDS, "newspapers", deltas)
+
+
+def newspaper_months(newspaper_ids):
+    """Map newspaper ids to ``(topic_id, published_date)``."""
+    return {
+        pk: (topic_id, published_date)
+        for pk, topic_id, published_date in Newspaper._base_manager.filter(
+            pk__in=newspaper_ids, deleted_at=None
+        ).values_list("pk", "topic_id", "published_date")
+    }
+
+
+def rebuild():
+    """Recompute every statistic from the newspapers and their publishers."""
+    month = TruncMonth("published_date", output_field=DateField())
+    topic_rows = (
+        Newspaper._base_manager.filter(deleted_at=None)
+        .annotate(month=month)
+        .values("topic_id", "month")
+        .annotate(newspapers=Count("pk"))
+        .order_by()
+    )
+    through = Newspaper.publishers.through
+    redactor_rows = (
+        through.objects.filter(newspaper__deleted_at=None)
+        .annotate(
+            month=TruncMonth("newspaper__published_date", output_field=DateField())
+        )
+        .values("newspaper__topic_id", "redactor_id", "month")
+        .annotate(newspapers=Count("pk"))
+        .order_by()
+    )
+
+    stats = [NewspaperStat(**row) for row in topic_rows] + [
+        NewspaperStat(
+            topic_id=row["newspaper__topic_id"],
+            redactor_id=row["redactor_id"],
+            month=row["month"],
+            newspapers=row["newspapers"],
+        )
+        for row in redactor_rows
+    ]
+    with transaction.atomic():
+        NewspaperStat.objects.all().delete()
+        NewspaperStat.objects.bulk_create(stats, batch_size=1000)
+    return len(stats)
@@ -0,0 +1,157 @@
+"""
+In-process prefix indexes behind the search box suggestions.
+
+Each index keeps the values of one model field in a sorted list, so a
+completion is a binary search plus a short scan and never touches the
+database. Indexes are built at start-up (see ``news.startup``) or on first
+use, one build at a time per index, updated by the news signals after
+a change commits, and rebuilt in the background every
+``SUGGEST_INDEX_REFRESH`` seconds to pick up changes made by other processes.
+"""
+
+import logging
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+
+from news.models import Newspaper, Topic
+
+logger = logging.getLogger(__name__)
+
+
+def suggestion_key(value):
+    return " ".join(unicodedata.normalize("NFKC", value).split()).casefold()
+
+
+class PrefixIndex:
+    """Sorted ``(key, label, pk)`` entries of one field of a model."""
+
+    def __init__(self, model, field, condition=None):
+        self.model = model
+        self.field = field
+        self.condition = condition
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._entries = None
+        self._labels = {}
+        self._built_at = None
+        self._journal = None
+
+    def _load(self):
+        entries, labels = [], {}
+        queryset = self.model._default_manager.all()
+        if self.condition is not None:
+            queryset = queryset.filter(self.condition)
+        rows = (
+            queryset.values_list("pk", self.field)
+            .order_by()
+            .iterator(chunk_size=10000)
+        )
+        for pk, label in rows:
+            entries.append((suggestion_key(label), label, pk))
+            labels[pk] = label
+        entries.sort()
+        return entries, labels
+
+    def build(self):
+        """Load every value from the database and swap the index in."""
+        with self._build_lock:
+            self._build()
+
+    def ensure_built(self):
+        """Build the index unless it is, waiting for a build under way."""
+        if self._entries is not None:
+            return
+        with self._build_lock:
+            if self._entries is None:
+                self._build()
+
+    def _build(self):
+        with self._lock:
+            self._journal = []
+        try:
+            entries, labels = self._load()
+        except Exception:
+            with self._lock:
+                self._journal = None
+            raise
+        with self._lock:
+            journal, self._journal = self._journal, None
+            self._entries, self._labels = entries, labels
+            # Changes committed while the rows were being read.
+            for pk, label in journal:
+                self._apply(pk, label)
+            self._built_at = time.monotonic()
+
+    def _refresh(self):
+        try:
+            self.build()
+        except Exception:
+            logger.exception("Could not rebuild the %s suggestions", self.field)
+
+    def _apply(self, pk, label):
+        old = self._labels.pop(pk, None)
+        if old is not None:
+            position = bisect_left(self._entries, (suggestion_key(old), old, pk))
+            if position < len(self._entries) and self._entries[position][2] == pk:
+                del self._entries[position]
+        if label is not None:
+            self._labels[pk] = label
+            insort(self._entries, (suggestion_key(label), label, pk))
+
+    def update(self, pk, label=None):
+        """Index ``label`` for ``pk``, or drop ``pk`` when ``label`` is None."""
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append((pk, label))
+            if self._entries is not None:
+                self._apply(pk, label)
+
+    def suggest(self, prefix, limit=None):
+        """Return up to ``limit`` labels starting with ``prefix``."""
+        limit = limit or settings.SUGGEST_LIMIT
+        key = suggestion_key(prefix)
+        if not key:
+            return []
+
+        if self._entries is None:
+            self.ensure_built()
+        elif (
+            time.monotonic() - self._built_at >= settings.SUGGEST_INDEX_REFRESH
+            and self._journal is None
+        ):
+            self._built_at = time.monotonic()
+            threading.Thread(target=self._refresh, daemon=True).start()
+
+        suggestions = []
+        with self._lock:
+            entries = self._entries
+            position = bisect_left(entries, (key,))
+            while len(suggestions) < limit and position < len(entries):
+                entry_key, label, pk = entries[position]
+                if not entry_key.startswith(key):
+                    break
+                if not suggestions or suggestions[-1] != label:
+                    suggestions.append(label)
+                position += 1
+        return suggestions
+
+    def clear(self):
+        with self._lock:
+            self._entries = None
+            self._labels = {}
+            self._built_at = None
+
+
+indexes = {
+    "topics": PrefixIndex(Topic, "name"),
+    "newspapers": PrefixIndex(
+        Newspaper, "title", Q(status=Newspaper.Status.PUBLISHED)
+    ),
+    "redactors": PrefixIndex(get_user_model(), "username"),
+}
@@ -0,0 +1,9 @@
+from django.core.management import call_command
+
+from news.jobs import task
+
+
+@task("news.call_command")
+def run_management_command(command, args=(), options=None):
+    """Run a management command, e.g. a reindex or a bulk cleanup."""
+    call_command(command, *args, **(options or {}))
@@ -0,0 +1,146 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from news import trash
+from news.audit import journal
+from news.models import AuditEvent, Newspaper, Topic
+
+
+@override_settings(AUDIT_FLUSH_INTERVAL=3600, AUDIT_MAX_PENDING=100)
+class AuditJournalTests(TestCase):
+    def setUp(self) -> None:
+        """Set up common test data."""
+        journal.clear()
+        self.redactor = get_user_model().objects.create_user(
+            username="test_user",
+            password="test_password",
+        )
+        self.client.force_login(self.redactor)
+        self.topic = Topic.objects.create(name="Politics")
+        self.newspaper = Newspaper.objects.create(
+            title="Election results", content="Content", topic=self.topic
+        )
+
+    def test_events_are_queued_until_flush(self) -> None:
+        """Test that requests only queue their events and a flush writes them."""
+        url = reverse("news:toggle-newspaper-assign", args=[self.newspaper.pk])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.get(url)
+            self.client.get(url)
+
+        self.assertFalse(AuditEvent.objects.exists())
+        with self.assertNumQueries(1):
+            journal.flush()
+        self.assertEqual(
+            list(
+                AuditEvent.objects.filter(newspaper_id=self.newspaper.pk)
+                .order_by("created_at")
+                .values_list("action", "redactor")
+            ),
+            [
+                (AuditEvent.Action.ASSIGNED, self.redactor.pk),
+                (AuditEvent.Action.UNASSIGNED, self.redactor.pk),
+            ],
+        )
+
+    def test_crud_views_are_journaled(self) -> None:
+        """Test that creating, updating and deleting a newspaper are recorded."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("news:newspaper-create"),
+                {
+                    "title": "Budget",
+                    "content": "Content",
+                    "topic": self.topic.pk,
+                    "publishers": [self.redactor.pk],
+                },
+            )
+            newspaper = Newspaper.objects.get(title="Budget")
+            self.client.post(
+                reverse("news:newspaper-update", args=[newspaper.pk]),
+                {
+                    "title": "Budget leak",
+                    "content": "Content",
+                    "topic": self.topic.pk,
+                    "publishers": [self.redactor.pk],
+                },
+            )
+            self.client.post(reverse("news:newspaper-delete", args=[newspaper.pk]))
+        journal.flush()
+
+        events = AuditEvent.objects.filter(redactor=self.redactor).order_by(
+            "created_at"
+        )
+        self.assertEqual(
+            [(event.action, event.newspaper_title) for event in events],
+            [
+                (AuditEvent.Action.CREATED, "Budget"),
+                (AuditEvent.Action.UPDATED, "Budget leak"),
+                (AuditEvent.Action.DELETED, "Budget leak"),
+            ],
+        )
+        self.assertEqual(events[1].details, {"fields": ["title"]})
+
+    def test_topic_trash_and_restores_are_journaled(self) -> None:
+        """Test that newspapers moved with their topic or restored are recorded."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("news:topic-delete", args=[self.topic.pk]))
+            topic = Topic.all_objects.get(pk=self.topic.pk)
+            trash.restore_topic(topic, actor=self.redactor)
+        journal.flush()
+
+        self.assertEqual(
+            list(
+                AuditEvent.objects.order_by("created_at").values_list(
+                    "action", "newspaper_id", "redactor"
+                )
+            ),
+            [
+                (AuditEvent.Action.DELETED, self.newspaper.pk, self.redactor.pk),
+                (AuditEvent.Action.RESTORED, self.newspaper.pk, self.redactor.pk),
+            ],
+        )
+
+    @override_settings(AUDIT_MAX_QUEUED=2)
+    def test_unwritable_events_are_capped(self) -> None:
+        """Test that failed writes keep only the newest events and log the rest."""
+        with self.captureOnCommitCallbacks(execute=True):
+            for action in (
+                AuditEvent.Action.CREATED,
+                AuditEvent.Action.ASSIGNED,
+                AuditEvent.Action.UNASSIGNED,
+            ):
+                journal.record(action, self.newspaper, self.redactor)
+
+        with mock.patch.object(
+            AuditEvent.objects, "bulk_create", side_effect=RuntimeError
+        ):
+            with self.assertLogs("news.audit", "ERROR") as logs:
+                journal.flush()
+        journal.flush()
+
+        self.assertIn("Dropped audit event: created", logs.output[-1])
+        self.assertEqual(
+            set(AuditEvent.objects.values_list("action", flat=True)),
+            {AuditEvent.Action.ASSIGNED, AuditEvent.Action.UNASSIGNED},
+        )
+
+    @override_settings(AUDIT_MAX_PENDING=2)
+    def test_full_queue_is_written_at_once(self) -> None:
+        """Test that reaching AUDIT_MAX_PENDING writes the queue without waiting."""
+        with self.captureOnCommitCallbacks(execute=True):
+            for action in (AuditEvent.Action.ASSIGNED, AuditEvent.Action.UNASSIGNED):
+                journal.record(action, self.newspaper, self.redactor)
+
+        self.assertEqual(AuditEvent.objects.count(), 2)
+
+    def test_events_of_rolled_back_changes_are_dropped(self) -> None:
+        """Test that nothing is queued when the change does not commit."""
+        with self.captureOnCommitCallbacks(execute=False):
+            journal.record(AuditEvent.Action.UPDATED, self.newspaper, self.redactor)
+        journal.flush()
+
+        self.assertFalse(AuditEvent.objects.exists())
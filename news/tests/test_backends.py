@@ -0,0 +1,108 @@
+from unittest import mock
+
+from django.contrib.auth import BACKEND_SESSION_KEY, authenticate, get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from news.backends import CachedModelBackend, user_cache_key
+
+MOST_READ_URL = reverse("news:most-read")
+
+
+class CachedModelBackendTests(TestCase):
+    def setUp(self) -> None:
+        """Set up common test data."""
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="test_user",
+            password="test_password",
+            years_of_experience=5,
+        )
+        self.backend = CachedModelBackend()
+
+    def test_get_user_is_served_from_cache(self) -> None:
+        """Test that the second lookup of a user needs no query."""
+        self.backend.get_user(self.user.pk)
+
+        with self.assertNumQueries(0):
+            user = self.backend.get_user(self.user.pk)
+
+        self.assertEqual(user, self.user)
+        self.assertEqual(user.years_of_experience, 5)
+        self.assertTrue(user.check_password("test_password"))
+
+    def test_save_invalidates_snapshot(self) -> None:
+        """Test that changing the user drops the cached snapshot."""
+        self.backend.get_user(self.user.pk)
+
+        self.user.set_password("new_password")
+        self.user.save()
+
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+        self.assertTrue(
+            self.backend.get_user(self.user.pk).check_password("new_password")
+        )
+
+    def test_inactive_user_is_rejected(self) -> None:
+        """Test that cached snapshots still respect is_active."""
+        self.backend.get_user(self.user.pk)
+        get_user_model().objects.filter(pk=self.user.pk).update(is_active=False)
+        self.user.is_active = False
+        cache.set(
+            user_cache_key(self.user.pk),
+            tuple(
+                getattr(self.user, field.attname)
+                for field in get_user_model()._meta.concrete_fields
+            ),
+        )
+
+        self.assertIsNone(self.backend.get_user(self.user.pk))
+
+    def test_authenticated_page_view_without_identity_queries(self) -> None:
+        """Test that session and user lookups do not hit the database."""
+        self.client.login(username="test_user", password="test_password")
+        self.client.get(MOST_READ_URL)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(MOST_READ_URL)
+
+        self.assertEqual(response.context["user"], self.user)
+
+    def test_sessions_of_the_previous_backend_stay_logged_in(self) -> None:
+        """Test that sessions saved with ModelBackend still authenticate."""
+        self.client.force_login(
+            self.user, backend="django.contrib.auth.backends.ModelBackend"
+        )
+        self.assertEqual(
+            self.client.session[BACKEND_SESSION_KEY],
+            "django.contrib.auth.backends.ModelBackend",
+        )
+
+        response = self.client.get(MOST_READ_URL)
+
+        self.assertEqual(response.context["user"], self.user)
+        self.assertEqual(
+            self.client.session[BACKEND_SESSION_KEY],
+            "news.backends.CachedModelBackend",
+        )
+
+    def test_failed_login_is_checked_once(self) -> None:
+        """Test that a wrong password goes through a single backend."""
+        with mock.patch.object(
+            ModelBackend, "authenticate", autospec=True, return_value=None
+        ) as backend_authenticate:
+            user = authenticate(username="test_user", password="wrong_password")
+
+        self.assertIsNone(user)
+        self.assertEqual(backend_authenticate.call_count, 1)
+
+    def test_logout_invalidates_snapshot(self) -> None:
+        """Test that logging out drops the cached snapshot."""
+        self.client.login(username="test_user", password="test_password")
+        self.client.get(MOST_READ_URL)
+
+        self.client.post(reverse("logout"))
+
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
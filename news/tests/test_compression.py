@@ -0,0 +1,110 @@
+import gzip
+
+import brotli
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from news.compression import is_compressible, negotiate
+from news.models import Newspaper, Topic
+
+DECOMPRESS = {"br": brotli.decompress, "gzip": gzip.decompress}
+
+
+class NegotiationTests(SimpleTestCase):
+    def test_preferred_encoding_is_chosen(self) -> None:
+        """Test that q-values and the server's preference pick the encoding."""
+        self.assertEqual(negotiate("gzip, deflate, br"), "br")
+        self.assertEqual(negotiate("br;q=0.5, gzip"), "gzip")
+        self.assertEqual(negotiate("*"), "br")
+        self.assertEqual(negotiate("gzip;q=0, *;q=0.1"), "br")
+        self.assertIsNone(negotiate("identity"))
+        self.assertIsNone(negotiate("br;q=0, gzip;q=0"))
+        self.assertIsNone(negotiate(""))
+
+    def test_only_text_is_compressible(self) -> None:
+        """Test that images and event streams are left alone."""
+        self.assertTrue(is_compressible(HttpResponse(content_type="text/csv")))
+        self.assertTrue(
+            is_compressible(HttpResponse(content_type="application/rss+xml"))
+        )
+        self.assertFalse(is_compressible(HttpResponse(content_type="image/png")))
+        self.assertFalse(
+            is_compressible(HttpResponse(content_type="text/event-stream"))
+        )
+
+
+class CompressionMiddlewareTests(TestCase):
+    def setUp(self) -> None:
+        """Set up common test data."""
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="test_user", password="test_password"
+        )
+        topic = Topic.objects.create(name="Politics")
+        for number in range(20):
+            Newspaper.objects.create(
+                title=f"Election {number}", content="Content " * 50, topic=topic
+            )
+
+    def test_responses_are_compressed_as_negotiated(self) -> None:
+        """Test that a page decodes to the uncompressed one in both encodings."""
+        url = reverse("news:feed", args=["rss"])
+        plain = self.client.get(url)
+
+        for encoding, decompress in DECOMPRESS.items():
+            with self.subTest(encoding=encoding):
+                response = self.client.get(url, headers={"Accept-Encoding": encoding})
+
+                self.assertEqual(response["Content-Encoding"], encoding)
+                self.assertIn("Accept-Encoding", response["Vary"])
+                self.assertLess(len(response.content), len(plain.content))
+                self.assertEqual(int(response["Content-Length"]), len(response.content))
+                self.assertEqual(decompress(response.content), plain.content)
+
+    def test_compressed_feeds_are_revalidated(self) -> None:
+        """Test that the ETag of a compressed feed still earns a 304."""
+        url = reverse("news:feed", args=["rss"])
+        response = self.client.get(url, headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+        response = self.client.get(
+            url,
+            headers={"Accept-Encoding": "gzip", "If-None-Match": response["ETag"]},
+        )
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_streaming_responses_are_compressed(self) -> None:
+        """Test that an export is compressed without being buffered."""
+        self.client.force_login(self.user)
+        url = reverse("news:newspaper-list") + "?export=csv"
+        plain = b"".join(self.client.get(url).streaming_content)
+
+        response = self.client.get(url, headers={"Accept-Encoding": "br"})
+
+        self.assertTrue(response.streaming)
+        self.assertFalse(response.has_header("Content-Length"))
+        self.assertEqual(brotli.decompress(b"".join(response.streaming_content)), plain)
+
+    def test_small_responses_are_not_compressed(self) -> None:
+        """Test that tiny responses go out as they are."""
+        response = self.client.get(
+            reverse("news:healthz"), headers={"Accept-Encoding": "br"}
+        )
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_pages_with_csrf_tokens_are_padded(self) -> None:
+        """Test that pages with a CSRF token end with random-length padding."""
+        self.client.force_login(self.user)
+        url = reverse("news:newspaper-create")
+
+        response = self.client.get(url, headers={"Accept-Encoding": "gzip"})
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        content = gzip.decompress(response.content)
+        self.assertIn(b"csrfmiddlewaretoken", content)
+        self.assertTrue(content.rstrip().endswith(b"-->"))
@@ -0,0 +1,104 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from news.duplicates import find_near_duplicates
+from news.forms import NewspaperForm
+from news.models import Newspaper, NewspaperFingerprint, Topic
+
+STORY = (
+    "The city council approved the new budget on Tuesday after a long debate "
+    "about public transport funding, school repairs and the renovation of the "
+    "central library. Opposition members argued that the plan relies on "
+    "optimistic tax forecasts, while the mayor said the spending is necessary "
+    "to keep services running through the winter."
+)
+RESUBMITTED = STORY.replace("Tuesday", "Wednesday").replace("long", "lengthy")
+OTHER_STORY = (
+    "Local football club wins the regional championship after a dramatic "
+    "penalty shootout in front of a record crowd at the stadium, with the "
+    "goalkeeper saving two kicks and the captain scoring the decisive goal "
+    "late in the evening."
+)
+
+
+class NearDuplicateTests(TestCase):
+    def setUp(self) -> None:
+        """Set up common test data."""
+        self.topic = Topic.objects.create(name="Politics")
+        self.newspaper = Newspaper.objects.create(
+            title="Council approves budget", content=STORY, topic=self.topic
+        )
+
+    def form_data(self, **overrides):
+        data = {
+            "title": "Budget approved",
+            "content": RESUBMITTED,
+            "topic": self.topic.id,
+        }
+        data.update(overrides)
+        return data
+
+    def test_fingerprint_follows_the_text(self) -> None:
+        """Test that fingerprints are stored on save and dropped for short texts."""
+        self.assertTrue(
+            NewspaperFingerprint.objects.filter(newspaper=self.newspaper).exists()
+        )
+
+        self.newspaper.content = "Too short to compare"
+        self.newspaper.save()
+
+        self.assertFalse(
+            NewspaperFingerprint.objects.filter(newspaper=self.newspaper).exists()
+        )
+        self.assertFalse(self.newspaper.fingerprint_buckets.exists())
+
+    def test_near_duplicates_are_found(self) -> None:
+        """Test that a lightly edited text matches and an unrelated one does not."""
+        self.assertEqual(
+            find_near_duplicates("Budget approved", RESUBMITTED), [self.newspaper]
+        )
+        self.assertEqual(find_near_duplicates("Club wins", OTHER_STORY), [])
+        self.assertEqual(
+            find_near_duplicates(
+                "Budget approved", RESUBMITTED, exclude=self.newspaper.pk
+            ),
+            [],
+        )
+
+    def test_form_rejects_near_duplicates_unless_allowed(self) -> None:
+        """Test that the form warns about a duplicate until it is confirmed."""
+        form = NewspaperForm(data=self.form_data())
+
+        self.assertFalse(form.is_valid())
+        self.assertIn("Council approves budget", form.non_field_errors()[0])
+
+        form = NewspaperForm(data=self.form_data(allow_duplicate=True))
+        self.assertTrue(form.is_valid())
+
+    def test_form_does_not_match_the_edited_newspaper(self) -> None:
+        """Test that updating a newspaper does not flag it as its own duplicate."""
+        form = NewspaperForm(
+            instance=self.newspaper, data=self.form_data(title="Budget approved")
+        )
+
+        self.assertTrue(form.is_valid())
+
+    def test_find_duplicates_reports_clusters(self) -> None:
+        """Test that the archive scan groups near-duplicates into clusters."""
+        copy = Newspaper.objects.create(
+            title="Budget approved", content=RESUBMITTED, topic=self.topic
+        )
+        Newspaper.objects.create(
+            title="Club wins", content=OTHER_STORY, topic=self.topic
+        )
+        out = StringIO()
+
+        call_command("find_duplicates", "--workers=2", stdout=out)
+
+        output = out.getvalue()
+        self.assertIn("2 near-duplicates:", output)
+        self.assertIn(f"#{copy.pk} Budget approved", output)
+        self.assertNotIn("Club wins", output)
+        self.assertIn("Found 1 clusters among 3 fingerprinted", output)
@@ -0,0 +1,105 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from news.events import hub, newspaper_event
+from news.models import Newspaper, Topic
+
+EVENTS_URL = reverse("news:newspaper-events")
+
+
+class NewspaperEventTests(TestCase):
+    def setUp(self) -> None:
+        """Set up common test data."""
+        self.redactor = get_user_model().objects.create_user(
+            username="test_user",
+            password="test_password",
+        )
+        self.topic = Topic.objects.create(name="Politics")
+        self.newspaper = Newspaper.objects.create(
+            title="Election results", content="Test Content", topic=self.topic
+        )
+        self.event = newspaper_event(self.newspaper, self.topic.name)
+
+    async def test_publish_fans_out_from_any_thread(self) -> None:
+        """Test that one publish reaches every subscriber exactly once."""
+        first, second = hub.subscribe(), hub.subscribe()
+        try:
+            await asyncio.to_thread(hub.publish, self.event)
+            await asyncio.to_thread(hub.publish, self.event)
+
+            self.assertEqual(await asyncio.wait_for(first.get(), 1), self.event)
+            self.assertEqual(await asyncio.wait_for(second.get(), 1), self.event)
+            await asyncio.sleep(0)
+            self.assertTrue(first.empty())
+        finally:
+            hub.unsubscribe(first)
+            hub.unsubscribe(second)
+        self.assertEqual(hub.subscriber_count(), 0)
+
+    @override_settings(SSE_QUEUE_SIZE=1)
+    async def test_slow_subscriber_drops_events(self) -> None:
+        """Test that a full queue drops new events instead of growing."""
+        queue = hub.subscribe()
+        try:
+            for updated_at in ("first", "second"):
+                hub.publish({**self.event, "updated_at": updated_at})
+            await asyncio.sleep(0)
+
+            self.assertEqual(queue.qsize(), 1)
+            self.assertEqual((await queue.get())["updated_at"], "first")
+        finally:
+            hub.unsubscribe(queue)
+
+    async def test_saves_are_published_on_commit(self) -> None:
+        """Test that saving a newspaper notifies subscribers after commit."""
+        queue = hub.subscribe()
+
+        def update():
+            with self.captureOnCommitCallbacks(execute=True):
+                self.newspaper.title = "Final election results"
+                self.newspaper.save()
+
+        try:
+            await sync_to_async(update)()
+            event = await asyncio.wait_for(queue.get(), 1)
+        finally:
+            hub.unsubscribe(queue)
+        self.assertEqual(event["title"], "Final election results")
+        self.assertEqual(event["topic"], "Politics")
+
+    async def test_stream_sends_published_events(self) -> None:
+        """Test that the endpoint streams events to an ASGI client."""
+        await self.async_client.aforce_login(self.redactor)
+        response = await self.async_client.get(EVENTS_URL)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+
+        content = aiter(response.streaming_content)
+        self.assertTrue((await anext(content)).startswith(b"retry: "))
+        hub.publish(self.event)
+        chunk = await asyncio.wait_for(anext(content), 1)
+        await content.aclose()
+
+        self.assertIn(b"event: newspaper\ndata: {", chunk)
+        self.assertIn(b'"title": "Election results"', chunk)
+
+    def test_poll_reads_changes_of_other_processes(self) -> None:
+        """Test that the poller finds newspapers updated since its last look."""
+        since = self.newspaper.updated_at
+        Newspaper.objects.filter(pk=self.newspaper.pk).update(title="Recount")
+
+        with self.settings(SSE_POLL_OVERLAP=0):
+            events, next_since = hub._changes(since)
+
+        self.assertEqual([event["title"] for event in events], ["Recount"])
+        self.assertGreater(next_since, since)
+
+    def test_stream_requires_login_and_asgi(self) -> None:
+        """Test that anonymous users get 401 and WSGI requests get 204."""
+        self.assertEqual(self.client.get(EVENTS_URL).status_code, 401)
+
+        self.client.force_login(self.redactor)
+        self.assertEqual(self.client.get(EVENTS_URL).status_code, 204)
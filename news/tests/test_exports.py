@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+import warnings
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from news.models import Newspaper, Topic
+
+NEWSPAPER_LIST_URL = reverse("news:newspaper-list")
+
+
+class ListExportTests(TestCase):
+    def setUp(self) -> None:
+        """Set up common test data."""
+        self.user = get_user_model().objects.create_user(
+            username="test_user",
+            password="test_password",
+        )
+        self.client.force_login(self.user)
+        self.topic = Topic.objects.create(name="Economy")
+        for title in ("Budget approved", "Budget delayed", "Markets rally"):
+            Newspaper.objects.create(title=title, content="Content", topic=self.topic)
+
+    def test_export_requires_login(self) -> None:
+        """Test that anonymous users cannot export."""
+        self.client.logout()
+        response = self.client.get(NEWSPAPER_LIST_URL + "?export=csv")
+        self.assertNotEqual(response.status_code, 200)
+
+    def test_csv_export_streams_filtered_rows(self) -> None:
+        """Test that the CSV export honours the search form and skips paging."""
+        response = self.client.get(NEWSPAPER_LIST_URL + "?title=Budget&export=csv")
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn("newspapers.csv", response["Content-Disposition"])
+        rows = list(
+            csv.reader(io.StringIO(b"".join(response.streaming_content).decode()))
+        )
+        self.assertEqual(
+            rows[0], ["id", "title", "topic__name", "published_date", "content"]
+        )
+        self.assertEqual(
+            sorted(row[1] for row in rows[1:]), ["Budget approved", "Budget delayed"]
+        )
+
+    async def test_asgi_export_streams_asynchronously(self) -> None:
+        """Test that ASGI gets an async stream it need not read into a list."""
+        await self.async_client.aforce_login(self.user)
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            response = await self.async_client.get(NEWSPAPER_LIST_URL + "?export=csv")
+            content = b"".join([chunk async for chunk in response.streaming_content])
+
+        self.assertTrue(response.is_async)
+        messages = [str(warning.message) for warning in caught]
+        self.assertFalse(
+            [message for message in messages if "StreamingHttpResponse" in message]
+        )
+        self.assertEqual(len(content.decode().splitlines()), 4)
+
+    def test_jsonl_export(self) -> None:
+        """Test that the JSON Lines export writes one object per row."""
+        response = self.client.get(reverse("news:topic-list") + "?export=jsonl")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(
+            [json.loads(line) for line in lines],
+            [{"id": self.topic.id, "name": "Economy"}],
+        )
+
+    def test_unknown_export_format_renders_list(self) -> None:
+        """Test that an unsupported format falls back to the HTML list."""
+        response = self.client.get(NEWSPAPER_LIST_URL + "?export=xlsx")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "news/newspaper_list.html")
@@ -0,0 +1,132 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from news.models import Newspaper, Topic
+
+FEED_URL = reverse("news:feed", args=["rss"])
+
+
+class FeedViewsTests(TestCase):
+    def setUp(self) -> None:
+        """Set up common test data."""
+        cache.clear()
+        self.redactor = get_user_model().objects.create_user(
+            username="test_user",
+            password="test_password",
+        )
+        self.topic = Topic.objects.create(name="Politics")
+        self.newspaper = Newspaper.objects.create(
+            title="Election results", content="Test Content", topic=self.topic
+        )
+        self.newspaper.publishers.add(self.redactor)
+
+    def test_feeds_are_public(self) -> None:
+        """Test that every feed is served to anonymous users in every format."""
+        urls = [
+            reverse("news:feed", args=[feed_format])
+            for feed_format in ("rss", "atom", "json")
+        ] + [
+            reverse("news:topic-feed", args=[self.topic.id, "atom"]),
+            reverse("news:redactor-feed", args=[self.redactor.id, "rss"]),
+        ]
+
+        for url in urls:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertContains(response, "Election results")
+
+    def test_json_feed_document(self) -> None:
+        """Test that the JSON feed follows the JSON Feed format."""
+        response = self.client.get(reverse("news:feed", args=["json"]))
+        data = json.loads(response.content)
+
+        self.assertEqual(
+            response["Content-Type"], "application/feed+json; charset=utf-8"
+        )
+        self.assertEqual(data["items"][0]["title"], "Election results")
+        self.assertEqual(data["items"][0]["tags"], ["Politics"])
+
+    def test_unknown_format_returns_404(self) -> None:
+        """Test that unsupported feed formats are rejected."""
+        response = self.client.get(reverse("news:feed", args=["xml"]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_matching_etag_returns_not_modified(self) -> None:
+        """Test that pollers with a current ETag get a 304 without queries."""
+        etag = self.client.get(FEED_URL)["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(FEED_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_missing_scope_returns_404_despite_matching_etag(self) -> None:
+        """Test that the feed of a deleted topic is gone rather than not modified."""
+        url = reverse("news:topic-feed", args=[self.topic.id, "rss"])
+        etag = self.client.get(url)["ETag"]
+        Topic.all_objects.filter(pk=self.topic.pk).delete()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 404)
+
+    def test_items_carry_the_rendered_html(self) -> None:
+        """Test that items are described by the sanitized HTML, not the Markdown."""
+        self.newspaper.content = "Some **bold** text"
+        self.newspaper.save()
+
+        data = json.loads(self.client.get(reverse("news:feed", args=["json"])).content)
+        self.assertIn("<strong>bold</strong>", data["items"][0]["content_html"])
+
+    def test_cached_feed_is_served_without_queries(self) -> None:
+        """Test that the rendered feed body is reused until the scope changes."""
+        self.client.get(FEED_URL)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(FEED_URL)
+
+        self.assertContains(response, "Election results")
+
+    def test_newspaper_change_regenerates_scoped_feeds(self) -> None:
+        """Test that saving a newspaper invalidates the feeds it appears in."""
+        topic_url = reverse("news:topic-feed", args=[self.topic.id, "rss"])
+        redactor_url = reverse("news:redactor-feed", args=[self.redactor.id, "rss"])
+        etags = {
+            url: self.client.get(url)["ETag"]
+            for url in (FEED_URL, topic_url, redactor_url)
+        }
+
+        self.newspaper.title = "Final election results"
+        self.newspaper.save()
+
+        for url, etag in etags.items():
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertContains(response, "Final election results")
+
+    def test_unrelated_scope_is_not_invalidated(self) -> None:
+        """Test that a change in another topic keeps the topic feed cached."""
+        topic_url = reverse("news:topic-feed", args=[self.topic.id, "rss"])
+        etag = self.client.get(topic_url)["ETag"]
+
+        Newspaper.objects.create(
+            title="Match report",
+            content="Content",
+            topic=Topic.objects.create(name="Sport"),
+        )
+
+        response = self.client.get(topic_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_unassigning_publisher_invalidates_redactor_feed(self) -> None:
+        """Test that publisher changes regenerate the redactor's feed."""
+        url = reverse("news:redactor-feed", args=[self.redactor.id, "rss"])
+        self.client.get(url)
+
+        self.redactor.newspapers.remove(self.newspaper)
+
+        response = self.client.get(url)
+        self.assertNotContains(response, "Election results")
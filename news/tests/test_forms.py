@@ -1,4 +1,9 @@
+import re
+
+from django.db import connection
+from django.db.models.signals import m2m_changed
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
 
 from news.forms import (
@@ -8,7 +13,7 @@ from news.forms import (
     RedactorSearchForm,
     TopicSearchForm,
 )
-from news.models import Topic
+from news.models import Newspaper, Topic
 
 
 class NewspaperFormTests(TestCase):
@@ -83,6 +88,99 @@ class NewspaperFormTests(TestCase):
         form = NewspaperForm(data=form_data)
         self.assertTrue(form.is_valid())
 
+    def test_newspaper_form_saves_publishers_as_diff(self):
+        """
+        Test that saving publishers reads the links once and writes only
+        the difference with one delete and one bulk insert.
+        """
+        kept, removed, added = [
+            get_user_model().objects.create_user(
+                username=f"publisher_{number}", password="test_password"
+            )
+            for number in range(3)
+        ]
+        newspaper = Newspaper.objects.create(
+            title="Test Newspaper", content="Test Content", topic=self.topic
+        )
+        newspaper.publishers.add(kept, removed)
+        form = NewspaperForm(
+            instance=newspaper,
+            data={
+                "title": "Test Newspaper",
+                "content": "Test Content",
+                "topic": self.topic.id,
+                "publishers": [kept.id, added.id],
+            },
+        )
+        self.assertTrue(form.is_valid())
+
+        with CaptureQueriesContext(connection) as context:
+            form.save()
+
+        link_queries = [
+            query["sql"].split()[0]
+            for query in context.captured_queries
+            if re.search(r'(FROM|INTO) "news_newspaper_publishers"', query["sql"])
+        ]
+        self.assertEqual(sorted(link_queries), ["DELETE", "INSERT", "SELECT"])
+        self.assertEqual(set(newspaper.publishers.all()), {kept, added})
+
+    def test_newspaper_form_sends_one_signal_per_direction(self):
+        """Test that publisher changes are announced in batches."""
+        publishers = [
+            get_user_model().objects.create_user(
+                username=f"publisher_{number}", password="test_password"
+            )
+            for number in range(3)
+        ]
+        actions = []
+
+        def receiver(action, pk_set, **kwargs):
+            actions.append((action, pk_set))
+
+        m2m_changed.connect(receiver, sender=Newspaper.publishers.through)
+        self.addCleanup(
+            m2m_changed.disconnect, receiver, sender=Newspaper.publishers.through
+        )
+        form = NewspaperForm(
+            data={
+                "title": "Test Newspaper",
+                "content": "Test Content",
+                "topic": self.topic.id,
+                "publishers": [publisher.id for publisher in publishers],
+            }
+        )
+        self.assertTrue(form.is_valid())
+        form.save()
+
+        pk_set = {publisher.id for publisher in publishers}
+        self.assertEqual(actions, [("pre_add", pk_set), ("post_add", pk_set)])
+
+    def test_newspaper_form_saves_publishers_with_save_m2m(self):
+        """Test that publishers wait for save_m2m when saving without commit."""
+        newspaper = Newspaper.objects.create(
+            title="Test Newspaper", content="Test Content", topic=self.topic
+        )
+        newspaper.publishers.add(self.user)
+        form = NewspaperForm(instance=newspaper)
+        self.assertEqual(form.initial["publishers"], [self.user.id])
+
+        form = NewspaperForm(
+            instance=newspaper,
+            data={
+                "title": "Test Newspaper",
+                "content": "Test Content",
+                "topic": self.topic.id,
+                "publishers": [],
+            },
+        )
+        self.assertTrue(form.is_valid())
+        form.save(commit=False).save()
+        self.assertEqual(list(newspaper.publishers.all()), [self.user])
+
+        form.save_m2m()
+        self.assertFalse(newspaper.publishers.exists())
+
 
 class RedactorCreationFormTests(TestCase):
     def test_redactor_creation_form_valid_data(self):
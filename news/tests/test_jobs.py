@@ -0,0 +1,141 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from news import jobs
+from news.models import Job
+
+
+class JobQueueTests(TestCase):
+    def setUp(self) -> None:
+        """Register a task recording its calls."""
+        self.calls = []
+        patcher = mock.patch.dict(jobs._tasks)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        @jobs.task("test.record")
+        def record(value, fail=False):
+            self.calls.append(value)
+            if fail:
+                raise RuntimeError("boom")
+
+    def test_enqueue_unknown_task(self) -> None:
+        """Test that jobs can only be queued for registered tasks."""
+        with self.assertRaises(ValueError):
+            jobs.enqueue("test.unknown")
+
+    def test_enqueue_deduplicates_active_jobs(self) -> None:
+        """Test that an active job with the same dedupe key is reused."""
+        first = jobs.enqueue("test.record", {"value": 1}, dedupe_key="reindex")
+        second = jobs.enqueue("test.record", {"value": 2}, dedupe_key="reindex")
+
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(Job.objects.count(), 1)
+
+    def test_enqueue_after_finished_job_with_same_key(self) -> None:
+        """Test that dedupe keys only apply to pending and running jobs."""
+        first = jobs.enqueue("test.record", {"value": 1}, dedupe_key="reindex")
+        Job.objects.filter(pk=first.pk).update(status=Job.Status.SUCCEEDED)
+
+        second = jobs.enqueue("test.record", {"value": 2}, dedupe_key="reindex")
+
+        self.assertNotEqual(first.pk, second.pk)
+
+    def test_work_runs_due_jobs(self) -> None:
+        """Test that a worker runs due jobs and marks them as succeeded."""
+        job = jobs.enqueue("test.record", {"value": 1})
+        jobs.enqueue(
+            "test.record",
+            {"value": 2},
+            run_at=timezone.now() + timedelta(hours=1),
+        )
+
+        processed = jobs.work("test-worker", once=True)
+
+        job.refresh_from_db()
+        self.assertEqual(processed, 1)
+        self.assertEqual(self.calls, [1])
+        self.assertEqual(job.status, Job.Status.SUCCEEDED)
+        self.assertEqual(job.attempts, 1)
+
+    def test_failed_job_is_retried_with_backoff(self) -> None:
+        """Test that a failing job is rescheduled with exponential backoff."""
+        job = jobs.enqueue("test.record", {"value": 1, "fail": True})
+
+        with self.settings(JOB_RETRY_BACKOFF=10), self.assertLogs("news.jobs"):
+            jobs.work("test-worker", once=True)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.PENDING)
+        self.assertIn("RuntimeError: boom", job.last_error)
+        self.assertGreater(job.run_at, timezone.now() + timedelta(seconds=5))
+
+    def test_job_fails_after_max_attempts(self) -> None:
+        """Test that a job is given up after its last attempt."""
+        job = jobs.enqueue("test.record", {"value": 1, "fail": True}, max_attempts=1)
+
+        with self.assertLogs("news.jobs"):
+            jobs.work("test-worker", once=True)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+
+    def test_stale_running_job_is_reclaimed(self) -> None:
+        """Test that jobs locked by a crashed worker are claimed again."""
+        job = jobs.enqueue("test.record", {"value": 1})
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.Status.RUNNING,
+            locked_by="crashed",
+            locked_at=timezone.now() - timedelta(days=1),
+        )
+
+        claimed = jobs.claim_jobs("test-worker")
+
+        self.assertEqual([claimed_job.pk for claimed_job in claimed], [job.pk])
+        self.assertEqual(claimed[0].locked_by, "test-worker")
+
+    def test_stale_job_out_of_attempts_fails(self) -> None:
+        """Test that a job whose worker keeps dying is not claimed forever."""
+        job = jobs.enqueue("test.record", {"value": 1}, max_attempts=2)
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.Status.RUNNING,
+            attempts=2,
+            locked_by="crashed",
+            locked_at=timezone.now() - timedelta(days=1),
+        )
+
+        self.assertEqual(jobs.claim_jobs("test-worker"), [])
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+
+    def test_outcome_is_not_written_after_the_claim_is_lost(self) -> None:
+        """Test that a run whose job was claimed again leaves the new claim alone."""
+        jobs.enqueue("test.record", {"value": 1})
+        [job] = jobs.claim_jobs("slow-worker")
+        Job.objects.filter(pk=job.pk).update(locked_by="other-worker", attempts=2)
+
+        with self.assertLogs("news.jobs", "WARNING"):
+            jobs.run_job(job)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.RUNNING)
+        self.assertEqual(job.locked_by, "other-worker")
+
+
+class RunWorkersCommandTests(TransactionTestCase):
+    def test_run_workers_once(self) -> None:
+        """Test that the command drains the queue with a thread pool."""
+        for _ in range(3):
+            jobs.enqueue("news.call_command", {"command": "clearsessions"})
+
+        call_command("run_workers", "--workers=2", "--once", stdout=StringIO())
+
+        self.assertEqual(
+            Job.objects.filter(status=Job.Status.SUCCEEDED).count(),
+            Job.objects.count(),
+        )
@@ -0,0 +1,123 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from news.memory import MB, mark_gunicorn_worker, measure, should_recycle
+
+leaked = []
+
+
+class Response:
+    def close(self):
+        pass
+
+
+class MemoryMiddlewareTests(TestCase):
+    def setUp(self) -> None:
+        """Set up common test data."""
+        self.user = get_user_model().objects.create_user(
+            username="test_user", password="test_password"
+        )
+        self.client.force_login(self.user)
+
+    @override_settings(MEMORY_LOG_DELTA=5 * MB)
+    def test_requests_growing_the_worker_are_logged(self) -> None:
+        """Test that a request adding more than the threshold is reported."""
+        sizes = iter([100 * MB, 120 * MB])
+        with mock.patch("news.memory.rss", lambda: next(sizes)):
+            with self.assertLogs("news.memory", "WARNING") as logs:
+                self.client.get(reverse("news:index"))
+
+        self.assertIn("news:index", logs.output[0])
+        self.assertIn("by 20.0 MB", logs.output[0])
+
+    def mark_gunicorn_worker(self):
+        patcher = mock.patch("news.memory._gunicorn_worker_pid", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        mark_gunicorn_worker()
+
+    @override_settings(MEMORY_RECYCLE_RSS=150 * MB)
+    def test_large_gunicorn_worker_is_recycled(self) -> None:
+        """Test that a worker over the limit asks gunicorn to replace it."""
+        self.mark_gunicorn_worker()
+        sizes = iter([100 * MB, 200 * MB, 200 * MB, 210 * MB])
+        with mock.patch("news.memory.rss", lambda: next(sizes)), mock.patch(
+            "news.middleware.os.kill"
+        ) as kill, self.assertLogs("news.memory", "WARNING"):
+            self.client.get(reverse("news:index"))
+            self.client.get(reverse("news:index"))
+
+        kill.assert_called_once()
+
+    @override_settings(MEMORY_RECYCLE_RSS=150 * MB)
+    async def test_large_asgi_worker_is_recycled(self) -> None:
+        """Test that a uvicorn worker of gunicorn is recycled like a WSGI one."""
+        self.mark_gunicorn_worker()
+        sizes = iter([100 * MB, 200 * MB])
+        with mock.patch("news.memory.rss", lambda: next(sizes)), mock.patch(
+            "news.middleware.os.kill"
+        ) as kill, self.assertLogs("news.memory", "WARNING"):
+            await self.async_client.get(reverse("news:healthz"))
+
+        kill.assert_called_once()
+
+    @override_settings(MEMORY_RECYCLE_RSS=150 * MB)
+    def test_other_servers_are_not_recycled(self) -> None:
+        """Test that processes gunicorn would not replace are not signalled."""
+        sizes = iter([100 * MB, 200 * MB])
+        with mock.patch("news.memory.rss", lambda: next(sizes)), mock.patch(
+            "news.middleware.os.kill"
+        ) as kill, self.assertLogs("news.memory", "WARNING"):
+            self.client.get(reverse("news:index"))
+
+        kill.assert_not_called()
+
+
+class RecyclePolicyTests(TestCase):
+    @override_settings(MEMORY_RECYCLE_RSS=0, MEMORY_RECYCLE_GROWTH=50 * MB)
+    def test_growth_since_the_first_request_is_limited(self) -> None:
+        """Test that the growth limit compares with the worker's baseline."""
+        self.assertFalse(should_recycle(140 * MB, 100 * MB))
+        self.assertTrue(should_recycle(160 * MB, 100 * MB))
+
+    @override_settings(MEMORY_RECYCLE_RSS=0, MEMORY_RECYCLE_GROWTH=0)
+    def test_recycling_is_disabled_by_default(self) -> None:
+        """Test that no limit means no recycling."""
+        self.assertFalse(should_recycle(10_000 * MB, 100 * MB))
+
+
+class MemoryReplayTests(TestCase):
+    def test_leaking_view_is_reported(self) -> None:
+        """Test that memory kept after every response is attributed to its view."""
+        index = reverse("news:index")
+        most_read = reverse("news:most-read")
+
+        def fetch(url):
+            if url == index:
+                leaked.append(bytearray(64 * 1024))
+            return Response()
+
+        self.addCleanup(leaked.clear)
+        retained, sites = measure(fetch, [index, most_read], rounds=3)
+
+        self.assertEqual(retained[0][0], "news:index")
+        self.assertGreaterEqual(retained[0][1], 2 * 64 * 1024)
+        self.assertLess(dict(retained)["news:most-read"], 64 * 1024)
+        self.assertTrue(sites)
+
+    def test_command_reports_views(self) -> None:
+        """Test that the command replays the given URLs as a superuser."""
+        get_user_model().objects.create_superuser(
+            username="admin", password="test_password"
+        )
+        out = StringIO()
+
+        call_command("memory_replay", reverse("news:index"), rounds=2, stdout=out)
+
+        self.assertIn("news:index", out.getvalue())
+        self.assertIn("Replayed 1 URLs 2 times", out.getvalue())
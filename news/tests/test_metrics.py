@@ -0,0 +1,193 @@
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from news import metrics
+
+
+class MetricsTestCase(TestCase):
+    def setUp(self) -> None:
+        """Set up common test data."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        settings_override = override_settings(METRICS_DIR=self.directory)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+
+    def sample(self, name, **labels):
+        key = metrics.sample_key(name, labels)
+        return metrics.collect().get(key, 0.0)
+
+
+class MmapStoreTests(MetricsTestCase):
+    def test_values_are_summed_across_processes(self) -> None:
+        """Test that a scrape adds up the files of every worker."""
+        metrics.REQUESTS.inc(view="news:index", method="GET", status=200)
+        other = metrics.MmapDict(os.path.join(self.directory, "1.db"))
+        self.addCleanup(other.close)
+        other.add(
+            metrics.sample_key(
+                "news_requests_total",
+                {"view": "news:index", "method": "GET", "status": 200},
+            ),
+            2,
+        )
+
+        self.assertEqual(
+            self.sample(
+                "news_requests_total", view="news:index", method="GET", status=200
+            ),
+            3,
+        )
+
+    def test_store_reopens_its_file(self) -> None:
+        """Test that values survive reopening the file of a process."""
+        metrics.DB_QUERIES.inc(5, view="news:index")
+        metrics.reset()
+        metrics.DB_QUERIES.inc(2, view="news:index")
+
+        self.assertEqual(self.sample("news_db_queries_total", view="news:index"), 7)
+
+    def test_gauges_of_dead_processes_are_skipped(self) -> None:
+        """Test that in-flight requests of an exited worker are not reported."""
+        dead = metrics.MmapDict(os.path.join(self.directory, "999999999.db"))
+        self.addCleanup(dead.close)
+        dead.add(metrics.sample_key("news_requests_in_flight", {"view": "x"}), 1)
+        dead.add(metrics.sample_key("news_db_queries_total", {"view": "x"}), 4)
+
+        self.assertEqual(self.sample("news_requests_in_flight", view="x"), 0)
+        self.assertEqual(self.sample("news_db_queries_total", view="x"), 4)
+
+    def test_retired_processes_keep_their_counters(self) -> None:
+        """Test that an exited worker's counters move to the archive file."""
+        path = os.path.join(self.directory, "999999999.db")
+        dead = metrics.MmapDict(path)
+        dead.add(metrics.sample_key("news_requests_in_flight", {"view": "x"}), 1)
+        dead.add(metrics.sample_key("news_db_queries_total", {"view": "x"}), 4)
+        dead.close()
+
+        metrics.retire(999999999)
+        metrics.DB_QUERIES.inc(1, view="x")
+
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(self.sample("news_requests_in_flight", view="x"), 0)
+        self.assertEqual(self.sample("news_db_queries_total", view="x"), 5)
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        """Test that rendered buckets count every sample up to their bound."""
+        metrics.REQUEST_DURATION.observe(0.003, view="news:index")
+        metrics.REQUEST_DURATION.observe(0.2, view="news:index")
+
+        output = metrics.render()
+
+        prefix = 'news_request_duration_seconds_bucket{view="news:index",le='
+        self.assertIn(prefix + '"0.005"} 1', output)
+        self.assertIn(prefix + '"0.25"} 2', output)
+        self.assertIn(prefix + '"+Inf"} 2', output)
+        self.assertIn(
+            'news_request_duration_seconds_count{view="news:index"} 2', output
+        )
+
+
+class MetricsMiddlewareTests(MetricsTestCase):
+    def setUp(self) -> None:
+        """Set up common test data."""
+        super().setUp()
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="test_user", password="test_password"
+        )
+        self.client.force_login(self.user)
+
+    def test_requests_are_labelled_by_url_name(self) -> None:
+        """Test that latency, queries and status are recorded per view."""
+        self.client.get(reverse("news:newspaper-list"))
+
+        self.assertEqual(
+            self.sample(
+                "news_requests_total",
+                view="news:newspaper-list",
+                method="GET",
+                status=200,
+            ),
+            1,
+        )
+        self.assertEqual(
+            self.sample(
+                "news_request_duration_seconds_count", view="news:newspaper-list"
+            ),
+            1,
+        )
+        self.assertGreater(
+            self.sample("news_db_queries_total", view="news:newspaper-list"), 0
+        )
+        self.assertEqual(
+            self.sample("news_requests_in_flight", view="news:newspaper-list"), 0
+        )
+
+    def test_cache_lookups_are_counted_per_view(self) -> None:
+        """Test that a repeated request turns cache misses into hits."""
+        url = reverse("news:feed", args=["rss"])
+        self.client.get(url)
+        self.client.get(url)
+
+        self.assertGreater(
+            self.sample("news_cache_lookups_total", view="news:feed", result="hit"), 0
+        )
+        self.assertGreater(
+            self.sample("news_cache_lookups_total", view="news:feed", result="miss"), 0
+        )
+
+    def test_cache_instances_are_instrumented_not_their_class(self) -> None:
+        """Test that only the configured cache's instances count lookups."""
+        backend = caches["default"]
+
+        self.assertTrue(backend._news_instrumented)
+        self.assertFalse(hasattr(type(backend), "_news_instrumented"))
+
+
+class MetricsEndpointTests(MetricsTestCase):
+    @override_settings(METRICS_TOKEN="secret")
+    def test_metrics_are_exposed_as_text(self) -> None:
+        """Test that the endpoint serves the Prometheus text format."""
+        self.client.get(reverse("news:healthz"))
+
+        response = self.client.get(
+            reverse("news:metrics"), headers={"Authorization": "Bearer secret"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        self.assertContains(response, "# TYPE news_requests_total counter")
+        self.assertContains(
+            response,
+            'news_requests_total{method="GET",status="200",view="news:healthz"} 1',
+        )
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_metrics_token_is_required_when_set(self) -> None:
+        """Test that scrapes without the bearer token are refused."""
+        self.assertEqual(self.client.get(reverse("news:metrics")).status_code, 401)
+        response = self.client.get(
+            reverse("news:metrics"), headers={"Authorization": "Bearer secret"}
+        )
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(METRICS_TOKEN="")
+    def test_metrics_are_not_served_without_a_token(self) -> None:
+        """Test that the endpoint does not exist until a token is configured."""
+        self.assertEqual(self.client.get(reverse("news:metrics")).status_code, 404)
+
+    def test_healthz_does_not_touch_the_database(self) -> None:
+        """Test that the health check answers without a query."""
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("news:healthz"))
+
+        self.assertEqual(response.json(), {"status": "ok"})
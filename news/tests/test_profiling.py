@@ -0,0 +1,110 @@
+import pstats
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from news.db import explain
+from news.models import Newspaper, RequestProfile, Topic
+from news.profiling import profile_path
+
+
+class ProfilingMiddlewareTests(TestCase):
+    def setUp(self) -> None:
+        """Set up common test data."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(
+            PROFILE_DIR=directory.name, PROFILE_RING_SIZE=2
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.staff = get_user_model().objects.create_user(
+            username="staff", password="test_password", is_staff=True
+        )
+        self.redactor = get_user_model().objects.create_user(
+            username="redactor", password="test_password"
+        )
+        topic = Topic.objects.create(name="Politics")
+        Newspaper.objects.create(title="Election", content="Content", topic=topic)
+        self.url = reverse("news:newspaper-list")
+
+    def test_staff_request_is_profiled(self) -> None:
+        """Test that a flagged staff request keeps its profile and query plans."""
+        self.client.force_login(self.staff)
+
+        response = self.client.get(self.url, {"profile": "1"})
+
+        record = RequestProfile.objects.get()
+        self.assertEqual(response["X-Profile-Id"], str(record.pk))
+        self.assertEqual(record.user, self.staff)
+        self.assertEqual(record.status_code, 200)
+        self.assertEqual(record.query_count, len(record.queries))
+        self.assertIn("news_newspaper", record.queries[-1]["sql"])
+        self.assertTrue(
+            any(query.get("explain") for query in record.queries),
+        )
+        self.assertIn("cumulative", record.stats)
+        pstats.Stats(str(profile_path(record.pk)))
+
+    def test_header_triggers_a_profile(self) -> None:
+        """Test that the X-Profile header works like the query flag."""
+        self.client.force_login(self.staff)
+
+        self.client.get(self.url, headers={"X-Profile": "1"})
+
+        self.assertEqual(RequestProfile.objects.count(), 1)
+
+    def test_other_requests_are_not_profiled(self) -> None:
+        """Test that unflagged or non-staff requests are left alone."""
+        self.client.force_login(self.redactor)
+        response = self.client.get(self.url, {"profile": "1"})
+        self.client.force_login(self.staff)
+        self.client.get(self.url)
+
+        self.assertNotIn("X-Profile-Id", response)
+        self.assertFalse(RequestProfile.objects.exists())
+
+    def test_ring_keeps_the_latest_profiles(self) -> None:
+        """Test that profiles beyond the ring size replace the oldest ones."""
+        self.client.force_login(self.staff)
+        for _ in range(3):
+            self.client.get(self.url, {"profile": "1"})
+
+        self.assertEqual(RequestProfile.objects.count(), 2)
+        oldest = RequestProfile.objects.order_by("pk").first()
+        self.assertEqual(oldest.pk, RequestProfile.objects.order_by("pk").last().pk - 1)
+
+    def test_admin_lists_and_downloads_profiles(self) -> None:
+        """Test that staff can browse profiles and download the raw data."""
+        admin = get_user_model().objects.create_superuser(
+            username="admin", password="test_password"
+        )
+        self.client.force_login(admin)
+        self.client.get(self.url, {"profile": "1"})
+        record = RequestProfile.objects.get()
+
+        changelist = self.client.get(reverse("admin:news_requestprofile_changelist"))
+        change = self.client.get(
+            reverse("admin:news_requestprofile_change", args=[record.pk])
+        )
+        download = self.client.get(
+            reverse("admin:news_requestprofile_download", args=[record.pk])
+        )
+
+        self.assertContains(changelist, self.url)
+        self.assertContains(change, "Slowest functions")
+        self.assertEqual(download.status_code, 200)
+        self.assertEqual(
+            b"".join(download.streaming_content),
+            profile_path(record.pk).read_bytes(),
+        )
+
+
+class ExplainTests(TestCase):
+    def test_explain_describes_the_plan(self) -> None:
+        """Test that a query plan is returned as text."""
+        plan = explain("SELECT id FROM news_topic WHERE id = %s", [1])
+
+        self.assertTrue(plan)
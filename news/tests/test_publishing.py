@@ -0,0 +1,160 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from news import publishing, suggest
+from news.models import Job, Newspaper, NewspaperStat, Topic
+from news.stats import month_of
+
+
+class ScheduledPublishingTests(TestCase):
+    def setUp(self) -> None:
+        """Set up common test data."""
+        cache.clear()
+        for index in suggest.indexes.values():
+            index.clear()
+        self.redactor = get_user_model().objects.create_user(
+            username="test_user",
+            password="test_password",
+        )
+        self.client.force_login(self.redactor)
+        self.topic = Topic.objects.create(name="Politics")
+        self.live = Newspaper.objects.create(
+            title="Election results", content="Content", topic=self.topic
+        )
+        self.publish_at = timezone.now() + timedelta(days=40)
+        self.embargoed = Newspaper.objects.create(
+            title="Budget leak",
+            content="Content",
+            topic=self.topic,
+            publish_at=self.publish_at,
+        )
+        self.embargoed.publishers.add(self.redactor)
+
+    def test_future_publish_at_schedules_the_newspaper(self) -> None:
+        """Test that a future embargo schedules the newspaper and dates it."""
+        self.assertEqual(self.live.status, Newspaper.Status.PUBLISHED)
+        self.assertEqual(self.embargoed.status, Newspaper.Status.SCHEDULED)
+        self.assertEqual(self.embargoed.published_date, self.publish_at)
+        self.assertEqual(list(Newspaper.objects.visible()), [self.live])
+
+    def test_scheduled_newspapers_are_hidden(self) -> None:
+        """Test that lists, feeds and counts leave scheduled newspapers out."""
+        for url in (
+            reverse("news:newspaper-list"),
+            reverse("news:suggest", args=["newspapers"]) + "?q=bud",
+            reverse("news:feed", args=["rss"]),
+            reverse("news:topic-feed", args=[self.topic.pk, "atom"]),
+            reverse("news:redactor-feed", args=[self.redactor.pk, "json"]),
+        ):
+            response = self.client.get(url)
+            self.assertNotContains(response, "Budget leak")
+        response = self.client.get(reverse("news:index"))
+        self.assertEqual(response.context["num_newspapers"], 1)
+
+    def test_detail_page_shows_the_embargo(self) -> None:
+        """Test that editors can open a scheduled newspaper and see when it goes live."""
+        response = self.client.get(self.embargoed.get_absolute_url())
+        self.assertContains(response, "Scheduled for")
+
+    def test_publish_due_flips_due_newspapers_in_batches(self) -> None:
+        """Test that due newspapers go live in batches and refresh the feeds."""
+        Newspaper.objects.create(
+            title="Second embargo",
+            content="Content",
+            topic=self.topic,
+            publish_at=self.publish_at + timedelta(minutes=1),
+        )
+        self.client.get(reverse("news:feed", args=["rss"]))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            published = publishing.publish_due(
+                now=self.publish_at + timedelta(minutes=5), batch_size=1
+            )
+
+        self.assertEqual(published, 2)
+        self.assertFalse(
+            Newspaper.objects.filter(status=Newspaper.Status.SCHEDULED).exists()
+        )
+        response = self.client.get(reverse("news:feed", args=["rss"]))
+        self.assertContains(response, "Budget leak")
+        self.assertContains(response, "Second embargo")
+
+    def test_publish_due_updates_the_suggestions(self) -> None:
+        """Test that published newspapers are suggested without a rebuild."""
+        index = suggest.indexes["newspapers"]
+        index.build()
+        self.assertEqual(index.suggest("budget"), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            publishing.publish_due(now=self.publish_at)
+
+        self.assertEqual(index.suggest("budget"), ["Budget leak"])
+
+    def test_scheduling_queues_the_publishing_job(self) -> None:
+        """Test that the job workers are asked to publish at the embargo's end."""
+        publish_at = self.publish_at + timedelta(hours=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            Newspaper.objects.create(
+                title="Second embargo",
+                content="Content",
+                topic=self.topic,
+                publish_at=publish_at,
+            )
+
+        job = Job.objects.get(dedupe_key__startswith="publish_scheduled:")
+        self.assertEqual(job.run_at, publish_at)
+        self.assertEqual(
+            job.payload,
+            {"command": "publish_scheduled", "options": {"once": True}},
+        )
+
+    def test_publish_due_leaves_future_newspapers_alone(self) -> None:
+        """Test that newspapers whose embargo has not passed stay scheduled."""
+        self.assertEqual(publishing.publish_due(), 0)
+        self.assertEqual(publishing.next_due(), self.publish_at)
+
+    def test_rescheduling_moves_the_stats(self) -> None:
+        """Test that moving an embargo to another month moves its statistics."""
+        self.embargoed.publish_at = self.publish_at + timedelta(days=62)
+        self.embargoed.save()
+
+        months = set(
+            NewspaperStat.objects.filter(
+                redactor=None, newspapers__gt=0
+            ).values_list("month", flat=True)
+        )
+        self.assertEqual(
+            months,
+            {
+                month_of(self.live.published_date),
+                month_of(self.embargoed.publish_at),
+            },
+        )
+
+    def test_clearing_the_embargo_publishes_now(self) -> None:
+        """Test that removing the embargo of a scheduled newspaper publishes it."""
+        self.embargoed.publish_at = None
+        self.embargoed.save(update_fields=["publish_at"])
+
+        self.embargoed.refresh_from_db()
+        self.assertEqual(self.embargoed.status, Newspaper.Status.PUBLISHED)
+        self.assertLessEqual(self.embargoed.published_date, timezone.now())
+
+    def test_command_publishes_once(self) -> None:
+        """Test that the command publishes what is due and reports it."""
+        Newspaper.objects.filter(pk=self.embargoed.pk).update(
+            publish_at=timezone.now() - timedelta(minutes=1)
+        )
+        out = StringIO()
+        call_command("publish_scheduled", "--once", stdout=out)
+
+        self.embargoed.refresh_from_db()
+        self.assertEqual(self.embargoed.status, Newspaper.Status.PUBLISHED)
+        self.assertIn("Published 1 newspapers.", out.getvalue())
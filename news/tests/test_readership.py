@@ -0,0 +1,105 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from news.counters import view_counter
+from news.models import Newspaper, NewspaperViewBucket, Topic
+
+
+class ReadershipTests(TestCase):
+    def setUp(self) -> None:
+        """Set up common test data."""
+        cache.clear()
+        view_counter.clear()
+        self.user = get_user_model().objects.create_user(
+            username="test_user",
+            password="test_password",
+        )
+        self.client.force_login(self.user)
+        topic = Topic.objects.create(name="Politics")
+        self.popular = Newspaper.objects.create(
+            title="Popular", content="Content", topic=topic
+        )
+        self.quiet = Newspaper.objects.create(
+            title="Quiet", content="Content", topic=topic
+        )
+
+    def read(self, newspaper, times=1):
+        for _ in range(times):
+            self.client.get(reverse("news:newspaper-detail", args=[newspaper.id]))
+
+    def test_views_are_buffered_until_flush(self) -> None:
+        """Test that page views do not write counters synchronously."""
+        self.read(self.popular, times=3)
+
+        self.popular.refresh_from_db()
+        self.assertEqual(self.popular.view_count, 0)
+
+        view_counter.flush()
+
+        self.popular.refresh_from_db()
+        self.assertEqual(self.popular.view_count, 3)
+        self.assertEqual(
+            NewspaperViewBucket.objects.get(newspaper=self.popular).views, 3
+        )
+
+    def test_flush_adds_to_existing_counts(self) -> None:
+        """Test that consecutive flushes accumulate into the same bucket."""
+        self.read(self.popular, times=2)
+        view_counter.flush()
+        self.read(self.popular)
+        self.read(self.quiet)
+        view_counter.flush()
+
+        self.popular.refresh_from_db()
+        self.assertEqual(self.popular.view_count, 3)
+        self.assertEqual(
+            NewspaperViewBucket.objects.get(newspaper=self.popular).views, 3
+        )
+        self.assertEqual(NewspaperViewBucket.objects.count(), 2)
+
+    def test_flush_skips_deleted_newspapers(self) -> None:
+        """Test that views of a deleted newspaper are dropped on flush."""
+        self.read(self.quiet)
+        Newspaper.objects.filter(pk=self.quiet.pk).delete()
+
+        view_counter.flush()
+
+        self.assertFalse(NewspaperViewBucket.objects.exists())
+
+    def test_flush_when_interval_elapsed(self) -> None:
+        """Test that a view flushes the buffer once the interval has passed."""
+        with self.settings(VIEW_COUNT_FLUSH_INTERVAL=0):
+            self.read(self.popular)
+
+        self.popular.refresh_from_db()
+        self.assertEqual(self.popular.view_count, 1)
+
+    def test_most_read_ranking(self) -> None:
+        """Test that the ranking orders newspapers by views in the period."""
+        hour = timezone.now().replace(minute=0, second=0, microsecond=0)
+        NewspaperViewBucket.objects.create(
+            newspaper=self.quiet, hour=hour - timedelta(days=2), views=50
+        )
+        NewspaperViewBucket.objects.create(newspaper=self.quiet, hour=hour, views=2)
+        NewspaperViewBucket.objects.create(newspaper=self.popular, hour=hour, views=5)
+
+        response = self.client.get(reverse("news:most-read") + "?period=day")
+        self.assertEqual(
+            response.context["most_read"],
+            [(self.popular.id, "Popular", 5), (self.quiet.id, "Quiet", 2)],
+        )
+
+        cache.clear()
+        response = self.client.get(reverse("news:most-read") + "?period=week")
+        self.assertEqual(response.context["most_read"][0], (self.quiet.id, "Quiet", 52))
+
+    def test_most_read_requires_login(self) -> None:
+        """Test that the ranking is only shown to logged-in users."""
+        self.client.logout()
+        response = self.client.get(reverse("news:most-read"))
+        self.assertNotEqual(response.status_code, 200)
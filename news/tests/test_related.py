@@ -0,0 +1,94 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from news import related
+from news.models import Job, Newspaper, RelatedNewspaper, Topic
+
+
+def related_titles(newspaper):
+    return [
+        link.related.title
+        for link in RelatedNewspaper.objects.filter(newspaper=newspaper)
+    ]
+
+
+class RelatedNewspaperTests(TestCase):
+    def setUp(self) -> None:
+        """Set up common test data."""
+        self.topic = Topic.objects.create(name="Politics")
+        self.election = self.create("Election results", "Votes counted in the capital")
+        self.turnout = self.create(
+            "Election turnout", "Record turnout as votes are counted"
+        )
+        self.football = self.create("Football final", "The cup final ends in penalties")
+        self.cup = self.create("Cup final tickets", "Final tickets sold out")
+
+    def create(self, title, content):
+        return Newspaper.objects.create(title=title, content=content, topic=self.topic)
+
+    def test_vectors_are_normalized(self) -> None:
+        """Test that every TF-IDF row has unit length."""
+        pks, matrix = related.vectorize(
+            Newspaper.objects.values_list("pk", "title", "content")
+        )
+
+        self.assertEqual(len(pks), 4)
+        for row in range(4):
+            self.assertAlmostEqual(matrix[row].multiply(matrix[row]).sum(), 1, 5)
+
+    def test_compute_keeps_the_most_similar_newspapers(self) -> None:
+        """Test that neighbours are ranked by similarity and exclude self."""
+        call_command("compute_related", stdout=StringIO())
+
+        self.assertEqual(related_titles(self.election)[0], "Election turnout")
+        self.assertEqual(related_titles(self.football)[0], "Cup final tickets")
+        self.assertNotIn("Election results", related_titles(self.election))
+        links = RelatedNewspaper.objects.filter(newspaper=self.election)
+        self.assertEqual([link.rank for link in links], list(range(len(links))))
+        self.assertEqual(
+            [link.score for link in links],
+            sorted((link.score for link in links), reverse=True),
+        )
+
+    def test_new_only_update_merges_new_newspapers(self) -> None:
+        """Test that only new newspapers are computed and offered to others."""
+        related.compute()
+        newspaper = self.create("Penalties decide the final", "Cup final penalties")
+
+        updated = related.compute(new_only=True)
+
+        self.assertGreater(updated, 1)
+        self.assertEqual(related_titles(newspaper)[0], "Football final")
+        self.assertIn("Penalties decide the final", related_titles(self.football))
+        self.assertIn("Cup final tickets", related_titles(self.football))
+
+    def test_new_newspapers_are_batched_into_one_update(self) -> None:
+        """Test that creating newspapers queues one deduplicated update job."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create("Budget vote", "Parliament votes")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create("Budget passed", "Parliament passes the budget")
+
+        job = Job.objects.get()
+        self.assertEqual(job.payload["command"], "compute_related")
+        self.assertEqual(job.dedupe_key, "compute_related:new")
+
+    def test_detail_page_lists_related_newspapers(self) -> None:
+        """Test that the detail page links the precomputed neighbours."""
+        redactor = get_user_model().objects.create_user(
+            username="test_user",
+            password="test_password",
+        )
+        self.client.force_login(redactor)
+        related.compute()
+
+        response = self.client.get(
+            reverse("news:newspaper-detail", args=[self.election.pk])
+        )
+
+        self.assertContains(response, "Related articles")
+        self.assertContains(response, self.turnout.get_absolute_url())
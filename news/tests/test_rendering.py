@@ -0,0 +1,138 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from news.management.commands.rerender_markdown import Command as RerenderCommand
+from news.models import Newspaper, Topic
+from news.rendering import RENDERER_VERSION, render_markdown
+
+
+class RenderMarkdownTests(TestCase):
+    def test_markdown_is_rendered(self) -> None:
+        """Test that formatting and links become HTML."""
+        html = render_markdown("**Budget** vote, see [the bill](https://example.com)")
+
+        self.assertIn("<strong>Budget</strong>", html)
+        self.assertIn('href="https://example.com"', html)
+        self.assertIn('rel="noopener noreferrer nofollow"', html)
+
+    def test_unsafe_html_is_removed(self) -> None:
+        """Test that scripts, handlers and javascript: links are stripped."""
+        html = render_markdown(
+            "<script>alert(1)</script>\n\n"
+            '<img src="x.png" onerror="alert(1)">\n\n'
+            "[click](javascript:alert(1))"
+        )
+
+        self.assertNotIn("<script", html)
+        self.assertNotIn("onerror", html)
+        self.assertNotIn("javascript:", html)
+
+
+class NewspaperContentTests(TestCase):
+    def setUp(self) -> None:
+        """Set up common test data."""
+        self.topic = Topic.objects.create(name="Politics")
+        self.newspaper = Newspaper.objects.create(
+            title="Election", content="# Results\n\n*Close* race", topic=self.topic
+        )
+
+    def test_html_is_stored_when_saved(self) -> None:
+        """Test that the rendered HTML is stored with the renderer version."""
+        self.newspaper.refresh_from_db()
+
+        self.assertIn("<h1>Results</h1>", self.newspaper.content_html)
+        self.assertIn("<em>Close</em>", self.newspaper.content_html)
+        self.assertEqual(self.newspaper.content_html_version, RENDERER_VERSION)
+
+    def test_partial_saves_render_only_with_the_content(self) -> None:
+        """Test that update_fields saves keep the HTML in step with the content."""
+        self.newspaper.content = "**Recount**"
+        self.newspaper.save(update_fields=["content"])
+        self.newspaper.refresh_from_db()
+        self.assertIn("<strong>Recount</strong>", self.newspaper.content_html)
+
+        Newspaper.objects.filter(pk=self.newspaper.pk).update(content_html="stale")
+        self.newspaper.title = "Election night"
+        self.newspaper.save(update_fields=["title"])
+        self.newspaper.refresh_from_db()
+        self.assertEqual(self.newspaper.content_html, "stale")
+
+    def test_detail_page_shows_the_stored_html(self) -> None:
+        """Test that the detail page prints the HTML rendered at save time."""
+        user = get_user_model().objects.create_user(
+            username="test_user", password="test_password"
+        )
+        self.client.force_login(user)
+        Newspaper.objects.filter(pk=self.newspaper.pk).update(
+            content_html="<p>Stored <em>HTML</em></p>"
+        )
+
+        response = self.client.get(self.newspaper.get_absolute_url())
+
+        self.assertContains(response, "<p>Stored <em>HTML</em></p>", html=True)
+
+
+class RerenderMarkdownTests(TestCase):
+    def setUp(self) -> None:
+        """Set up common test data."""
+        topic = Topic.objects.create(name="Politics")
+        for number in range(5):
+            Newspaper.objects.create(
+                title=f"Election {number}", content=f"**Round {number}**", topic=topic
+            )
+
+    def test_stale_newspapers_are_rendered_again(self) -> None:
+        """Test that only newspapers of another renderer version are rendered."""
+        stale = Newspaper.objects.order_by("pk")[:2]
+        Newspaper.objects.filter(pk__in=[newspaper.pk for newspaper in stale]).update(
+            content_html="", content_html_version="old"
+        )
+        out = StringIO()
+
+        call_command("rerender_markdown", workers=2, batch_size=1, stdout=out)
+
+        self.assertIn("Rendered the Markdown of 2 newspapers", out.getvalue())
+        self.assertFalse(
+            Newspaper.objects.exclude(content_html_version=RENDERER_VERSION).exists()
+        )
+        self.assertFalse(Newspaper.objects.filter(content_html="").exists())
+
+    def test_trashed_newspapers_are_rendered_again(self) -> None:
+        """Test that a newspaper in the trash is not restored with stale HTML."""
+        newspaper = Newspaper.objects.order_by("pk").first()
+        Newspaper.objects.filter(pk=newspaper.pk).update(
+            content_html="", content_html_version="old", deleted_at=timezone.now()
+        )
+
+        call_command("rerender_markdown", workers=1, stdout=StringIO())
+
+        trashed = Newspaper.all_objects.get(pk=newspaper.pk)
+        self.assertEqual(trashed.content_html_version, RENDERER_VERSION)
+        self.assertNotEqual(trashed.content_html, "")
+
+    def test_all_newspapers_can_be_rendered(self) -> None:
+        """Test that --all renders every newspaper."""
+        out = StringIO()
+
+        call_command("rerender_markdown", all=True, workers=2, stdout=out)
+
+        self.assertIn("Rendered the Markdown of 5 newspapers", out.getvalue())
+
+    def test_newspapers_edited_meanwhile_are_left_alone(self) -> None:
+        """Test that HTML rendered from an outdated read does not overwrite an edit."""
+        newspaper = Newspaper.objects.order_by("pk").first()
+        read_at = newspaper.updated_at
+        newspaper.content = "*Edited*"
+        newspaper.save()
+
+        saved = RerenderCommand().save(
+            [(newspaper.pk, "<p>Outdated</p>")], {newspaper.pk: read_at}
+        )
+
+        self.assertEqual(saved, 0)
+        newspaper.refresh_from_db()
+        self.assertEqual(newspaper.content_html, "<p><em>Edited</em></p>")
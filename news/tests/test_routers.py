@@ -0,0 +1,106 @@
+from django.contrib.auth.models import Group
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from news.middleware import PIN_COOKIE, PrimaryPinningMiddleware
+from news.models import Job, Newspaper
+from news.routers import (
+    ReplicaRouter,
+    on_primary,
+    reads_from_replica,
+    writes_on_safe_method,
+)
+
+
+@override_settings(DATABASE_REPLICAS=["replica"], REPLICA_PIN_SECONDS=10)
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.router = ReplicaRouter()
+        token = reads_from_replica.set(True)
+        self.addCleanup(reads_from_replica.reset, token)
+
+    def test_news_reads_go_to_replica(self) -> None:
+        """Test that reads of news models are sent to a replica."""
+        self.assertEqual(self.router.db_for_read(Newspaper), "replica")
+
+    def test_reads_outside_requests_use_primary(self) -> None:
+        """Test that commands, jobs and schedulers read from the primary."""
+        reads_from_replica.set(False)
+        self.assertIsNone(self.router.db_for_read(Newspaper))
+
+    def test_jobs_are_read_from_primary(self) -> None:
+        """Test that the job queue never reads its rows from a replica."""
+        self.assertIsNone(self.router.db_for_read(Job))
+
+    def test_other_apps_read_from_primary(self) -> None:
+        """Test that only the news models are routed to replicas."""
+        self.assertIsNone(self.router.db_for_read(Group))
+
+    def test_reads_on_primary_block(self) -> None:
+        """Test that reads inside on_primary stay on the primary."""
+        with on_primary():
+            self.assertIsNone(self.router.db_for_read(Newspaper))
+        self.assertEqual(self.router.db_for_read(Newspaper), "replica")
+
+    def test_writes_and_migrations_use_primary(self) -> None:
+        """Test that replicas are never written to or migrated."""
+        self.assertEqual(self.router.db_for_write(Newspaper), "default")
+        self.assertFalse(self.router.allow_migrate("replica", "news"))
+        self.assertIsNone(self.router.allow_migrate("default", "news"))
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas_configured(self) -> None:
+        """Test that the router is a no-op without replicas."""
+        self.assertIsNone(self.router.db_for_read(Newspaper))
+
+
+@override_settings(DATABASE_REPLICAS=["replica"], REPLICA_PIN_SECONDS=10)
+class PrimaryPinningMiddlewareTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.factory = RequestFactory()
+        self.pinned = None
+
+        def get_response(request):
+            self.pinned = not reads_from_replica.get()
+            return HttpResponse()
+
+        self.middleware = PrimaryPinningMiddleware(get_response)
+
+    def test_write_is_pinned_and_sets_cookie(self) -> None:
+        """Test that a write pins the request and the following window."""
+        response = self.middleware(self.factory.post("/newspapers/create/"))
+
+        self.assertTrue(self.pinned)
+        self.assertEqual(response.cookies[PIN_COOKIE]["max-age"], 10)
+        self.assertFalse(reads_from_replica.get())
+
+    def test_read_after_write_is_pinned(self) -> None:
+        """Test that reads carrying the pin cookie stay on the primary."""
+        request = self.factory.get("/newspapers/")
+        request.COOKIES[PIN_COOKIE] = "1"
+
+        response = self.middleware(request)
+
+        self.assertTrue(self.pinned)
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_plain_read_is_not_pinned(self) -> None:
+        """Test that ordinary reads may use a replica."""
+        self.middleware(self.factory.get("/newspapers/"))
+
+        self.assertFalse(self.pinned)
+
+    def test_views_writing_on_get_are_pinned(self) -> None:
+        """Test that a GET view that writes reads from the primary and pins."""
+
+        @writes_on_safe_method
+        def view(request):
+            self.pinned = not reads_from_replica.get()
+            return HttpResponse()
+
+        response = PrimaryPinningMiddleware(view)(
+            self.factory.get("/newspapers/1/toggle-assign/")
+        )
+
+        self.assertTrue(self.pinned)
+        self.assertEqual(response.cookies[PIN_COOKIE]["max-age"], 10)
@@ -0,0 +1,136 @@
+from time import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from news.cache import get_or_compute
+from news.models import Newspaper, Topic
+from news.search import normalize_query, query_fingerprint
+
+NEWSPAPER_LIST_URL = reverse("news:newspaper-list")
+TOPIC_LIST_URL = reverse("news:topic-list")
+
+
+class QueryNormalizationTests(TestCase):
+    def test_whitespace_and_unicode_forms_are_normalized(self) -> None:
+        """Test that whitespace runs collapse and compatibility forms fold."""
+        self.assertEqual(normalize_query("  big\t  ﬁnal \n"), "big final")
+
+    def test_equivalent_queries_share_a_fingerprint(self) -> None:
+        """Test that queries differing in spacing share a key."""
+        self.assertEqual(
+            query_fingerprint("Election  Results"),
+            query_fingerprint(" Election Results"),
+        )
+        self.assertNotEqual(query_fingerprint("election"), query_fingerprint("economy"))
+
+    def test_queries_told_apart_by_the_lookup_keep_their_keys(self) -> None:
+        """Test that queries the database may tell apart are cached apart."""
+        self.assertNotEqual(query_fingerprint("straße"), query_fingerprint("strasse"))
+        self.assertNotEqual(query_fingerprint("Élection"), query_fingerprint("élection"))
+
+
+class GetOrComputeTests(TestCase):
+    def setUp(self) -> None:
+        """Set up common test data."""
+        cache.clear()
+        self.calls = 0
+
+    def compute(self) -> str:
+        self.calls += 1
+        return f"value {self.calls}"
+
+    def test_value_is_computed_once(self) -> None:
+        """Test that a cached value is served without computing it again."""
+        self.assertEqual(get_or_compute("key", self.compute, 60), "value 1")
+        self.assertEqual(get_or_compute("key", self.compute, 60), "value 1")
+        self.assertEqual(self.calls, 1)
+
+    def test_stale_value_is_served_while_another_caller_refreshes(self) -> None:
+        """Test that a stale entry is returned when its refresh lock is held."""
+        cache.set("key", ("stale", time() - 1), 60)
+        cache.add("lock:key", 1)
+
+        self.assertEqual(get_or_compute("key", self.compute, 60), "stale")
+        self.assertEqual(self.calls, 0)
+
+    def test_stale_value_is_refreshed_by_one_caller(self) -> None:
+        """Test that the caller taking the lock refreshes a stale entry."""
+        cache.set("key", ("stale", time() - 1), 60)
+
+        self.assertEqual(get_or_compute("key", self.compute, 60), "value 1")
+        self.assertEqual(get_or_compute("key", self.compute, 60), "value 1")
+        self.assertIsNone(cache.get("lock:key"))
+
+    def test_miss_waits_for_concurrent_computation(self) -> None:
+        """Test that a miss computes itself only after the lock wait expires."""
+        cache.add("lock:key", 1)
+
+        with self.settings(CACHE_LOCK_WAIT=0.1):
+            self.assertEqual(get_or_compute("key", self.compute, 60), "value 1")
+        self.assertEqual(self.calls, 1)
+
+
+class SearchCacheViewTests(TestCase):
+    def setUp(self) -> None:
+        """Set up common test data."""
+        cache.clear()
+        self.redactor = get_user_model().objects.create_user(
+            username="test_user",
+            password="test_password",
+        )
+        self.client.force_login(self.redactor)
+        self.topic = Topic.objects.create(name="Politics")
+        for number in range(7):
+            Newspaper.objects.create(
+                title=f"Election {number}", content="Test Content", topic=self.topic
+            )
+        Newspaper.objects.create(
+            title="Economy", content="Test Content", topic=self.topic
+        )
+
+    def test_equivalent_searches_hit_the_cache(self) -> None:
+        """Test that a repeated search skips the filtered count and page query."""
+        response = self.client.get(NEWSPAPER_LIST_URL, {"title": "election"})
+        self.assertEqual(response.context["paginator"].count, 7)
+
+        with self.assertNumQueries(1):
+            cached = self.client.get(NEWSPAPER_LIST_URL, {"title": "  ELECTION "})
+        self.assertEqual(
+            list(cached.context["newspaper_list"]),
+            list(response.context["newspaper_list"]),
+        )
+        self.assertEqual(cached.context["paginator"].count, 7)
+        self.assertTrue(cached.context["is_paginated"])
+
+    def test_pages_are_cached_separately(self) -> None:
+        """Test that each page of a search is cached under its own key."""
+        first = self.client.get(NEWSPAPER_LIST_URL, {"title": "election"})
+        second = self.client.get(NEWSPAPER_LIST_URL, {"title": "election", "page": 2})
+
+        self.assertEqual(len(first.context["newspaper_list"]), 5)
+        self.assertEqual(len(second.context["newspaper_list"]), 2)
+        self.assertEqual(second.context["page_obj"].number, 2)
+
+    def test_newspaper_change_invalidates_searches(self) -> None:
+        """Test that saving a newspaper makes cached searches miss."""
+        self.client.get(NEWSPAPER_LIST_URL, {"title": "economy"})
+        Newspaper.objects.create(
+            title="Economy today", content="Test Content", topic=self.topic
+        )
+
+        response = self.client.get(NEWSPAPER_LIST_URL, {"title": "economy"})
+
+        self.assertEqual(response.context["paginator"].count, 2)
+
+    def test_topic_change_invalidates_searches(self) -> None:
+        """Test that renaming a topic makes cached topic searches miss."""
+        self.client.get(TOPIC_LIST_URL, {"name": "sport"})
+        self.topic.name = "Sport"
+        self.topic.save()
+
+        response = self.client.get(TOPIC_LIST_URL, {"name": "sport"})
+
+        self.assertEqual(list(response.context["topic_list"]), [self.topic])
@@ -0,0 +1,124 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from news.db import fingerprint, normalize, read_slow_queries, slow_query_log
+from news.models import Newspaper, Topic
+
+
+class FingerprintTests(TestCase):
+    def test_values_do_not_change_the_fingerprint(self) -> None:
+        """Test that queries differing only in values share a fingerprint."""
+        first = "SELECT * FROM news_topic WHERE id IN (%s, %s) AND name = 'a'"
+        second = "SELECT *  FROM news_topic\nWHERE id IN (%s, %s, %s) AND name = 'b'"
+
+        self.assertEqual(fingerprint(first), fingerprint(second))
+        self.assertEqual(
+            normalize(first),
+            "SELECT * FROM news_topic WHERE id IN (...) AND name = ?",
+        )
+
+    def test_tables_change_the_fingerprint(self) -> None:
+        """Test that different statements get different fingerprints."""
+        self.assertNotEqual(
+            fingerprint("SELECT * FROM news_topic"),
+            fingerprint("SELECT * FROM news_newspaper"),
+        )
+
+
+class SlowQueryLogTests(TestCase):
+    def setUp(self) -> None:
+        """Set up common test data."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.log = Path(directory.name) / "slow.jsonl"
+        self.user = get_user_model().objects.create_user(
+            username="test_user", password="test_password"
+        )
+        self.client.force_login(self.user)
+        topic = Topic.objects.create(name="Politics")
+        Newspaper.objects.create(title="Election", content="Content", topic=topic)
+
+    def test_slow_queries_are_logged_with_their_source(self) -> None:
+        """Test that slow queries keep their view, call site and plan."""
+        with self.settings(SLOW_QUERY_THRESHOLD=1e-9, SLOW_QUERY_LOG=self.log):
+            with self.assertLogs("news.db", "WARNING"):
+                self.client.get(reverse("news:newspaper-list"))
+
+        entries = list(read_slow_queries(self.log))
+        newspapers = [
+            entry
+            for entry in entries
+            if entry["view"] == "news:newspaper-list"
+            and "news_newspaper" in entry["sql"]
+        ]
+        self.assertTrue(newspapers)
+        self.assertTrue(all(entry["plan"] for entry in newspapers))
+        self.assertTrue(
+            any(
+                (entry["template"] or "").startswith("news/newspaper_list.html:")
+                or (entry["code"] or "").startswith("news/")
+                for entry in newspapers
+            )
+        )
+
+    def test_fast_queries_are_not_logged(self) -> None:
+        """Test that queries under the threshold leave no entry."""
+        with self.settings(SLOW_QUERY_THRESHOLD=60, SLOW_QUERY_LOG=self.log):
+            self.client.get(reverse("news:newspaper-list"))
+
+        self.assertFalse(self.log.exists())
+
+    def test_wrapper_stays_below_temporary_wrappers(self) -> None:
+        """Test that reconnecting inside execute_wrapper() keeps the stack intact."""
+
+        def passthrough(execute, sql, params, many, context):
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(passthrough):
+            connection.close()
+            connection.ensure_connection()
+
+        self.assertEqual(connection.execute_wrappers, [slow_query_log])
+
+    @override_settings(SLOW_QUERY_LOG_MAX_BYTES=0)
+    def test_command_reports_the_costliest_fingerprints(self) -> None:
+        """Test that the report ranks fingerprints by total time."""
+        entries = [
+            ("SELECT * FROM news_topic WHERE id = %s", 0.5, "news:topic-list"),
+            ("SELECT * FROM news_topic WHERE id = %s", 0.4, "news:topic-list"),
+            ("SELECT * FROM news_newspaper", 0.6, "news:index"),
+        ]
+        lines = [
+            json.dumps(
+                {
+                    "fingerprint": fingerprint(sql),
+                    "normalized": normalize(sql),
+                    "sql": sql,
+                    "duration": duration,
+                    "view": view,
+                    "code": "news/views.py:10 in get_queryset",
+                    "template": None,
+                    "plan": "SCAN news_topic" if "topic" in sql else None,
+                }
+            )
+            for sql, duration, view in entries
+        ]
+        self.log.write_text("\n".join(lines) + "\n")
+        out = StringIO()
+
+        call_command("slow_queries", log=str(self.log), stdout=out)
+
+        report = out.getvalue()
+        self.assertLess(report.index("news_topic"), report.index("news_newspaper"))
+        self.assertIn("2 queries, 900 ms in total", report)
+        self.assertIn("2 x news:topic-list at news/views.py:10", report)
+        self.assertIn("SCAN news_topic", report)
+        self.assertIn("3 slow queries in 2 fingerprints", report)
@@ -0,0 +1,22 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+
+class SqliteBenchmarkCommandTests(SimpleTestCase):
+    def test_benchmark_reports_both_profiles(self) -> None:
+        """Test that the benchmark runs the default and the tuned profile."""
+        out = StringIO()
+
+        call_command(
+            "sqlite_benchmark",
+            "--clients=2",
+            "--duration=0.2",
+            "--rows=10",
+            stdout=out,
+        )
+
+        report = out.getvalue().splitlines()
+        self.assertTrue(report[2].startswith("default"))
+        self.assertTrue(report[3].startswith("tuned"))
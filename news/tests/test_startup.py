@@ -0,0 +1,68 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.template import engines
+from django.test import TestCase
+from django.urls import get_resolver
+
+from news import startup
+from news.counters import view_counter
+from news.management.commands.startup_profile import parse_import_times
+from news.models import Newspaper, Topic
+
+
+class PrewarmTests(TestCase):
+    def test_templates_are_compiled_once(self) -> None:
+        """Test that preloading fills the cached template loader."""
+        loader = engines["django"].engine.template_loaders[0]
+        loader.reset()
+
+        self.assertGreater(startup.load_templates(), 0)
+        self.assertIn("news/newspaper_list.html", loader.get_template_cache)
+        self.assertIn("admin/base.html", loader.get_template_cache)
+
+    def test_resolvers_are_populated(self) -> None:
+        """Test that the reverse lookups of every namespace are built."""
+        startup.prewarm()
+
+        resolver = get_resolver()
+        self.assertIn("news", resolver.namespace_dict)
+        self.assertTrue(resolver.namespace_dict["news"][1]._populated)
+
+    def test_buffers_are_flushed_on_exit(self) -> None:
+        """Test that buffered views are written when a worker exits."""
+        view_counter.clear()
+        topic = Topic.objects.create(name="Politics")
+        newspaper = Newspaper.objects.create(
+            title="Election", content="Content", topic=topic
+        )
+        view_counter.record(newspaper.pk)
+
+        startup.flush_buffers()
+
+        newspaper.refresh_from_db()
+        self.assertEqual(newspaper.view_count, 1)
+
+
+class StartupProfileTests(TestCase):
+    def test_import_times_are_parsed(self) -> None:
+        """Test that -X importtime lines give module, times and depth."""
+        lines = [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        150 |     django.utils",
+            "import time:      1425 |     110249 | news_agency.asgi",
+        ]
+
+        self.assertEqual(
+            parse_import_times(lines),
+            [("django.utils", 120, 150, 2), ("news_agency.asgi", 1425, 110249, 0)],
+        )
+
+    def test_command_reports_the_worker_imports(self) -> None:
+        """Test that the command profiles a fresh interpreter loading the app."""
+        out = StringIO()
+
+        call_command("startup_profile", top=50, stdout=out)
+
+        self.assertIn("news_agency.asgi", out.getvalue())
+        self.assertIn("Import time per top-level package:", out.getvalue())
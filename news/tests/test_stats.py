@@ -0,0 +1,105 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from news.models import Newspaper, NewspaperStat, Topic
+from news.stats import month_of
+
+
+def stat_rows():
+    return set(
+        NewspaperStat.objects.filter(newspapers__gt=0).values_list(
+            "topic_id", "redactor_id", "month", "newspapers"
+        )
+    )
+
+
+class NewspaperStatTests(TestCase):
+    def setUp(self) -> None:
+        """Set up common test data."""
+        self.redactor = get_user_model().objects.create_user(
+            username="test_user",
+            password="test_password",
+        )
+        self.colleague = get_user_model().objects.create_user(
+            username="colleague",
+            password="test_password",
+        )
+        self.politics = Topic.objects.create(name="Politics")
+        self.sport = Topic.objects.create(name="Sport")
+        self.newspaper = Newspaper.objects.create(
+            title="Election results", content="Content", topic=self.politics
+        )
+        self.newspaper.publishers.add(self.redactor, self.colleague)
+        self.month = month_of(self.newspaper.published_date)
+
+    def test_stats_follow_creation_and_publishers(self) -> None:
+        """Test that topic totals and redactor rows are kept up to date."""
+        Newspaper.objects.create(
+            title="Campaign", content="Content", topic=self.politics
+        ).publishers.add(self.redactor)
+
+        self.assertEqual(
+            stat_rows(),
+            {
+                (self.politics.id, None, self.month, 2),
+                (self.politics.id, self.redactor.id, self.month, 2),
+                (self.politics.id, self.colleague.id, self.month, 1),
+            },
+        )
+
+    def test_stats_follow_publisher_removal_from_both_sides(self) -> None:
+        """Test that unassigning publishers decrements redactor rows."""
+        self.newspaper.publishers.remove(self.colleague)
+        self.redactor.newspapers.clear()
+
+        self.assertEqual(stat_rows(), {(self.politics.id, None, self.month, 1)})
+
+    def test_stats_follow_topic_change(self) -> None:
+        """Test that moving a newspaper to another topic moves its counts."""
+        newspaper = Newspaper.objects.get(pk=self.newspaper.pk)
+        newspaper.topic = self.sport
+        newspaper.save()
+        newspaper.save()
+
+        self.assertEqual(
+            stat_rows(),
+            {
+                (self.sport.id, None, self.month, 1),
+                (self.sport.id, self.redactor.id, self.month, 1),
+                (self.sport.id, self.colleague.id, self.month, 1),
+            },
+        )
+
+    def test_stats_follow_deletion(self) -> None:
+        """Test that deleting a newspaper removes its counts."""
+        self.newspaper.delete()
+
+        self.assertEqual(stat_rows(), set())
+
+    def test_rebuild_matches_incremental_stats(self) -> None:
+        """Test that the rebuild command recomputes the same rollups."""
+        self.newspaper.publishers.remove(self.colleague)
+        expected = stat_rows()
+        NewspaperStat.objects.update(newspapers=42)
+
+        call_command("rebuild_stats", stdout=StringIO())
+
+        self.assertEqual(stat_rows(), expected)
+
+    def test_analytics_view(self) -> None:
+        """Test that the analytics page renders from the rollups only."""
+        self.client.force_login(self.redactor)
+
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("news:analytics"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["months"][0]["total"], 1)
+        self.assertEqual(
+            [row["redactor__username"] for row in response.context["redactors"]],
+            ["colleague", "test_user"],
+        )
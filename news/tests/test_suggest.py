@@ -0,0 +1,130 @@
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from news import startup
+from news.models import Newspaper, Topic
+from news.suggest import PrefixIndex, indexes
+
+
+def suggest_url(kind):
+    return reverse("news:suggest", args=[kind])
+
+
+class SuggestionViewTests(TestCase):
+    def setUp(self) -> None:
+        """Set up common test data."""
+        for index in indexes.values():
+            index.clear()
+        self.redactor = get_user_model().objects.create_user(
+            username="test_user",
+            password="test_password",
+        )
+        self.client.force_login(self.redactor)
+        self.topic = Topic.objects.create(name="Politics")
+        for title in ("Election results", "Election day", "Economy"):
+            Newspaper.objects.create(
+                title=title, content="Test Content", topic=self.topic
+            )
+
+    def test_login_required(self) -> None:
+        """Test that suggestions are not served to anonymous users."""
+        self.client.logout()
+        response = self.client.get(suggest_url("topics"), {"q": "po"})
+        self.assertNotEqual(response.status_code, 200)
+
+    def test_unknown_index_is_not_found(self) -> None:
+        """Test that an unknown suggestion index returns 404."""
+        response = self.client.get(suggest_url("comments"), {"q": "po"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_prefix_completions_are_sorted_and_case_insensitive(self) -> None:
+        """Test that completions match the prefix regardless of case."""
+        response = self.client.get(suggest_url("newspapers"), {"q": "  ELEC"})
+
+        self.assertEqual(
+            response.json(), {"suggestions": ["Election day", "Election results"]}
+        )
+
+    def test_completions_do_not_query_the_database(self) -> None:
+        """Test that a built index answers without database queries."""
+        indexes["topics"].build()
+
+        with self.assertNumQueries(0):
+            suggestions = indexes["topics"].suggest("pol")
+
+        self.assertEqual(suggestions, ["Politics"])
+
+    def test_index_follows_committed_changes(self) -> None:
+        """Test that saves and deletes update a built index on commit."""
+        index = indexes["newspapers"]
+        index.build()
+        newspaper = Newspaper.objects.get(title="Economy")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            newspaper.title = "Ecology"
+            newspaper.save()
+            Newspaper.objects.create(
+                title="Economics", content="Test Content", topic=self.topic
+            )
+        self.assertEqual(index.suggest("eco"), ["Ecology", "Economics"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            newspaper.delete()
+        self.assertEqual(index.suggest("eco"), ["Economics"])
+
+
+class PrefixIndexTests(TestCase):
+    def test_lookup_stays_fast_on_large_indexes(self) -> None:
+        """Test that a completion over a million entries takes under 5 ms."""
+        index = PrefixIndex(Newspaper, "title")
+        index._entries = sorted(
+            (f"title {number:07d}", f"Title {number:07d}", number)
+            for number in range(1_000_000)
+        )
+        index._built_at = time.monotonic()
+
+        started = time.perf_counter()
+        suggestions = index.suggest("title 05")
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(len(suggestions), 10)
+        self.assertEqual(suggestions[0], "Title 0500000")
+        self.assertLess(elapsed, 0.005)
+
+    def test_concurrent_cold_lookups_build_once(self) -> None:
+        """Test that requests racing on a cold index share a single build."""
+        index = PrefixIndex(Newspaper, "title")
+        loads = []
+
+        def load():
+            loads.append(1)
+            time.sleep(0.05)
+            return [("election", "Election", 1)], {1: "Election"}
+
+        with mock.patch.object(index, "_load", side_effect=load):
+            threads = [
+                threading.Thread(target=index.suggest, args=["ele"]) for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(loads), 1)
+        self.assertEqual(index.suggest("ele"), ["Election"])
+
+    def test_indexes_are_built_at_startup(self) -> None:
+        """Test that prewarming builds every index before the first request."""
+        for index in indexes.values():
+            index.clear()
+        Topic.objects.create(name="Politics")
+
+        startup.build_suggestion_indexes()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(indexes["topics"].suggest("pol"), ["Politics"])
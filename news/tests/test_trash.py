@@ -0,0 +1,140 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from news import stats, suggest, trash
+from news.models import Job, Newspaper, NewspaperStat, Topic
+
+
+class TrashTests(TestCase):
+    def setUp(self) -> None:
+        """Set up common test data."""
+        cache.clear()
+        for index in suggest.indexes.values():
+            index.clear()
+        self.redactor = get_user_model().objects.create_user(
+            username="test_user",
+            password="test_password",
+        )
+        self.client.force_login(self.redactor)
+        self.topic = Topic.objects.create(name="Politics")
+        self.newspaper = Newspaper.objects.create(
+            title="Election results", content="Content", topic=self.topic
+        )
+        self.newspaper.publishers.add(self.redactor)
+        self.other = Newspaper.objects.create(
+            title="Budget", content="Content", topic=self.topic
+        )
+
+    def topic_total(self):
+        return NewspaperStat.objects.get(topic=self.topic, redactor=None).newspapers
+
+    def test_delete_view_moves_the_newspaper_to_the_trash(self) -> None:
+        """Test that deleting a newspaper hides it but keeps its row and links."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("news:newspaper-delete", args=[self.newspaper.pk]))
+
+        self.assertFalse(Newspaper.objects.filter(pk=self.newspaper.pk).exists())
+        trashed = Newspaper.all_objects.get(pk=self.newspaper.pk)
+        self.assertIsNotNone(trashed.deleted_at)
+        self.assertEqual(list(trashed.publishers.all()), [self.redactor])
+        self.assertEqual(self.topic_total(), 1)
+        self.assertTrue(
+            Job.objects.filter(dedupe_key__startswith="purge_trash:").exists()
+        )
+        response = self.client.get(reverse("news:feed", args=["rss"]))
+        self.assertNotContains(response, "Election results")
+        response = self.client.get(self.newspaper.get_absolute_url())
+        self.assertEqual(response.status_code, 404)
+
+    def test_restore_brings_the_newspaper_back(self) -> None:
+        """Test that a restored newspaper is listed and counted again."""
+        trash.trash_newspapers(Newspaper.objects.filter(pk=self.newspaper.pk))
+        trash.restore_newspapers(Newspaper.all_objects.filter(pk=self.newspaper.pk))
+
+        self.assertTrue(Newspaper.objects.filter(pk=self.newspaper.pk).exists())
+        self.assertEqual(self.topic_total(), 2)
+        self.assertEqual(
+            NewspaperStat.objects.get(
+                topic=self.topic, redactor=self.redactor
+            ).newspapers,
+            1,
+        )
+
+    def test_delete_view_moves_the_topic_and_its_newspapers_to_the_trash(
+        self,
+    ) -> None:
+        """Test that a trashed topic takes its newspapers along and brings them back."""
+        self.client.post(reverse("news:topic-delete", args=[self.topic.pk]))
+
+        self.assertFalse(Topic.objects.filter(pk=self.topic.pk).exists())
+        self.assertFalse(Newspaper.objects.filter(topic=self.topic).exists())
+        self.assertEqual(self.topic_total(), 0)
+
+        topic = Topic.all_objects.get(pk=self.topic.pk)
+        trash.restore_topic(topic)
+
+        self.assertTrue(Topic.objects.filter(pk=self.topic.pk).exists())
+        self.assertEqual(Newspaper.objects.filter(topic=self.topic).count(), 2)
+        self.assertEqual(self.topic_total(), 2)
+
+    def test_restoring_a_newspaper_restores_its_topic(self) -> None:
+        """Test that a newspaper is not restored into a trashed topic."""
+        trash.trash_topic(self.topic)
+        trash.restore_newspapers(Newspaper.all_objects.filter(pk=self.newspaper.pk))
+
+        self.assertTrue(Topic.objects.filter(pk=self.topic.pk).exists())
+        self.assertFalse(Newspaper.objects.filter(pk=self.other.pk).exists())
+
+    def test_restoring_a_scheduled_newspaper_queues_its_publishing(self) -> None:
+        """Test that a newspaper whose embargo ended in the trash still goes live."""
+        scheduled = Newspaper.objects.create(
+            title="Embargoed",
+            content="Content",
+            topic=self.topic,
+            publish_at=timezone.now() + timedelta(days=1),
+        )
+        trash.trash_newspapers(Newspaper.objects.filter(pk=scheduled.pk))
+        publish_at = timezone.now() - timedelta(hours=1)
+        Newspaper.all_objects.filter(pk=scheduled.pk).update(publish_at=publish_at)
+        Job.objects.all().delete()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            trash.restore_newspapers(Newspaper.all_objects.filter(pk=scheduled.pk))
+
+        job = Job.objects.get(dedupe_key__startswith="publish_scheduled:")
+        self.assertEqual(job.run_at, publish_at)
+
+    @override_settings(TRASH_RETENTION=30)
+    def test_purge_deletes_expired_trash_in_batches(self) -> None:
+        """Test that only trash older than the retention is deleted for good."""
+        trash.trash_topic(self.topic, now=timezone.now() - timedelta(days=31))
+        recent = Newspaper.objects.create(
+            title="Recent", content="Content", topic=Topic.objects.create(name="Art")
+        )
+        trash.trash_newspapers(Newspaper.objects.filter(pk=recent.pk))
+
+        self.assertEqual(trash.purge(batch_size=1), 3)
+        self.assertFalse(Topic.all_objects.filter(pk=self.topic.pk).exists())
+        self.assertEqual(list(Newspaper.all_objects.all()), [recent])
+        stats.rebuild()
+        self.assertFalse(NewspaperStat.objects.filter(newspapers__gt=0).exists())
+
+    def test_purge_command(self) -> None:
+        """Test that the command purges the expired trash and reports it."""
+        trash.trash_newspapers(
+            Newspaper.objects.filter(pk=self.newspaper.pk),
+            now=timezone.now() - timedelta(days=365),
+        )
+        out = StringIO()
+        call_command("purge_trash", stdout=out)
+
+        self.assertFalse(Newspaper.all_objects.filter(pk=self.newspaper.pk).exists())
+        self.assertEqual(self.topic_total(), 1)
+        self.assertIn("Purged 1 trashed rows.", out.getvalue())
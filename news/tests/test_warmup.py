@@ -0,0 +1,81 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+
+from news import startup
+from news.counters import view_counter
+from news.models import Newspaper, Topic
+from news.warmup import feed_urls, page_urls
+
+
+class WarmupUrlTests(TestCase):
+    def setUp(self) -> None:
+        """Set up common test data."""
+        self.politics = Topic.objects.create(name="Politics")
+        self.sport = Topic.objects.create(name="Sport")
+        for number in range(7):
+            Newspaper.objects.create(
+                title=f"Election {number}", content="Test Content", topic=self.politics
+            )
+
+    def test_page_urls_stop_at_the_last_page(self) -> None:
+        """Test that only existing list pages and recent details are replayed."""
+        urls = page_urls(pages=3, details=2)
+
+        newspaper_list = reverse("news:newspaper-list")
+        self.assertIn(f"{newspaper_list}?page=2", urls)
+        self.assertNotIn(f"{newspaper_list}?page=3", urls)
+        self.assertEqual(
+            len(
+                [
+                    url
+                    for url in urls
+                    if url.startswith("/newspapers/") and "?" not in url
+                ]
+            ),
+            3,
+        )
+
+    def test_feed_urls_cover_the_busiest_topics(self) -> None:
+        """Test that the feeds of the topics with most newspapers come first."""
+        urls = feed_urls(topics=1)
+
+        self.assertIn(reverse("news:topic-feed", args=[self.politics.pk, "rss"]), urls)
+        self.assertNotIn(reverse("news:topic-feed", args=[self.sport.pk, "rss"]), urls)
+
+
+class WarmCachesCommandTests(TransactionTestCase):
+    def setUp(self) -> None:
+        """Set up common test data."""
+        cache.clear()
+        view_counter.clear()
+        get_user_model().objects.create_superuser(
+            username="admin", password="test_password"
+        )
+        topic = Topic.objects.create(name="Politics")
+        Newspaper.objects.create(
+            title="Election results", content="Test Content", topic=topic
+        )
+
+    def test_command_fills_caches_and_reports(self) -> None:
+        """Test that the warm-up renders every page and reports how long it took."""
+        out = StringIO()
+
+        call_command("warm_caches", "--workers=2", stdout=out, stderr=StringIO())
+
+        self.assertRegex(out.getvalue(), r"Warmed (\d+) of \1 pages in [\d.]+s\.")
+        self.assertEqual(Newspaper.objects.get().view_count, 0)
+        with view_counter._lock:
+            self.assertFalse(view_counter._pending)
+
+    def test_startup_fills_caches(self) -> None:
+        """Test that the warm-up gunicorn runs at start-up renders every page."""
+        with self.assertLogs("news.startup", "INFO") as logs:
+            startup.warm_caches()
+
+        self.assertRegex(logs.output[-1], r"Warmed (\d+) of \1 pages")
+        self.assertEqual(Newspaper.objects.get().view_count, 0)
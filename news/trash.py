@@ -0,0 +1,212 @@
+"""
+Soft delete.
+
+Deleting a newspaper or a topic moves it to the trash: ``deleted_at`` is set
+and the default managers hide the row. A trashed topic takes its newspapers
+along, and restoring it brings back the ones trashed with it. Rows stay
+restorable for ``TRASH_RETENTION`` days, after which ``purge`` deletes them
+for good in small batches. The newspaper indexes only cover live rows, so a
+growing trash costs the listings nothing.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from news import publishing, stats, suggest
+from news.audit import journal
+from news.cache import bump_version
+from news.jobs import enqueue
+from news.models import AuditEvent, Newspaper, Topic
+
+
+def _on_commit_suggestions(index, labels):
+    def update():
+        for pk, label in labels.items():
+            suggest.indexes[index].update(pk, label)
+
+    transaction.on_commit(update)
+
+
+def _newspapers_changed(rows, *, trashed):
+    """Update the statistics and caches of newspapers moved in or out of the trash."""
+    pks = [pk for pk, *_ in rows]
+    publishers = {}
+    for newspaper_id, redactor_id in Newspaper.publishers.through.objects.filter(
+        newspaper_id__in=pks
+    ).values_list("newspaper_id", "redactor_id"):
+        publishers.setdefault(newspaper_id, []).append(redactor_id)
+
+    keys = []
+    scopes = {"feed:all", "search:newspaper"}
+    for pk, topic_id, published_date, title, status in rows:
+        keys += stats.contribution(topic_id, published_date, publishers.get(pk, ()))
+        scopes.add(f"feed:topic:{topic_id}")
+    scopes.update(
+        f"feed:redactor:{redactor_id}"
+        for redactor_ids in publishers.values()
+        for redactor_id in redactor_ids
+    )
+    if trashed:
+        stats.apply_change(removed=keys)
+    else:
+        stats.apply_change(added=keys)
+    transaction.on_commit(lambda: bump_version(*scopes))
+
+    _on_commit_suggestions(
+        "newspapers",
+        {
+            pk: None if trashed or status != Newspaper.Status.PUBLISHED else title
+            for pk, topic_id, published_date, title, status in rows
+        },
+    )
+
+
+def _topics_changed(topics, *, trashed):
+    labels = {
+        pk: None if trashed else name for pk, name in topics.values_list("pk", "name")
+    }
+    if labels:
+        _on_commit_suggestions("topics", labels)
+        transaction.on_commit(lambda: bump_version("search:topic"))
+
+
+def _record(action, rows, actor):
+    """Journal ``action`` by ``actor`` for every newspaper of ``rows``."""
+    for pk, topic_id, published_date, title, status in rows:
+        journal.record(action, Newspaper(pk=pk, title=title), actor)
+
+
+def _rows(newspapers):
+    return list(
+        newspapers.order_by().values_list(
+            "pk", "topic_id", "published_date", "title", "status"
+        )
+    )
+
+
+def schedule_purge(deleted_at):
+    """Queue a purge for the hour after rows trashed at ``deleted_at`` expire."""
+    expires_at = deleted_at + timedelta(days=settings.TRASH_RETENTION)
+    run_at = expires_at.replace(minute=0, second=0, microsecond=0) + timedelta(
+        hours=1
+    )
+    transaction.on_commit(
+        lambda: enqueue(
+            "news.call_command",
+            {"command": "purge_trash"},
+            dedupe_key=f"purge_trash:{run_at:%Y%m%d%H}",
+            run_at=run_at,
+        )
+    )
+
+
+def trash_newspapers(newspapers, now=None, actor=None):
+    """
+    Move the live newspapers of ``newspapers`` to the trash; return how many.
+
+    Each one is journaled as deleted by ``actor``.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        rows = _rows(newspapers.filter(deleted_at=None))
+        if not rows:
+            return 0
+        Newspaper.all_objects.filter(pk__in=[pk for pk, *_ in rows]).update(
+            deleted_at=now, updated_at=now
+        )
+        _newspapers_changed(rows, trashed=True)
+        _record(AuditEvent.Action.DELETED, rows, actor)
+        schedule_purge(now)
+    return len(rows)
+
+
+def restore_newspapers(newspapers, now=None, actor=None):
+    """
+    Take the trashed newspapers of ``newspapers`` out of the trash.
+
+    ``newspapers`` should come from ``Newspaper.all_objects``. The topics of
+    the restored newspapers are restored too, but not their other newspapers.
+    Each one is journaled as restored by ``actor``.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        rows = _rows(newspapers.filter(deleted_at__isnull=False))
+        if not rows:
+            return 0
+        Newspaper.all_objects.filter(pk__in=[pk for pk, *_ in rows]).update(
+            deleted_at=None, updated_at=now
+        )
+        _newspapers_changed(rows, trashed=False)
+        _record(AuditEvent.Action.RESTORED, rows, actor)
+        # Publishing jobs that ran while they were trashed skipped them.
+        for publish_at in set(
+            Newspaper.all_objects.filter(
+                pk__in=[pk for pk, *_ in rows], status=Newspaper.Status.SCHEDULED
+            ).values_list("publish_at", flat=True)
+        ):
+            publishing.schedule(publish_at)
+        topics = Topic.all_objects.filter(
+            pk__in={topic_id for pk, topic_id, *_ in rows},
+            deleted_at__isnull=False,
+        )
+        _topics_changed(topics, trashed=False)
+        topics.update(deleted_at=None)
+    return len(rows)
+
+
+def trash_topic(topic, now=None, actor=None):
+    """Move ``topic`` and its newspapers to the trash on behalf of ``actor``."""
+    now = now or timezone.now()
+    with transaction.atomic():
+        topics = Topic.all_objects.filter(pk=topic.pk, deleted_at=None)
+        _topics_changed(topics, trashed=True)
+        topics.update(deleted_at=now)
+        trash_newspapers(Newspaper.objects.filter(topic_id=topic.pk), now, actor)
+        schedule_purge(now)
+    topic.deleted_at = now
+
+
+def restore_topic(topic, now=None, actor=None):
+    """
+    Restore ``topic`` and the newspapers that were trashed along with it.
+
+    The newspapers are journaled as restored by ``actor``.
+    """
+    if topic.deleted_at is None:
+        return
+    with transaction.atomic():
+        trashed_with_topic = Newspaper.all_objects.filter(
+            topic_id=topic.pk, deleted_at=topic.deleted_at
+        )
+        restore_newspapers(trashed_with_topic, now, actor)
+        topics = Topic.all_objects.filter(pk=topic.pk, deleted_at__isnull=False)
+        _topics_changed(topics, trashed=False)
+        topics.update(deleted_at=None)
+    topic.deleted_at = None
+
+
+def purge(now=None, batch_size=None):
+    """
+    Delete the rows trashed more than ``TRASH_RETENTION`` days ago; return how many.
+
+    Each batch is deleted in its own transaction, so a large trash never
+    holds locks for long.
+    """
+    now = now or timezone.now()
+    batch_size = batch_size or settings.TRASH_PURGE_BATCH_SIZE
+    cutoff = now - timedelta(days=settings.TRASH_RETENTION)
+    purged = 0
+    # Newspapers first, so purging a topic has no newspapers left to cascade to.
+    for manager in (Newspaper.all_objects, Topic.all_objects):
+        expired = manager.filter(deleted_at__lt=cutoff).order_by("deleted_at")
+        while True:
+            with transaction.atomic():
+                pks = list(expired.values_list("pk", flat=True)[:batch_size])
+                if not pks:
+                    break
+                manager.filter(pk__in=pks).delete()
+            purged += len(pks)
+    return purged
@@ -1,12 +1,20 @@
 from django.urls import path
+from news.feeds import (
+    latest_newspapers_feed,
+    topic_newspapers_feed,
+    redactor_newspapers_feed,
+)
 from news.views import (
     index,
+    AnalyticsView,
     TopicListView,
     TopicCreateView,
     TopicUpdateView,
     TopicDeleteView,
     NewspaperListView,
     NewspaperDetailView,
+    newspaper_events,
+    MostReadView,
     NewspaperCreateView,
     NewspaperUpdateView,
     NewspaperDeleteView,
@@ -16,15 +24,27 @@ from news.views import (
     RedactorUpdateView,
     RedactorDeleteView,
     toggle_assign_to_newspaper,
+    suggestions,
+    metrics_view,
+    healthz,
 )
 
 urlpatterns = [
     path("", index, name="index"),
+    path("analytics/", AnalyticsView.as_view(), name="analytics"),
+    path("feeds/<slug:feed_format>/", latest_newspapers_feed, name="feed"),
     path("topics/", TopicListView.as_view(), name="topic-list"),
     path("topics/create/", TopicCreateView.as_view(), name="topic-create"),
     path("topics/<int:pk>/update/", TopicUpdateView.as_view(), name="topic-update"),
     path("topics/<int:pk>/delete/", TopicDeleteView.as_view(), name="topic-delete"),
+    path(
+        "topics/<int:pk>/feed/<slug:feed_format>/",
+        topic_newspapers_feed,
+        name="topic-feed",
+    ),
     path("newspapers/", NewspaperListView.as_view(), name="newspaper-list"),
+    path("newspapers/events/", newspaper_events, name="newspaper-events"),
+    path("newspapers/most-read/", MostReadView.as_view(), name="most-read"),
     path(
         "newspapers/<int:pk>/", NewspaperDetailView.as_view(), name="newspaper-detail"
     ),
@@ -57,6 +77,14 @@ urlpatterns = [
         RedactorDeleteView.as_view(),
         name="redactor-delete",
     ),
+    path(
+        "redactors/<int:pk>/feed/<slug:feed_format>/",
+        redactor_newspapers_feed,
+        name="redactor-feed",
+    ),
+    path("suggest/<slug:kind>/", suggestions, name="suggest"),
+    path("metrics", metrics_view, name="metrics"),
+    path("healthz", healthz, name="healthz"),
 ]
 
 app_name = "news"
@@ -1,10 +1,29 @@
+import asyncio
+import json
+from datetime import date
+
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import HttpResponseRedirect
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Sum
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseRedirect,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import render
 from django.urls import reverse_lazy
+from django.utils import timezone
 from django.views import generic
 
+from news import metrics
+from news.audit import journal
+from news.counters import MOST_READ_PERIODS, most_read, view_counter
+from news.events import hub
+from news.exports import EXPORT_FORMATS, export_response
 from news.forms import (
     RedactorCreationForm,
     NewspaperForm,
@@ -12,7 +31,34 @@ from news.forms import (
     NewspaperSearchForm,
     RedactorSearchForm,
 )
-from news.models import Topic, Redactor, Newspaper
+from news.models import AuditEvent, Topic, Redactor, Newspaper, NewspaperStat
+from news.routers import writes_on_safe_method
+from news.search import CachedSearchMixin, normalize_query
+from news.suggest import indexes
+from news.trash import trash_newspapers, trash_topic
+
+
+class ExportMixin:
+    """
+    Stream the filtered list as a file when ``?export=csv|jsonl`` is given.
+
+    The export uses the view's own ``get_queryset()``, so it honours the same
+    search form as the HTML page but ignores pagination.
+    """
+
+    export_fields = ()
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.GET.get("export")
+        if export_format in EXPORT_FORMATS:
+            return export_response(
+                self.get_queryset(),
+                self.export_fields,
+                export_format,
+                self.model._meta.verbose_name_plural,
+                asynchronous=isinstance(request, ASGIRequest),
+            )
+        return super().get(request, *args, **kwargs)
 
 
 @login_required
@@ -20,7 +66,7 @@ def index(request):
     """View function for the home page of the site."""
 
     num_redactors = Redactor.objects.count()
-    num_newspapers = Newspaper.objects.count()
+    num_newspapers = Newspaper.objects.visible().count()
     num_topics = Topic.objects.count()
 
     num_visits = request.session.get("num_visits", 0)
@@ -36,11 +82,65 @@ def index(request):
     return render(request, "news/index.html", context=context)
 
 
-class TopicListView(LoginRequiredMixin, generic.ListView):
+class AnalyticsView(LoginRequiredMixin, generic.TemplateView):
+    """Editorial output per topic and month, and per redactor."""
+
+    template_name = "news/analytics.html"
+    months = 12
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        today = timezone.localdate()
+        first_month = today.year * 12 + today.month - self.months
+        recent = NewspaperStat.objects.filter(
+            month__gte=date(first_month // 12, first_month % 12 + 1, 1),
+            newspapers__gt=0,
+        )
+
+        months = {}
+        for month, topic, newspapers in recent.filter(redactor=None).values_list(
+            "month", "topic__name", "newspapers"
+        ):
+            months.setdefault(month, []).append((topic, newspapers))
+        busiest = max(
+            (sum(count for _, count in topics) for topics in months.values()),
+            default=1,
+        )
+        context["months"] = [
+            {
+                "month": month,
+                "total": sum(count for _, count in topics),
+                "topics": sorted(topics, key=lambda topic: -topic[1]),
+                "width": 100 * sum(count for _, count in topics) // busiest,
+            }
+            for month, topics in sorted(months.items(), reverse=True)
+        ]
+
+        redactors = list(
+            recent.exclude(redactor=None)
+            .values("redactor__username")
+            .annotate(newspapers=Sum("newspapers"))
+            .order_by("-newspapers", "redactor__username")[:20]
+        )
+        most_productive = max(
+            (redactor["newspapers"] for redactor in redactors), default=1
+        )
+        for redactor in redactors:
+            redactor["width"] = 100 * redactor["newspapers"] // most_productive
+        context["redactors"] = redactors
+        return context
+
+
+class TopicListView(
+    LoginRequiredMixin, ExportMixin, CachedSearchMixin, generic.ListView
+):
     model = Topic
     context_object_name = "topic_list"
     template_name = "news/topic_list.html"
     paginate_by = 5
+    export_fields = ("id", "name")
+    search_namespace = "search:topic"
+    search_field = "name"
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -52,7 +152,9 @@ class TopicListView(LoginRequiredMixin, generic.ListView):
         queryset = Topic.objects.all()
         form = TopicSearchForm(self.request.GET)
         if form.is_valid():
-            return queryset.filter(name__icontains=form.cleaned_data.get("name"))
+            return queryset.filter(
+                name__icontains=normalize_query(form.cleaned_data.get("name"))
+            )
         return queryset
 
 
@@ -72,10 +174,21 @@ class TopicDeleteView(LoginRequiredMixin, generic.DeleteView):
     model = Topic
     success_url = reverse_lazy("news:topic-list")
 
+    def form_valid(self, form):
+        """Move the topic and its newspapers to the trash."""
+        success_url = self.get_success_url()
+        trash_topic(self.object, actor=self.request.user)
+        return HttpResponseRedirect(success_url)
+
 
-class NewspaperListView(LoginRequiredMixin, generic.ListView):
+class NewspaperListView(
+    LoginRequiredMixin, ExportMixin, CachedSearchMixin, generic.ListView
+):
     model = Newspaper
     paginate_by = 5
+    export_fields = ("id", "title", "topic__name", "published_date", "content")
+    search_namespace = "search:newspaper"
+    search_field = "title"
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -84,15 +197,82 @@ class NewspaperListView(LoginRequiredMixin, generic.ListView):
         return context
 
     def get_queryset(self):
-        queryset = Newspaper.objects.all()
+        queryset = Newspaper.objects.visible().select_related("topic")
         form = NewspaperSearchForm(self.request.GET)
         if form.is_valid():
-            return queryset.filter(title__icontains=form.cleaned_data.get("title"))
+            return queryset.filter(
+                title__icontains=normalize_query(form.cleaned_data.get("title"))
+            )
         return queryset
 
 
+async def newspaper_events(request):
+    """
+    Stream created and updated newspapers as Server-Sent Events.
+
+    Clients are fed from the process-wide ``hub``, so an idle connection is
+    a parked coroutine and a queue rather than a thread or a query. The
+    stream needs an ASGI server; under WSGI it answers 204, which tells
+    ``EventSource`` not to reconnect.
+    """
+    user = await request.auser()
+    if not user.is_authenticated:
+        return HttpResponse(status=401)
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+
+    async def stream():
+        queue = hub.subscribe()
+        try:
+            yield f"retry: {settings.SSE_HEARTBEAT_INTERVAL * 1000}\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(), settings.SSE_HEARTBEAT_INTERVAL
+                    )
+                except TimeoutError:
+                    # Keeps proxies from closing an idle connection.
+                    yield ": heartbeat\n\n"
+                    continue
+                yield f"event: newspaper\ndata: {json.dumps(event)}\n\n"
+        finally:
+            hub.unsubscribe(queue)
+
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
 class NewspaperDetailView(LoginRequiredMixin, generic.DetailView):
     model = Newspaper
+    queryset = Newspaper.objects.select_related("topic").prefetch_related("publishers")
+
+    def get(self, request, *args, **kwargs):
+        response = super().get(request, *args, **kwargs)
+        view_counter.record(self.object.pk)
+        return response
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["related_links"] = self.object.related_links.filter(
+            related__status=Newspaper.Status.PUBLISHED, related__deleted_at=None
+        ).select_related("related")
+        return context
+
+
+class MostReadView(LoginRequiredMixin, generic.TemplateView):
+    template_name = "news/most_read.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        period = self.request.GET.get("period", "day")
+        if period not in MOST_READ_PERIODS:
+            period = "day"
+        context["period"] = period
+        context["periods"] = list(MOST_READ_PERIODS)
+        context["most_read"] = most_read(period)
+        return context
 
 
 class NewspaperCreateView(LoginRequiredMixin, generic.CreateView):
@@ -100,21 +280,51 @@ class NewspaperCreateView(LoginRequiredMixin, generic.CreateView):
     form_class = NewspaperForm
     success_url = reverse_lazy("news:newspaper-list")
 
+    def form_valid(self, form):
+        response = super().form_valid(form)
+        journal.record(AuditEvent.Action.CREATED, self.object, self.request.user)
+        return response
+
 
 class NewspaperUpdateView(LoginRequiredMixin, generic.UpdateView):
     model = Newspaper
     form_class = NewspaperForm
     success_url = reverse_lazy("news:newspaper-list")
 
+    def form_valid(self, form):
+        response = super().form_valid(form)
+        journal.record(
+            AuditEvent.Action.UPDATED,
+            self.object,
+            self.request.user,
+            fields=form.changed_data,
+        )
+        return response
+
 
 class NewspaperDeleteView(LoginRequiredMixin, generic.DeleteView):
     model = Newspaper
     success_url = reverse_lazy("news:newspaper-list")
 
+    def form_valid(self, form):
+        """Move the newspaper to the trash."""
+        success_url = self.get_success_url()
+        trash_newspapers(
+            Newspaper.objects.filter(pk=self.object.pk), actor=self.request.user
+        )
+        return HttpResponseRedirect(success_url)
 
-class RedactorListView(LoginRequiredMixin, generic.ListView):
+
+class RedactorListView(LoginRequiredMixin, ExportMixin, generic.ListView):
     model = Redactor
     paginate_by = 5
+    export_fields = (
+        "id",
+        "username",
+        "first_name",
+        "last_name",
+        "years_of_experience",
+    )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -155,11 +365,45 @@ class RedactorDeleteView(LoginRequiredMixin, generic.DeleteView):
 
 
 @login_required
+@writes_on_safe_method
 def toggle_assign_to_newspaper(request, pk):
     redactor = Redactor.objects.get(id=request.user.id)
     newspaper = Newspaper.objects.get(id=pk)
     if newspaper in redactor.newspapers.all():
         redactor.newspapers.remove(newspaper)
+        journal.record(AuditEvent.Action.UNASSIGNED, newspaper, redactor)
     else:
         redactor.newspapers.add(newspaper)
+        journal.record(AuditEvent.Action.ASSIGNED, newspaper, redactor)
     return HttpResponseRedirect(reverse_lazy("news:newspaper-detail", args=[pk]))
+
+
+@login_required
+def suggestions(request, kind):
+    """Return completions of ``?q=`` from the in-memory suggestion index."""
+    if kind not in indexes:
+        raise Http404("Unknown suggestion index")
+    return JsonResponse(
+        {"suggestions": indexes[kind].suggest(request.GET.get("q", ""))}
+    )
+
+
+def metrics_view(request):
+    """
+    Expose the metrics of every worker process for Prometheus.
+
+    Without a ``METRICS_TOKEN`` the endpoint does not exist.
+    """
+    token = settings.METRICS_TOKEN
+    if not token:
+        raise Http404("Metrics are disabled")
+    if request.headers.get("Authorization") != f"Bearer {token}":
+        return HttpResponse(status=401)
+    return HttpResponse(
+        metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+def healthz(request):
+    """Report that the process serves requests, without touching the database."""
+    return JsonResponse({"status": "ok"})
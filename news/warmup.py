@@ -0,0 +1,146 @@
+"""
+Replay the most requested pages to fill the caches after a deploy.
+
+Pages are rendered in-process through the test client, so they go through
+the full middleware and view stack and fill the same cache entries a real
+request would, without needing the server to be reachable. It has to run
+where the site is served, against the cache the workers use: gunicorn does
+it at start-up, see ``startup.warm_caches``.
+"""
+
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.db.models import Count
+from django.test import Client
+from django.urls import reverse
+
+from news.counters import MOST_READ_PERIODS, view_counter
+from news.feeds import FEED_TYPES
+from news.models import Newspaper, Redactor, Topic
+from news.suggest import indexes
+from news.views import NewspaperListView, RedactorListView, TopicListView
+
+
+def feed_urls(topics=5):
+    """Return the URLs of the site feed and of the busiest topics' feeds."""
+    urls = [reverse("news:feed", args=[feed_format]) for feed_format in FEED_TYPES]
+    top_topics = (
+        Topic.objects.annotate(newspaper_count=Count("newspapers"))
+        .order_by("-newspaper_count", "pk")
+        .values_list("pk", flat=True)[:topics]
+    )
+    urls += [
+        reverse("news:topic-feed", args=[pk, feed_format])
+        for pk in top_topics
+        for feed_format in FEED_TYPES
+    ]
+    return urls
+
+
+def page_urls(pages=3, details=20):
+    """Return the URLs of the pages most logged-in users start from."""
+    urls = [reverse("news:index")]
+    for name, view, model in (
+        ("news:newspaper-list", NewspaperListView, Newspaper),
+        ("news:topic-list", TopicListView, Topic),
+        ("news:redactor-list", RedactorListView, Redactor),
+    ):
+        last_page = max(1, math.ceil(model.objects.count() / view.paginate_by))
+        urls += [
+            reverse(name) + (f"?page={page}" if page > 1 else "")
+            for page in range(1, min(pages, last_page) + 1)
+        ]
+    urls += [
+        f"{reverse('news:most-read')}?period={period}" for period in MOST_READ_PERIODS
+    ]
+    urls.append(reverse("news:analytics"))
+    urls += [reverse("news:suggest", args=[kind]) + "?q=a" for kind in indexes]
+    recent = Newspaper.objects.visible().values_list("pk", flat=True)[:details]
+    urls += [reverse("news:newspaper-detail", args=[pk]) for pk in recent]
+    return urls
+
+
+def find_user(username=None):
+    """
+    Return the user to render logged-in pages as, or None if there is none.
+
+    Without ``username`` this is the first active superuser; an unknown
+    ``username`` raises ``DoesNotExist``.
+    """
+    users = get_user_model().objects.order_by("pk")
+    if username:
+        return users.get(username=username)
+    return users.filter(is_superuser=True, is_active=True).first()
+
+
+def make_client(session_key=None):
+    """Return a test client that requests pages like a visitor of the site."""
+    host = settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS else "localhost"
+    client = Client(HTTP_HOST=host, raise_request_exception=False)
+    if session_key:
+        client.cookies[settings.SESSION_COOKIE_NAME] = session_key
+    return client
+
+
+def fetch(client, url):
+    """Request ``url``, read the whole response and return it."""
+    response = client.get(url, secure=settings.SECURE_SSL_REDIRECT)
+    if response.streaming:
+        for chunk in response.streaming_content:
+            pass
+    return response
+
+
+def replay(urls, *, workers=4, session_key=None):
+    """
+    Request every URL in parallel and return ``(url, status)`` pairs.
+
+    ``session_key`` makes the requests as the logged-in user of that session;
+    without it only public pages render.
+    """
+
+    def fetch_all(share):
+        client = make_client(session_key)
+        results = []
+        try:
+            for url in share:
+                results.append((url, fetch(client, url).status_code))
+        finally:
+            connections.close_all()
+        return results
+
+    with ThreadPoolExecutor(workers) as executor:
+        shares = executor.map(
+            fetch_all, [urls[start::workers] for start in range(workers)]
+        )
+        return [result for share in shares for result in share]
+
+
+def warm(urls, *, workers=4, user=None):
+    """
+    Replay ``urls`` to fill the caches.
+
+    Return the failed ``(url, status)`` pairs and the time the replay took.
+    """
+    session_key = None
+    login_client = Client()
+    if user is not None:
+        login_client.force_login(user)
+        session_key = login_client.session.session_key
+    try:
+        # Warm-up requests are not readers.
+        with view_counter.suspended():
+            started = time.perf_counter()
+            results = replay(urls, workers=workers, session_key=session_key)
+            elapsed = time.perf_counter() - started
+    finally:
+        if session_key:
+            login_client.logout()
+
+    failed = [(url, status) for url, status in results if status >= 400]
+    return failed, elapsed
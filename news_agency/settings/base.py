@@ -12,15 +12,17 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 import dj_database_url
 import os
+import tempfile
 from dotenv import load_dotenv
 from pathlib import Path
 
-# Load environment variables from .env file
-load_dotenv()
-
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
+# Load environment variables from .env file; the explicit path spares each
+# process a search of the directories above the caller
+load_dotenv(BASE_DIR / ".env")
+
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
 
@@ -42,14 +44,20 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "news.middleware.MetricsMiddleware",
+    "news.middleware.MemoryMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "news.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
+    "news.middleware.PrimaryPinningMiddleware",
+    "news.middleware.SessionBackendMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "news.middleware.ProfilingMiddleware",
 ]
 
 ROOT_URLCONF = "news_agency.urls"
@@ -77,6 +85,14 @@ CRISPY_ALLOWED_TEMPLATE_PACKS = ["bootstrap5"]
 
 WSGI_APPLICATION = "news_agency.wsgi.application"
 
+DATABASE_ROUTERS = ["news.routers.ReplicaRouter"]
+
+# Aliases in DATABASES that are read replicas of "default"
+DATABASE_REPLICAS = []
+
+# Seconds a client's reads stay on the primary after it writes
+REPLICA_PIN_SECONDS = 10
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -97,6 +113,14 @@ AUTH_PASSWORD_VALIDATORS = [
 
 AUTH_USER_MODEL = "news.Redactor"
 
+# Sessions logged in through ModelBackend before the cached backend existed
+# are moved to it by news.middleware.SessionBackendMiddleware
+AUTHENTICATION_BACKENDS = ["news.backends.CachedModelBackend"]
+
+AUTH_USER_CACHE_TIMEOUT = 60 * 5
+
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+
 LOGIN_REDIRECT_URL = "/"
 
 LOGOUT_REDIRECT_URL = "/"
@@ -127,3 +151,256 @@ ASSETS_ROOT = "/static/assets"
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# Syndication feeds
+
+FEED_ITEMS = 20
+
+FEED_CACHE_TIMEOUT = 60 * 60 * 24
+
+FEED_MAX_AGE = 60
+
+# List exports
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Background jobs
+
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", 2))
+
+JOB_POLL_INTERVAL = 5
+
+JOB_RETRY_BACKOFF = 30
+
+# Seconds between the lock renewals of a running job
+JOB_HEARTBEAT_INTERVAL = 60
+
+# Seconds after the last renewal when a running job is taken for abandoned
+JOB_LOCK_TIMEOUT = 60 * 5
+
+# SQLite tuning used by the single-node profile (settings.sqlite)
+# https://www.sqlite.org/pragma.html
+
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,
+    "busy_timeout": 5000,
+    "temp_store": "MEMORY",
+}
+
+# Readership
+
+VIEW_COUNT_FLUSH_INTERVAL = 10
+
+VIEW_COUNT_MAX_PENDING = 1000
+
+MOST_READ_CACHE_TIMEOUT = 60
+
+# Search result cache
+
+SEARCH_CACHE_TIMEOUT = 60 * 5
+
+SEARCH_CACHE_STALE_TIMEOUT = 60
+
+# Seconds a cache miss may be computed before others stop waiting for it
+CACHE_LOCK_TIMEOUT = 10
+
+CACHE_LOCK_WAIT = 2
+
+# Search suggestions
+
+SUGGEST_LIMIT = 10
+
+# Seconds before an in-memory index is rebuilt to pick up other processes' changes
+SUGGEST_INDEX_REFRESH = 60 * 10
+
+# Related newspapers
+
+RELATED_TOP_K = 5
+
+# Seconds new newspapers are batched before their related newspapers are
+# computed; each run vectorizes the whole archive
+RELATED_UPDATE_DELAY = 60 * 10
+
+# Near-duplicate detection
+
+# Texts with fewer words are too short for a meaningful fingerprint
+DUPLICATE_MIN_TOKENS = 20
+
+# Estimated share of shared word trigrams from which texts are near-duplicates.
+# Lookups only verify newspapers sharing an LSH bucket, which catches about
+# 99% of the pairs at 0.7 and 89% at 0.6.
+DUPLICATE_MIN_SIMILARITY = 0.7
+
+# Server-Sent Events
+
+# Events kept for a client that is not reading before newer ones are dropped
+SSE_QUEUE_SIZE = 100
+
+SSE_HEARTBEAT_INTERVAL = 15
+
+# Seconds between the per-process checks for changes made by other processes
+SSE_POLL_INTERVAL = 2
+
+SSE_POLL_OVERLAP = 5
+
+# Metrics
+
+# Every process keeps its metrics in a file here; clear it when the whole
+# application restarts
+METRICS_DIR = os.environ.get(
+    "METRICS_DIR", os.path.join(tempfile.gettempdir(), "news_agency_metrics")
+)
+
+# /metrics requires "Authorization: Bearer <token>" and is not served without
+# a token
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+# Request profiling
+
+PROFILE_DIR = os.environ.get(
+    "PROFILE_DIR", os.path.join(tempfile.gettempdir(), "news_agency_profiles")
+)
+
+# Profiles kept before the oldest is overwritten
+PROFILE_RING_SIZE = 50
+
+# Functions listed in the admin, slowest cumulative time first
+PROFILE_STATS_LIMIT = 60
+
+# Distinct SELECTs of a profiled request that are explained
+PROFILE_EXPLAIN_LIMIT = 30
+
+# Memory diagnostics
+
+# Requests growing a worker's resident memory by this much are logged
+MEMORY_LOG_DELTA = 10 * 1024 * 1024
+
+# Seconds between the tracemalloc snapshots of each worker; 0 disables
+# tracing, which slows allocations down noticeably
+MEMORY_TRACEMALLOC_INTERVAL = int(os.environ.get("MEMORY_TRACEMALLOC_INTERVAL", "0"))
+
+MEMORY_TRACEMALLOC_FRAMES = 1
+
+# Allocation sites logged per snapshot
+MEMORY_TRACEMALLOC_TOP = 10
+
+# Gunicorn workers above this resident memory, or grown by this much since
+# their first request, are replaced after the current request; 0 disables
+MEMORY_RECYCLE_RSS = int(os.environ.get("MEMORY_RECYCLE_RSS_MB", "0")) * 1024 * 1024
+
+MEMORY_RECYCLE_GROWTH = (
+    int(os.environ.get("MEMORY_RECYCLE_GROWTH_MB", "0")) * 1024 * 1024
+)
+
+# Slow query log
+
+# Queries taking this long are logged with their plan; 0 disables the log
+SLOW_QUERY_THRESHOLD = float(os.environ.get("SLOW_QUERY_THRESHOLD_MS", "200")) / 1000
+
+# EXPLAIN ANALYZE runs the slow SELECT again; only backends with the
+# option, such as PostgreSQL, support it
+SLOW_QUERY_EXPLAIN_ANALYZE = os.environ.get("SLOW_QUERY_EXPLAIN_ANALYZE") == "1"
+
+SLOW_QUERY_LOG = os.environ.get(
+    "SLOW_QUERY_LOG",
+    os.path.join(tempfile.gettempdir(), "news_agency_slow_queries.jsonl"),
+)
+
+# Size after which the log moves to SLOW_QUERY_LOG + ".1", replacing the previous one
+SLOW_QUERY_LOG_MAX_BYTES = 10 * 1024 * 1024
+
+# Response compression
+
+# Smaller responses gain too little to be worth compressing
+COMPRESSION_MIN_SIZE = 512
+
+# Brotli quality 5 and gzip level 6 compress nearly as well as the maximum
+# at a fraction of the CPU time
+COMPRESSION_BROTLI_QUALITY = 5
+
+COMPRESSION_GZIP_LEVEL = 6
+
+# Longest random padding added to compressed pages that contain a CSRF token
+COMPRESSION_PADDING_MAX = 64
+
+# Markdown
+
+MARKDOWN_EXTENSIONS = ["extra", "sane_lists"]
+
+# Anything else the Markdown renders to is removed from the stored HTML;
+# changing these lists calls for "python manage.py rerender_markdown"
+MARKDOWN_ALLOWED_TAGS = [
+    "a",
+    "abbr",
+    "blockquote",
+    "br",
+    "code",
+    "dd",
+    "del",
+    "div",
+    "dl",
+    "dt",
+    "em",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "hr",
+    "img",
+    "li",
+    "ol",
+    "p",
+    "pre",
+    "strong",
+    "sub",
+    "sup",
+    "table",
+    "tbody",
+    "td",
+    "th",
+    "thead",
+    "tr",
+    "ul",
+]
+
+MARKDOWN_ALLOWED_ATTRIBUTES = {
+    "a": ["href", "title"],
+    "abbr": ["title"],
+    "img": ["src", "alt", "title"],
+    "ol": ["start"],
+    "td": ["align"],
+    "th": ["align"],
+}
+
+# Scheduled publishing
+
+# Longest a publishing loop sleeps before checking for newly scheduled newspapers
+PUBLISH_POLL_INTERVAL = 30
+
+# Newspapers flipped live per UPDATE
+PUBLISH_BATCH_SIZE = 500
+
+# Trash
+
+# Days deleted newspapers and topics can be restored before they are purged
+TRASH_RETENTION = 30
+
+# Rows deleted per transaction when the trash is purged
+TRASH_PURGE_BATCH_SIZE = 100
+
+# Audit journal
+
+# Seconds queued audit events may wait before they are written
+AUDIT_FLUSH_INTERVAL = 5
+
+# Queued audit events that are written at once without waiting
+AUDIT_MAX_PENDING = 100
+
+# Audit events kept queued while they cannot be written; older ones are
+# logged and dropped
+AUDIT_MAX_QUEUED = 10000
@@ -14,3 +14,14 @@ DATABASES = {
         "NAME": BASE_DIR / "db.sqlite3",
     }
 }
+
+# Point SQLITE_REPLICA_PATH at a copy of db.sqlite3 to try read-replica
+# routing locally; the copy behaves like a replica that stopped replicating.
+SQLITE_REPLICA_PATH = os.environ.get("SQLITE_REPLICA_PATH")
+if SQLITE_REPLICA_PATH:
+    DATABASES["replica"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": SQLITE_REPLICA_PATH,
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS = ["replica"]
@@ -24,8 +24,27 @@ DATABASES = {
     }
 }
 
+REPLICA_DATABASE_URL = os.environ.get("REPLICA_DATABASE_URL")
+if REPLICA_DATABASE_URL:
+    DATABASES["replica"] = dj_database_url.parse(REPLICA_DATABASE_URL, ssl_require=True)
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+    DATABASE_REPLICAS = ["replica"]
+
 SESSION_COOKIE_SECURE = True
 
 SECURE_SSL_REDIRECT = True
 
+# Probes and scrapers reach the process directly over plain HTTP
+SECURE_REDIRECT_EXEMPT = [r"^healthz$", r"^metrics$"]
+
 CSRF_COOKIE_SECURE = True
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get("DJANGO_CACHE_DIR", "/tmp/news_agency_cache"),
+    }
+}